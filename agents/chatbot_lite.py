@@ -3,26 +3,75 @@ Lightweight Gemini-powered Chatbot for Roomies
 No heavy dependencies (FAISS, SentenceTransformers).
 Uses direct Gemini API with prompt-based context.
 """
+import asyncio
 import json
 import os
-import re
+import time
 import google.generativeai as genai
 from dotenv import load_dotenv
 
+from agents import prompt_context
+from agents.faq_index import FAQIndex
+from agents.vector_index import chat_index
+from utils.metrics import metrics, track_external
+from utils.resilience import (
+    CircuitBreaker, CircuitOpen, ConcurrencyLimiter, LimiterFull, guarded_call, guarded_call_async
+)
+from utils.response_cache import context_fingerprint, response_cache
+
 load_dotenv()
 
+# Minimum cosine similarity for a vector-retrieved FAQ
+FAQ_VECTOR_MIN_SCORE = float(os.getenv("FAQ_VECTOR_MIN_SCORE", "0.2"))
+
+# Gemini calls in flight per process; callers wait GEMINI_QUEUE_TIMEOUT seconds for a slot
+GEMINI_MAX_CONCURRENCY = int(os.getenv("GEMINI_MAX_CONCURRENCY", "4"))
+GEMINI_QUEUE_TIMEOUT = float(os.getenv("GEMINI_QUEUE_TIMEOUT", "2"))
+# Deadline per Gemini call (whole stream for streamed replies)
+GEMINI_TIMEOUT = float(os.getenv("GEMINI_TIMEOUT", "15"))
+# Consecutive failures before the breaker opens, and seconds before a retry
+GEMINI_BREAKER_FAILURES = int(os.getenv("GEMINI_BREAKER_FAILURES", "5"))
+GEMINI_BREAKER_RESET = float(os.getenv("GEMINI_BREAKER_RESET", "30"))
+
+gemini_limiter = ConcurrencyLimiter("gemini", GEMINI_MAX_CONCURRENCY, GEMINI_QUEUE_TIMEOUT)
+gemini_breaker = CircuitBreaker("gemini", GEMINI_BREAKER_FAILURES, GEMINI_BREAKER_RESET)
+
+# Hit rate: roomies_cache_{hits,misses}_total{cache="chat_response"}
+metrics.register_cache("chat_response", lambda: (response_cache.hits, response_cache.misses))
+CHAT_CACHE_NEAR_HITS = metrics.counter(
+    "roomies_chat_cache_near_hits_total", "Chat cache hits served by a near-duplicate question.",
+    callback=lambda: {(): response_cache.near_hits},
+)
+CHAT_PROMPT_TOKENS = metrics.histogram(
+    "roomies_chat_prompt_tokens", "Estimated tokens per Gemini prompt.",
+    buckets=(100, 200, 300, 400, 600, 800, 1000, 1500, 2000, 3000),
+)
+CHAT_CACHE_SAVED = metrics.counter(
+    "roomies_chat_cache_saved_seconds_total", "Gemini generation time avoided by cached chat replies.",
+    callback=lambda: {(): response_cache.saved_seconds},
+)
+
 
 class ChatbotLite:
     def __init__(self, data_path='data/faqs.json'):
         self.data_path = data_path
-        self.faqs = self._load_faqs()
+        base_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        self.faq_index = FAQIndex(os.path.join(base_path, self.data_path))
+        chat_index.add_source("faq", lambda: [
+            (faq['question'], f"{faq['question']} {faq.get('answer', '')}") for faq in self.faqs
+        ])
         self.room_provider = None
         self.roommate_provider = None  # New: for AI roommate matching
         self.model = None
         
         # Initialize Gemini
         self.api_key = os.getenv("GEMINI_API_KEY")
-        if self.api_key:
+        if os.getenv("CHATBOT_FAKE_MODEL"):
+            # Local development / load testing without Gemini
+            from agents.fake_model import FakeStreamingModel
+            self.model = FakeStreamingModel()
+            print("⚠️ CHATBOT_FAKE_MODEL set. Chatbot replies come from a local fake model.")
+        elif self.api_key:
             try:
                 genai.configure(api_key=self.api_key)
                 # Use gemini-1.5-flash (fast and efficient)
@@ -42,34 +91,20 @@ class ChatbotLite:
         """Register a callback function to fetch roommate matches."""
         self.roommate_provider = provider_func
 
-    def _load_faqs(self):
-        """Load FAQs from JSON file."""
-        try:
-            base_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-            full_path = os.path.join(base_path, self.data_path)
-            with open(full_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except Exception as e:
-            print(f"Error loading FAQs: {e}")
-            return []
+    @property
+    def faqs(self):
+        """Current FAQ list (reloaded when the file changes)."""
+        return self.faq_index.faqs
 
     def _get_relevant_faqs(self, query, max_results=3):
-        """Simple keyword-based FAQ matching (no heavy ML)."""
-        query_words = set(re.findall(r'\w+', query.lower()))
-        scored = []
-        
-        for faq in self.faqs:
-            question_words = set(re.findall(r'\w+', faq['question'].lower()))
-            # Jaccard similarity
-            if query_words and question_words:
-                intersection = query_words & question_words
-                union = query_words | question_words
-                score = len(intersection) / len(union)
-                if score > 0.1:
-                    scored.append((score, faq))
-        
-        scored.sort(key=lambda x: x[0], reverse=True)
-        return [item[1] for item in scored[:max_results]]
+        """Vector FAQ retrieval, falling back to keyword matching (no heavy ML)."""
+        if chat_index.available:
+            by_question = {faq['question']: faq for faq in self.faqs}
+            hits = chat_index.search(query, k=max_results, kind="faq", min_score=FAQ_VECTOR_MIN_SCORE)
+            faqs = [by_question[question] for _, _, question in hits if question in by_question]
+            if faqs:
+                return faqs
+        return self.faq_index.search(query, max_results=max_results)
 
     def _detect_roommate_intent(self, message):
         """Detect if user wants roommate matching."""
@@ -159,83 +194,41 @@ class ChatbotLite:
         
         return result
 
-    def _build_context(self, user_message):
-        """Build context for Gemini prompt."""
-        context_parts = []
+    def _build_context(self, user_message, sources=None):
+        """
+        Build context for Gemini prompt within the token budget.
+
+        `sources`, if given, collects the parts the answer depends on (best
+        FAQ, listings) for the response cache fingerprint.
+        """
+        if sources is None:
+            sources = []
         
         # 1. Relevant FAQs
         relevant_faqs = self._get_relevant_faqs(user_message)
         if relevant_faqs:
-            faq_text = "📚 FAQ Knowledge Base:\n"
-            for faq in relevant_faqs:
-                faq_text += f"Q: {faq['question']}\nA: {faq['answer']}\n\n"
-            context_parts.append(faq_text)
+            sources.append(json.dumps(relevant_faqs[0], sort_keys=True))
+        faq_blocks = [f"Q: {faq['question']}\nA: {faq['answer']}" for faq in relevant_faqs]
         
         # 2. Available Rooms (if provider is set)
+        room_lines = []
         if self.room_provider:
             try:
                 rooms = self.room_provider(user_message)
-                if rooms:
-                    room_text = "🏠 Available Rooms/Listings:\n"
-                    for room in rooms[:5]:
-                        amenities = ", ".join(room.get('amenities', [])[:3]) if isinstance(room.get('amenities'), list) else room.get('amenities', '')[:50]
-                        room_text += f"- {room['title']} in {room['location']}. Type: {room['property_type']}. Price: ₹{room['price']}/month. Amenities: {amenities}\n"
-                    context_parts.append(room_text)
+                for room in (rooms or [])[:5]:
+                    amenities = ", ".join(room.get('amenities', [])[:3]) if isinstance(room.get('amenities'), list) else room.get('amenities', '')[:50]
+                    room_lines.append(f"- {room['title']} in {room['location']}. Type: {room['property_type']}. Price: ₹{room['price']}/month. Amenities: {amenities}")
+                if room_lines:
+                    sources.append("\n".join(room_lines))
             except Exception as e:
                 print(f"Room provider error: {e}")
         
-        # 3. Website Info (always included - comprehensive context)
-        website_context = """
-🌐 ROOMIES PLATFORM - COMPLETE GUIDE:
-
-📌 WHAT IS ROOMIES?
-Roomies is India's leading student housing platform that helps students find hostels, PGs (Paying Guest accommodations), flats, and compatible roommates using AI-powered matching technology.
-
-🏠 PROPERTY TYPES AVAILABLE:
-- Hostel: Shared dormitory-style accommodation with common facilities
-- PG (Paying Guest): Private or shared rooms in residential buildings, often with meals included
-- Flat/Apartment: Independent rooms or entire flats for rent
-- Shared Room: Share a room with other students to save costs
-
-📍 KEY PAGES & FEATURES:
-• /explore - Browse and search all available rooms with filters for location, price range, property type, and amenities
-• /ai-matching - AI-powered roommate matching based on lifestyle preferences
-• /findmate - Find compatible roommates based on profile
-• /list-room - Property owners can list their rooms for FREE (basic listing) or with premium features
-• /dashboard - Students can manage their profile, bookings, saved listings, and verification status
-• /flash-deals - 24-hour limited-time discounts on select properties
-
-🤖 AI ROOMMATE MATCHING:
-Our AI analyzes your profile including:
-- Sleep schedule (early bird vs night owl)
-- Social level (extrovert/introvert/ambivert)
-- Cleanliness preferences (neat freak/moderate/relaxed)
-- Budget range
-And suggests compatible roommates with a compatibility score!
-
-To use AI matching, users can:
-1. Go to /ai-matching page
-2. Fill out the preference questionnaire
-3. Click "Find My Matches" to see compatible students
-4. Or chat with me and describe what they're looking for!
-
-💰 PRICING & FEES:
-- Searching for rooms: FREE for all users
-- Booking Fee: ₹999 one-time fee when booking a room
-- Security Deposit: 2x monthly rent (refundable at end of stay)
-
-📞 CONTACT & SUPPORT:
-- Email: support@roomies.in
-- Response time: Within 24 hours
-"""
-        context_parts.append(website_context)
-        
-        return "\n".join(context_parts)
+        # 3. Website Info: only the guide sections relevant to the message
+        context, _, _ = prompt_context.assemble(user_message, faq_blocks, room_lines)
+        return context
 
-    def get_response(self, user_message, user_id=None):
-        """Get AI response for user message."""
-        user_message = user_message.strip()
-        
+    def _quick_response(self, user_message, user_id=None):
+        """Canned reply for greetings, roommate and search intents, or None to ask Gemini."""
         # Quick responses for greetings
         greetings = ['hi', 'hello', 'hey', 'greetings', 'hii', 'hola']
         if user_message.lower() in greetings:
@@ -275,12 +268,11 @@ To use AI matching, users can:
                     return f"🔍 I can help you find a place in {city.title()}! <a href='/explore?city={city}' class='text-blue-600 underline font-medium'>Click here to see listings in {city.title()}</a>. You can also use our filters to narrow down by price and property type."
             return "🔍 I can help you find a room! <a href='/explore' class='text-blue-600 underline font-medium'>Click here to browse all our verified listings</a>. Use the filters to find your perfect match!"
 
-        # Use Gemini for complex queries
-        if self.model:
-            try:
-                context = self._build_context(user_message)
-                
-                prompt = f"""You are 'Roomies AI', a knowledgeable and friendly customer support assistant for Roomies - India's leading student housing platform.
+        return None
+
+    def _build_prompt(self, user_message, context):
+        """Gemini prompt with FAQ, listing and platform context."""
+        prompt = f"""You are 'Roomies AI', a knowledgeable and friendly customer support assistant for Roomies - India's leading student housing platform.
 
 IMPORTANT: You have COMPLETE knowledge about the Roomies platform from the context below. Use this information to answer ALL questions accurately.
 
@@ -305,16 +297,48 @@ INSTRUCTIONS:
 13. For general queries like "best home" or "best room", suggest exploring listings and provide helpful criteria.
 
 RESPONSE:"""
+        tokens = prompt_context.count_tokens(prompt)
+        CHAT_PROMPT_TOKENS.observe(value=tokens)
+        print(f"[Chatbot] Prompt ~{tokens} tokens")
+        return prompt
+
+    def _fallback_response(self, user_message):
+        """Best matching FAQ answer when Gemini is unavailable."""
+        relevant_faqs = self._get_relevant_faqs(user_message, max_results=1)
+        if relevant_faqs:
+            return relevant_faqs[0]['answer']
+        
+        return "I'm not sure about that specific question. You can browse our <a href='/explore' class='text-blue-600 underline'>room listings</a>, check the <a href='/faq' class='text-blue-600 underline'>FAQ page</a>, or contact us at support@roomies.in for more help!"
+
+    def get_response(self, user_message, user_id=None):
+        """Get AI response for user message."""
+        user_message = user_message.strip()
+        quick = self._quick_response(user_message, user_id)
+        if quick:
+            return quick
+
+        # Use Gemini for complex queries (straight to the FAQ answer while the breaker is open)
+        if self.model and not gemini_breaker.rejects():
+            try:
+                sources = []
+                context = self._build_context(user_message, sources)
+                fingerprint = context_fingerprint("\n".join(sources))
+                cached = response_cache.get(user_message, fingerprint)
+                if cached is not None:
+                    return cached
+                prompt = self._build_prompt(user_message, context)
 
                 print(f"[Chatbot] Calling Gemini API for: '{user_message[:50]}...'")
-                response = self.model.generate_content(prompt)
+                started = time.perf_counter()
+                with guarded_call(gemini_limiter, gemini_breaker), track_external("gemini"):
+                    response = self.model.generate_content(prompt, request_options={"timeout": GEMINI_TIMEOUT})
                 
-                if response and response.text:
-                    print(f"[Chatbot] Gemini responded successfully")
-                    return response.text.strip()
-                else:
-                    print(f"[Chatbot] Gemini returned empty response")
+                reply = self._accept_reply(response, user_message, fingerprint, started)
+                if reply:
+                    return reply
                     
+            except (CircuitOpen, LimiterFull) as e:
+                print(f"[Chatbot] Skipping Gemini: {e}")
             except Exception as e:
                 print(f"[Chatbot] Gemini API error: {e}")
                 import traceback
@@ -322,11 +346,112 @@ RESPONSE:"""
                 # Fall through to FAQ fallback
         
         # Fallback: Best matching FAQ
-        relevant_faqs = self._get_relevant_faqs(user_message, max_results=1)
-        if relevant_faqs:
-            return relevant_faqs[0]['answer']
-        
-        return "I'm not sure about that specific question. You can browse our <a href='/explore' class='text-blue-600 underline'>room listings</a>, check the <a href='/faq' class='text-blue-600 underline'>FAQ page</a>, or contact us at support@roomies.in for more help!"
+        return self._fallback_response(user_message)
+
+    def _accept_reply(self, response, user_message, fingerprint, started):
+        """Reply text from a Gemini response (cached), or None if it was empty."""
+        if response and response.text:
+            print(f"[Chatbot] Gemini responded successfully")
+            reply = response.text.strip()
+            response_cache.set(user_message, fingerprint, reply, time.perf_counter() - started)
+            return reply
+        print(f"[Chatbot] Gemini returned empty response")
+        return None
+
+    async def get_response_async(self, user_message, user_id=None, run_sync=asyncio.to_thread):
+        """
+        get_response() for the ASGI path: Gemini is awaited instead of holding a thread.
+
+        `run_sync(func, *args)` runs the blocking parts (room and roommate
+        providers querying the database) off the event loop.
+        """
+        user_message = user_message.strip()
+        quick = await run_sync(self._quick_response, user_message, user_id)
+        if quick:
+            return quick
+
+        if self.model and not gemini_breaker.rejects():
+            try:
+                sources = []
+                context = await run_sync(self._build_context, user_message, sources)
+                fingerprint = context_fingerprint("\n".join(sources))
+                cached = response_cache.get(user_message, fingerprint)
+                if cached is not None:
+                    return cached
+                prompt = self._build_prompt(user_message, context)
+
+                print(f"[Chatbot] Calling Gemini API (async) for: '{user_message[:50]}...'")
+                started = time.perf_counter()
+                async with guarded_call_async(gemini_limiter, gemini_breaker):
+                    with track_external("gemini"):
+                        response = await self.model.generate_content_async(
+                            prompt, request_options={"timeout": GEMINI_TIMEOUT}
+                        )
+
+                reply = self._accept_reply(response, user_message, fingerprint, started)
+                if reply:
+                    return reply
+            except (CircuitOpen, LimiterFull) as e:
+                print(f"[Chatbot] Skipping Gemini: {e}")
+            except Exception as e:
+                print(f"[Chatbot] Gemini API error: {e}")
+
+        return self._fallback_response(user_message)
+
+    def stream_response(self, user_message, user_id=None, on_prompt_ready=None):
+        """
+        Yield the AI response in chunks as Gemini generates it.
+
+        Canned and fallback replies are yielded as a single chunk. If Gemini
+        fails after some text was sent, the stream just ends there.
+        `on_prompt_ready` is called once the providers have been queried and
+        before Gemini is, e.g. to hand the DB connection back to the pool.
+        """
+        user_message = user_message.strip()
+        quick = self._quick_response(user_message, user_id)
+        if quick:
+            yield quick
+            return
+
+        sent = False
+        if self.model and not gemini_breaker.rejects():
+            try:
+                sources = []
+                context = self._build_context(user_message, sources)
+                if on_prompt_ready:
+                    on_prompt_ready()
+                fingerprint = context_fingerprint("\n".join(sources))
+                cached = response_cache.get(user_message, fingerprint)
+                if cached is not None:
+                    yield cached
+                    return
+                prompt = self._build_prompt(user_message, context)
+
+                print(f"[Chatbot] Streaming Gemini API for: '{user_message[:50]}...'")
+                started = time.perf_counter()
+                parts = []
+                with guarded_call(gemini_limiter, gemini_breaker), track_external("gemini"):
+                    stream = self.model.generate_content(prompt, stream=True,
+                                                         request_options={"timeout": GEMINI_TIMEOUT})
+                    for chunk in stream:
+                        if time.perf_counter() - started > GEMINI_TIMEOUT:
+                            raise TimeoutError(f"Gemini stream exceeded {GEMINI_TIMEOUT}s")
+                        text = chunk.text
+                        if text:
+                            # Leading whitespace only matters once, like .strip() above
+                            text = text if sent else text.lstrip()
+                            parts.append(text)
+                            yield text
+                            sent = True
+                # Only complete replies are cached
+                response_cache.set(user_message, fingerprint, "".join(parts).strip(), time.perf_counter() - started)
+            except (CircuitOpen, LimiterFull) as e:
+                print(f"[Chatbot] Skipping Gemini: {e}")
+            except Exception as e:
+                print(f"[Chatbot] Gemini streaming error: {e}")
+
+        if not sent:
+            yield self._fallback_response(user_message)
 
 
 # Singleton instance
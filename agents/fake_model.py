@@ -0,0 +1,82 @@
+"""
+Fake Gemini model for local development and load testing.
+
+Mimics the parts of `genai.GenerativeModel` the chatbot uses:
+`generate_content(prompt)` returns an object with `.text`,
+`generate_content(prompt, stream=True)` yields chunks with `.text`, one
+token every CHATBOT_FAKE_TOKEN_DELAY seconds, like a slow LLM would, and
+`await generate_content_async(prompt)` does the same waiting without
+blocking the event loop.
+
+To exercise the Gemini limiter and circuit breaker, CHATBOT_FAKE_LATENCY
+adds a wait before the first token and CHATBOT_FAKE_FAIL_RATE makes that
+share of calls raise. A `request_options={"timeout": ...}` shorter than
+the latency raises TimeoutError once it expires, like a gRPC deadline.
+
+Enable with CHATBOT_FAKE_MODEL=1.
+"""
+import asyncio
+import os
+import random
+import time
+
+CHATBOT_FAKE_TOKEN_DELAY = float(os.environ.get("CHATBOT_FAKE_TOKEN_DELAY", "0.05"))
+CHATBOT_FAKE_TOKENS = int(os.environ.get("CHATBOT_FAKE_TOKENS", "40"))
+CHATBOT_FAKE_LATENCY = float(os.environ.get("CHATBOT_FAKE_LATENCY", "0"))
+CHATBOT_FAKE_FAIL_RATE = float(os.environ.get("CHATBOT_FAKE_FAIL_RATE", "0"))
+
+
+class FakeChunk:
+    def __init__(self, text):
+        self.text = text
+
+
+class FakeStreamingModel:
+    def __init__(self, delay=CHATBOT_FAKE_TOKEN_DELAY, tokens=CHATBOT_FAKE_TOKENS,
+                 latency=CHATBOT_FAKE_LATENCY, fail_rate=CHATBOT_FAKE_FAIL_RATE):
+        self.delay = delay
+        self.tokens = tokens
+        self.latency = latency
+        self.fail_rate = fail_rate
+
+    def _tokens(self, prompt):
+        question = prompt.split("USER QUESTION:", 1)[-1].split("\n", 1)[0].strip()
+        words = f"(fake reply) You asked: {question}.".split()
+        while len(words) < self.tokens:
+            words.append("lorem")
+        return [word + " " for word in words[:self.tokens]]
+
+    def _upstream_outcome(self, timeout):
+        """(seconds to wait, exception to raise afterwards or None)."""
+        if timeout is not None and self.latency > timeout:
+            return timeout, TimeoutError(f"fake model: deadline of {timeout}s exceeded")
+        if random.random() < self.fail_rate:
+            return self.latency, RuntimeError("fake model: simulated upstream error")
+        return self.latency, None
+
+    def _wait_for_upstream(self, timeout):
+        wait, error = self._upstream_outcome(timeout)
+        time.sleep(wait)
+        if error:
+            raise error
+
+    def _stream(self, prompt, timeout):
+        self._wait_for_upstream(timeout)
+        for token in self._tokens(prompt):
+            time.sleep(self.delay)
+            yield FakeChunk(token)
+
+    def generate_content(self, prompt, stream=False, request_options=None):
+        timeout = (request_options or {}).get("timeout")
+        if stream:
+            return self._stream(prompt, timeout)
+        return FakeChunk("".join(chunk.text for chunk in self._stream(prompt, timeout)))
+
+    async def generate_content_async(self, prompt, request_options=None):
+        wait, error = self._upstream_outcome((request_options or {}).get("timeout"))
+        await asyncio.sleep(wait)
+        if error:
+            raise error
+        tokens = self._tokens(prompt)
+        await asyncio.sleep(self.delay * len(tokens))
+        return FakeChunk("".join(tokens))
@@ -0,0 +1,137 @@
+"""
+FAQ retrieval index for the Roomies chatbot.
+
+Built once per load of data/faqs.json instead of re-tokenizing every FAQ
+on every message:
+
+- each question is tokenized once into a term set
+- an inverted index maps term -> FAQ ids, so a lookup only scores FAQs
+  sharing a term with the message (sublinear in the number of FAQs)
+- terms are IDF-weighted, so "how"/"the"/"do" count for little and
+  "refund"/"deposit" for a lot; the score is an IDF-weighted Jaccard
+
+The file's mtime is checked at most every FAQ_RELOAD_INTERVAL seconds and
+the index is rebuilt and swapped in when it changes (hot reload, no
+restart).
+"""
+import json
+import math
+import os
+import re
+import threading
+import time
+from collections import defaultdict
+
+FAQ_RELOAD_INTERVAL = float(os.environ.get("FAQ_RELOAD_INTERVAL", "5"))
+
+_WORD_RE = re.compile(r'\w+')
+
+
+def tokenize(text):
+    return set(_WORD_RE.findall(text.lower()))
+
+
+class _Snapshot:
+    """Immutable index over one version of the FAQ file."""
+
+    def __init__(self, faqs, mtime):
+        self.faqs = faqs
+        self.mtime = mtime
+        self.postings = defaultdict(list)  # term -> [faq id, ...]
+        term_sets = []
+        for faq_id, faq in enumerate(faqs):
+            terms = tokenize(faq.get('question', ''))
+            term_sets.append(terms)
+            for term in terms:
+                self.postings[term].append(faq_id)
+
+        total = len(faqs)
+        self.idf = {
+            term: math.log((total + 1) / (len(ids) + 1)) + 1.0
+            for term, ids in self.postings.items()
+        }
+        # Weight of each question's term set, for the union in the Jaccard
+        self.weights = [sum(self.idf[term] for term in terms) for terms in term_sets]
+
+    def idf_of(self, term):
+        # Unseen terms are as rare as a term in no FAQ
+        return self.idf.get(term, math.log(len(self.faqs) + 1) + 1.0)
+
+
+class FAQIndex:
+    def __init__(self, path, reload_interval=FAQ_RELOAD_INTERVAL):
+        self.path = path
+        self.reload_interval = reload_interval
+        self._lock = threading.Lock()
+        self._checked_at = 0.0
+        self._snapshot = self._load()
+
+    def _load(self):
+        try:
+            mtime = os.path.getmtime(self.path)
+            with open(self.path, 'r', encoding='utf-8') as f:
+                faqs = json.load(f)
+        except Exception as e:
+            print(f"Error loading FAQs: {e}")
+            return _Snapshot([], None)
+        return _Snapshot(faqs, mtime)
+
+    def _maybe_reload(self):
+        now = time.monotonic()
+        if now - self._checked_at < self.reload_interval:
+            return
+        with self._lock:
+            if now - self._checked_at < self.reload_interval:
+                return
+            self._checked_at = now
+            try:
+                mtime = os.path.getmtime(self.path)
+            except OSError:
+                return
+            if mtime != self._snapshot.mtime:
+                snapshot = self._load()
+                if snapshot.mtime is not None:
+                    self._snapshot = snapshot
+                    print(f"🔄 Reloaded {len(snapshot.faqs)} FAQs from {self.path}")
+
+    @property
+    def faqs(self):
+        self._maybe_reload()
+        return self._snapshot.faqs
+
+    def search(self, query, max_results=3, min_score=0.1):
+        """
+        FAQs whose question best matches `query`.
+
+        Args:
+            query: User message
+            max_results: Maximum FAQs returned
+            min_score: Minimum IDF-weighted Jaccard similarity
+
+        Returns:
+            List of FAQ dicts, best first
+        """
+        self._maybe_reload()
+        snapshot = self._snapshot
+        query_terms = tokenize(query)
+        if not query_terms or not snapshot.faqs:
+            return []
+
+        # Intersection weight per candidate, touching only FAQs that share a term
+        overlap = defaultdict(float)
+        for term in query_terms:
+            ids = snapshot.postings.get(term)
+            if ids:
+                weight = snapshot.idf[term]
+                for faq_id in ids:
+                    overlap[faq_id] += weight
+
+        query_weight = sum(snapshot.idf_of(term) for term in query_terms)
+        scored = []
+        for faq_id, shared in overlap.items():
+            score = shared / (query_weight + snapshot.weights[faq_id] - shared)
+            if score > min_score:
+                scored.append((score, faq_id))
+
+        scored.sort(key=lambda item: (-item[0], item[1]))
+        return [snapshot.faqs[faq_id] for _, faq_id in scored[:max_results]]
@@ -0,0 +1,158 @@
+"""
+Prompt context budgeting for the Roomies chatbot.
+
+The platform guide used to be pasted into every Gemini prompt in full. It
+is now split into sections, each tagged with the intents it answers. Their
+token counts are computed once at import. Per message, the assembler adds
+context in priority order until CHAT_CONTEXT_TOKEN_BUDGET is reached:
+
+1. the one-line platform summary (always)
+2. the best-matching FAQ
+3. guide sections whose intent keywords appear in the message
+4. matching room listings
+5. the remaining FAQs
+6. if no intent matched, the other guide sections in guide order
+
+Token counts are an offline estimate (words + punctuation, the same
+ballpark as Gemini's tokenizer for this text); they are used for the
+budget and reported per call, not billed.
+"""
+import os
+import re
+
+CHAT_CONTEXT_TOKEN_BUDGET = int(os.environ.get("CHAT_CONTEXT_TOKEN_BUDGET", "450"))
+
+_TOKEN_RE = re.compile(r"\w+|[^\w\s]")
+_WORD_RE = re.compile(r"\w+")
+
+
+def count_tokens(text):
+    """Approximate LLM token count of `text`."""
+    return len(_TOKEN_RE.findall(text))
+
+
+class Section:
+    def __init__(self, name, keywords, text):
+        self.name = name
+        self.keywords = frozenset(keywords)
+        self.text = text.strip()
+        self.tokens = count_tokens(self.text)
+
+
+SUMMARY = Section("summary", (), """
+📌 WHAT IS ROOMIES?
+Roomies is India's leading student housing platform that helps students find hostels, PGs (Paying Guest accommodations), flats, and compatible roommates using AI-powered matching technology.
+""")
+
+GUIDE_SECTIONS = [
+    Section("property_types",
+            ("hostel", "hostels", "pg", "pgs", "flat", "flats", "apartment", "shared", "property", "type",
+             "types", "accommodation", "meals", "food", "dormitory"), """
+🏠 PROPERTY TYPES AVAILABLE:
+- Hostel: Shared dormitory-style accommodation with common facilities
+- PG (Paying Guest): Private or shared rooms in residential buildings, often with meals included
+- Flat/Apartment: Independent rooms or entire flats for rent
+- Shared Room: Share a room with other students to save costs
+"""),
+    Section("pages",
+            ("page", "where", "navigate", "explore", "dashboard", "list", "listing", "listings", "owner",
+             "find", "search", "browse", "filter", "filters", "link", "deal", "deals", "flash", "discount",
+             "saved", "profile", "verification", "bookings"), """
+📍 KEY PAGES & FEATURES:
+• /explore - Browse and search all available rooms with filters for location, price range, property type, and amenities
+• /ai-matching - AI-powered roommate matching based on lifestyle preferences
+• /findmate - Find compatible roommates based on profile
+• /list-room - Property owners can list their rooms for FREE (basic listing) or with premium features
+• /dashboard - Students can manage their profile, bookings, saved listings, and verification status
+• /flash-deals - 24-hour limited-time discounts on select properties
+"""),
+    Section("ai_matching",
+            ("roommate", "roommates", "roomie", "flatmate", "match", "matches", "matching", "compatible",
+             "compatibility", "ai", "preference", "preferences", "questionnaire", "lifestyle", "sleep",
+             "introvert", "extrovert"), """
+🤖 AI ROOMMATE MATCHING:
+Our AI analyzes your profile including:
+- Sleep schedule (early bird vs night owl)
+- Social level (extrovert/introvert/ambivert)
+- Cleanliness preferences (neat freak/moderate/relaxed)
+- Budget range
+And suggests compatible roommates with a compatibility score!
+
+To use AI matching, users can:
+1. Go to /ai-matching page
+2. Fill out the preference questionnaire
+3. Click "Find My Matches" to see compatible students
+4. Or chat with me and describe what they're looking for!
+"""),
+    Section("pricing",
+            ("price", "prices", "pricing", "fee", "fees", "cost", "costs", "pay", "payment", "deposit",
+             "booking", "book", "refund", "refundable", "charge", "charges", "free", "money", "rupee",
+             "rent", "cheap", "expensive"), """
+💰 PRICING & FEES:
+- Searching for rooms: FREE for all users
+- Booking Fee: ₹999 one-time fee when booking a room
+- Security Deposit: 2x monthly rent (refundable at end of stay)
+"""),
+    Section("contact",
+            ("contact", "support", "email", "help", "complaint", "complain", "reach", "call", "phone",
+             "issue", "problem"), """
+📞 CONTACT & SUPPORT:
+- Email: support@roomies.in
+- Response time: Within 24 hours
+"""),
+]
+
+GUIDE_HEADER = "🌐 ROOMIES PLATFORM - GUIDE:"
+FAQ_HEADER = "📚 FAQ Knowledge Base:"
+ROOMS_HEADER = "🏠 Available Rooms/Listings:"
+
+
+def relevant_sections(message):
+    """Guide sections whose intent keywords appear in `message`."""
+    words = set(_WORD_RE.findall(message.lower()))
+    return [section for section in GUIDE_SECTIONS if section.keywords & words]
+
+
+def assemble(message, faq_blocks=(), room_lines=(), budget=CHAT_CONTEXT_TOKEN_BUDGET):
+    """
+    Build the prompt context for `message` within a token budget.
+
+    Args:
+        message: User message (drives which guide sections are relevant)
+        faq_blocks: "Q: ...\\nA: ..." strings, best first
+        room_lines: One line per listing, best first
+        budget: Maximum context tokens
+
+    Returns:
+        (context text, context token count, names of included guide sections)
+    """
+    used = SUMMARY.tokens + count_tokens(GUIDE_HEADER)
+    faqs, rooms, sections = [], [], []
+
+    def fit(items, chosen, tokens_of, header=None):
+        nonlocal used
+        for item in items:
+            tokens = tokens_of(item)
+            if header and not chosen:
+                # The block's header is only emitted with its first item
+                tokens += count_tokens(header)
+            if used + tokens <= budget:
+                chosen.append(item)
+                used += tokens
+
+    matched = relevant_sections(message)
+    fit(faq_blocks[:1], faqs, count_tokens, FAQ_HEADER)
+    fit(matched, sections, lambda section: section.tokens)
+    fit(room_lines, rooms, count_tokens, ROOMS_HEADER)
+    fit(faq_blocks[1:], faqs, count_tokens, FAQ_HEADER)
+    if not matched:
+        fit(GUIDE_SECTIONS, sections, lambda section: section.tokens)
+    sections.sort(key=GUIDE_SECTIONS.index)
+
+    parts = []
+    if faqs:
+        parts.append(FAQ_HEADER + "\n" + "\n\n".join(faqs) + "\n")
+    if rooms:
+        parts.append(ROOMS_HEADER + "\n" + "\n".join(rooms) + "\n")
+    parts.append("\n".join([GUIDE_HEADER, "", SUMMARY.text] + ["\n" + section.text for section in sections]))
+    return "\n".join(parts), used, [section.name for section in sections]
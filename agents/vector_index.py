@@ -0,0 +1,318 @@
+"""
+Local vector retrieval for the Roomies chatbot (NumPy only).
+
+A middle ground between keyword matching and the FAISS +
+SentenceTransformer path in agents/chatbot.py: no model download, no
+native index, millisecond lookups.
+
+- Vectorizer: word unigrams plus character 3-grams of each word, hashed
+  into VECTOR_INDEX_DIM buckets with a stable hash (crc32), sublinear TF
+  and IDF weights learned from the corpus. Character n-grams make
+  "refundable" match "refunds" and survive typos.
+- Matrix: one L2-normalized row per document (FAQs, room descriptions)
+  in CSR form (data / indices / indptr arrays). A document has tens of
+  non-zero buckets out of VECTOR_INDEX_DIM, so memory grows with the
+  text indexed (~8 bytes per non-zero), not rows x dim: 100k rooms are
+  tens of MB instead of ~800MB dense. Cosine similarity for a query is
+  one sparse matrix-vector product.
+- Persistence: data.npy / indices.npy / indptr.npy / idf.npy / docs.json
+  in a directory named after the documents' fingerprint under
+  VECTOR_INDEX_DIR. The set is written to a temp directory and renamed
+  into place in one step, so a reader sees all files of one build or
+  none. The matrix arrays are memory-mapped on load (workers share the
+  pages) and rebuilt only when the fingerprint changes.
+
+Documents come from sources registered per kind:
+
+    chat_index.add_source("faq", lambda: [(question, text), ...])
+    chat_index.add_source("room", load_room_documents)
+    chat_index.refresh()
+    chat_index.search("is the deposit refundable", kind="faq", k=3)
+"""
+import hashlib
+import json
+import math
+import os
+import re
+import shutil
+import threading
+import time
+import zlib
+from collections import Counter
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+VECTOR_INDEX_DIR = os.environ.get("VECTOR_INDEX_DIR", os.path.join(BASE_DIR, "instance", "vector_index"))
+VECTOR_INDEX_DIM = int(os.environ.get("VECTOR_INDEX_DIM", "2048"))
+# Seconds between checks whether the documents changed (other workers, FAQ edits)
+VECTOR_INDEX_TTL = float(os.environ.get("VECTOR_INDEX_TTL", "300"))
+
+_WORD_RE = re.compile(r'\w+')
+
+_CSR_FILES = ("data.npy", "indices.npy", "indptr.npy")
+
+
+class CsrMatrix:
+    """Row-compressed sparse matrix: just the product with a dense vector."""
+
+    def __init__(self, data, indices, indptr, dim):
+        self.data = data
+        self.indices = indices
+        self.indptr = indptr
+        self.shape = (len(indptr) - 1, dim)
+
+    def dot(self, vector):
+        """Matrix-vector product as a dense float array, one score per row."""
+        sums = np.concatenate(([0.0], np.cumsum(self.data * vector[self.indices], dtype=np.float64)))
+        return sums[self.indptr[1:]] - sums[self.indptr[:-1]]
+
+
+class HashingVectorizer:
+    """Hashed word + character 3-gram TF-IDF vectors."""
+
+    def __init__(self, dim=VECTOR_INDEX_DIM):
+        self.dim = dim
+
+    def features(self, text):
+        """Bucket index of every feature in `text` (with repeats)."""
+        buckets = []
+        for word in _WORD_RE.findall(text.lower()):
+            buckets.append(zlib.crc32(b"w:" + word.encode("utf-8")) % self.dim)
+            padded = f"<{word}>"
+            for i in range(len(padded) - 2):
+                buckets.append(zlib.crc32(b"c:" + padded[i:i + 3].encode("utf-8")) % self.dim)
+        return buckets
+
+    def fit_idf(self, texts):
+        """Smoothed IDF per bucket."""
+        df = np.zeros(self.dim, dtype=np.float32)
+        for text in texts:
+            df[list(set(self.features(text)))] += 1
+        return (np.log((len(texts) + 1) / (df + 1)) + 1).astype(np.float32)
+
+    def _row(self, text, idf):
+        """(buckets, L2-normalized TF-IDF weights) of one text."""
+        counts = sorted(Counter(self.features(text)).items())
+        buckets = np.array([bucket for bucket, _ in counts], dtype=np.int32)
+        weights = np.array([1 + math.log(count) for _, count in counts], dtype=np.float32) * idf[buckets]
+        norm = np.linalg.norm(weights)
+        return buckets, weights / norm if norm else weights
+
+    def transform(self, texts, idf):
+        """L2-normalized TF-IDF rows, one per text, as a CsrMatrix."""
+        rows = [self._row(text, idf) for text in texts]
+        indptr = np.zeros(len(rows) + 1, dtype=np.int64)
+        indptr[1:] = np.cumsum([len(buckets) for buckets, _ in rows])
+        indices = np.concatenate([buckets for buckets, _ in rows]) if rows else np.zeros(0, np.int32)
+        data = np.concatenate([weights for _, weights in rows]) if rows else np.zeros(0, np.float32)
+        return CsrMatrix(data.astype(np.float32), indices.astype(np.int32), indptr, self.dim)
+
+    def vector(self, text, idf):
+        """Dense L2-normalized TF-IDF vector of one text (a query)."""
+        buckets, weights = self._row(text, idf)
+        vector = np.zeros(self.dim, dtype=np.float32)
+        vector[buckets] = weights
+        return vector
+
+
+class VectorIndex:
+    """Cosine top-k over FAQs and rooms, persisted as memory-mapped sparse .npy files."""
+
+    def __init__(self, directory=VECTOR_INDEX_DIR, dim=VECTOR_INDEX_DIM, ttl=VECTOR_INDEX_TTL):
+        self.directory = directory
+        self.vectorizer = HashingVectorizer(dim)
+        self.ttl = ttl
+        self._sources = {}
+        # (matrix, idf, kinds array, ids list, kind names) swapped in as one tuple
+        self._state = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+        self._refreshing = threading.Lock()
+
+    @property
+    def available(self):
+        return np is not None and self._state is not None
+
+    def add_source(self, kind, loader):
+        """Register a function returning [(id, text), ...] for one document kind."""
+        self._sources[kind] = loader
+
+    def invalidate(self):
+        """Re-check the documents on the next search (e.g. after a listing write)."""
+        self._checked_at = 0.0
+
+    def _documents(self):
+        docs = []
+        for kind in sorted(self._sources):
+            for doc_id, text in self._sources[kind]():
+                if text:
+                    docs.append((kind, doc_id, text))
+        return docs
+
+    @staticmethod
+    def _fingerprint(docs, dim):
+        # The storage layout is part of the fingerprint, so older builds are never reused
+        digest = hashlib.sha1(f"csr:{dim}".encode())
+        for kind, doc_id, text in docs:
+            digest.update(f"{kind}\x1f{doc_id}\x1f{text}\x1e".encode("utf-8"))
+        return digest.hexdigest()
+
+    def refresh(self):
+        """
+        Load the persisted index if it matches the current documents, else rebuild it.
+
+        Returns:
+            Number of documents indexed
+        """
+        if np is None:
+            return 0
+        with self._lock:
+            self._checked_at = time.monotonic()
+            docs = self._documents()
+            fingerprint = self._fingerprint(docs, self.vectorizer.dim)
+            if self._state is not None and self._state[5] == fingerprint:
+                return len(docs)
+            state = self._load(fingerprint)
+            if state is None:
+                state = self._build(docs, fingerprint)
+            self._state = state
+            return len(docs)
+
+    def _folder(self, fingerprint):
+        return os.path.join(self.directory, fingerprint)
+
+    def _load_matrix(self, folder):
+        data, indices, indptr = (np.load(os.path.join(folder, name), mmap_mode="r") for name in _CSR_FILES)
+        return CsrMatrix(data, indices, indptr, self.vectorizer.dim)
+
+    def _load(self, fingerprint):
+        folder = self._folder(fingerprint)
+        try:
+            with open(os.path.join(folder, "docs.json"), "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            if meta.get("fingerprint") != fingerprint:
+                return None
+            matrix = self._load_matrix(folder)
+            idf = np.load(os.path.join(folder, "idf.npy"))
+        except (OSError, ValueError):
+            return None
+        nnz = len(matrix.data)
+        if (matrix.shape[0] != len(meta["ids"]) or len(matrix.indices) != nnz
+                or (len(matrix.indptr) and matrix.indptr[-1] != nnz) or idf.shape != (self.vectorizer.dim,)):
+            return None
+        return self._make_state(matrix, idf, meta["kinds"], meta["ids"], fingerprint)
+
+    def _build(self, docs, fingerprint):
+        started = time.perf_counter()
+        texts = [text for _, _, text in docs]
+        idf = self.vectorizer.fit_idf(texts)
+        matrix = self.vectorizer.transform(texts, idf)
+        kinds = [kind for kind, _, _ in docs]
+        ids = [doc_id for _, doc_id, _ in docs]
+        try:
+            self._save(matrix, idf, kinds, ids, fingerprint)
+            matrix = self._load_matrix(self._folder(fingerprint))
+        except OSError as e:
+            print(f"⚠️ Could not persist vector index: {e}")
+        print(f"✅ Vector index built: {len(docs)} documents in {(time.perf_counter() - started) * 1000:.0f}ms")
+        return self._make_state(matrix, idf, kinds, ids, fingerprint)
+
+    def _save(self, matrix, idf, kinds, ids, fingerprint):
+        # Write the whole set to a temp directory and rename it into place once,
+        # so other workers never see files from two different builds
+        os.makedirs(self.directory, exist_ok=True)
+        folder = self._folder(fingerprint)
+        staging = f"{folder}.{os.getpid()}.tmp"
+        shutil.rmtree(staging, ignore_errors=True)
+        os.makedirs(staging)
+        arrays = zip(_CSR_FILES + ("idf.npy",), (matrix.data, matrix.indices, matrix.indptr, idf))
+        for name, array in arrays:
+            with open(os.path.join(staging, name), "wb") as f:
+                np.save(f, array)
+        with open(os.path.join(staging, "docs.json"), "w", encoding="utf-8") as f:
+            json.dump({"fingerprint": fingerprint, "kinds": kinds, "ids": ids}, f)
+        try:
+            os.rename(staging, folder)
+        except OSError:
+            if self._load(fingerprint) is not None:
+                # Another worker published the same build first
+                shutil.rmtree(staging, ignore_errors=True)
+            else:
+                # A damaged copy is in the way: replace it
+                shutil.rmtree(folder, ignore_errors=True)
+                os.rename(staging, folder)
+        self._prune(fingerprint)
+
+    def _prune(self, keep):
+        """Remove builds for older document sets (open memory maps stay valid)."""
+        for name in os.listdir(self.directory):
+            if name != keep and not name.endswith(".tmp"):
+                path = os.path.join(self.directory, name)
+                if os.path.isdir(path):
+                    shutil.rmtree(path, ignore_errors=True)
+                else:
+                    # Flat matrix.npy / idf.npy / docs.json from the previous layout
+                    try:
+                        os.remove(path)
+                    except OSError:
+                        pass
+
+    @staticmethod
+    def _make_state(matrix, idf, kinds, ids, fingerprint):
+        names = sorted(set(kinds))
+        codes = np.array([names.index(kind) for kind in kinds], dtype=np.int16)
+        return (matrix, idf, codes, ids, names, fingerprint)
+
+    def _maybe_refresh(self):
+        if time.monotonic() - self._checked_at < self.ttl:
+            return
+        if not self._refreshing.acquire(blocking=False):
+            return
+        self._checked_at = time.monotonic()
+
+        def run():
+            try:
+                self.refresh()
+            except Exception as e:
+                print(f"⚠️ Vector index refresh failed: {e}")
+            finally:
+                self._refreshing.release()
+
+        threading.Thread(target=run, name="vector-index-refresh", daemon=True).start()
+
+    def search(self, text, k=5, kind=None, min_score=0.0):
+        """
+        Most similar documents to `text`.
+
+        Args:
+            text: Query text
+            k: Maximum results
+            kind: Only return documents of this kind ("faq", "room")
+            min_score: Minimum cosine similarity
+
+        Returns:
+            List of (score, kind, id), best first
+        """
+        if not self.available:
+            return []
+        self._maybe_refresh()
+        matrix, idf, codes, ids, names, _ = self._state
+        if not len(ids):
+            return []
+        scores = matrix.dot(self.vectorizer.vector(text, idf))
+        if kind is not None:
+            if kind not in names:
+                return []
+            scores = np.where(codes == names.index(kind), scores, -1.0)
+        k = min(k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(float(scores[i]), names[codes[i]], ids[i]) for i in top if scores[i] > min_score]
+
+
+# Shared index for the chatbot
+chat_index = VectorIndex()
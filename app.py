@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import json
 import logging
 import os
 from dotenv import load_dotenv
@@ -18,6 +19,7 @@ import traceback
 
 from flask import (
     Flask,
+    Response,
     flash,
     has_request_context,
     jsonify,
@@ -26,6 +28,7 @@ from flask import (
     request,
     url_for,
     send_file,
+    stream_with_context,
 )
 import io
 import time
@@ -42,11 +45,36 @@ from flask_login import (
     logout_user,
 )
 from flask_sqlalchemy import SQLAlchemy
-from sqlalchemy import event, func, inspect, or_, text
+from sqlalchemy import event, func, inspect, or_, select, text
 from sqlalchemy.engine import Engine
 from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import joinedload
 from functools import wraps
 from search_engine import SearchTrie
+from utils.request_cache import (
+    forget_request_memo,
+    init_request_stats,
+    request_cached_property,
+)
+from utils.data_export import CSV_MIMETYPE, XLSX_MIMETYPE, csv_chunks, iter_row_chunks, xlsx_chunks
+from utils.db_pool import (
+    DB_MAX_OVERFLOW,
+    DB_POOL_SIZE,
+    DB_POOL_TIMEOUT,
+    DB_SSLMODE,
+    PGBOUNCER,
+    engine_options,
+    register_pool_metrics,
+)
+from utils.health import CachedCheck
+from utils.metrics import init_metrics, metrics, track_external
+from utils.query_profiler import query_profiler
+from utils.sqlite_tuning import apply_pragmas, serialized_write
+from utils.search_backend import get_search_backend, install_search_vector_ddl
+from utils.suggestion_index import suggestion_index
+from utils.vocabulary_cache import vocabulary_cache
+from agents.vector_index import chat_index
+from utils.user_cache import user_cache
 # Use lightweight chatbot (no FAISS/SentenceTransformers - better for Render)
 try:
     from agents.chatbot_lite import chatbot
@@ -56,6 +84,8 @@ except ImportError as e:
     class MockChatbot:
         def get_response(self, msg):
             return "Chatbot is currently disabled. Please try again later."
+        async def get_response_async(self, msg, **kwargs):
+            return self.get_response(msg)
         def set_room_provider(self, func):
             pass
     chatbot = MockChatbot()
@@ -64,7 +94,9 @@ except ImportError as e:
 # from utils.verification import process_verification  # Import verification logic
 try:
     from utils.verification import process_verification
+    from utils.verification import reader as ocr_reader
 except ImportError:
+    ocr_reader = None
     # Mock verification if utils module is missing or fails to load
     def process_verification(image_path, user_record):
         return {"verified": False, "message": "Auto-verification disabled on this server."}
@@ -132,9 +164,13 @@ except ImportError as e:
     class NewsService:
         def get_latest_news(self, limit=5):
             return []
+        async def get_latest_news_async(self, limit=5):
+            return []
 
-# Initialize News Service
+# Initialize News Service (feeds are cached and refreshed in the background)
 news_service = NewsService()
+# Seconds browsers may reuse an /api/news response
+NEWS_BROWSER_CACHE_SECONDS = 300
 
 # Import config
 try:
@@ -165,16 +201,14 @@ if database_url and database_url.startswith("postgres://"):
 app.config["SQLALCHEMY_DATABASE_URI"] = database_url
 app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
 
-# Add SSL requirement for Supabase/PostgreSQL connections
+# Pool sizing, SSL and PgBouncer settings for Supabase/PostgreSQL (see utils/db_pool.py)
+app.config["SQLALCHEMY_ENGINE_OPTIONS"] = engine_options(database_url)
 if "postgresql" in database_url or "postgres" in database_url:
-    app.config["SQLALCHEMY_ENGINE_OPTIONS"] = {
-        "connect_args": {
-            "sslmode": "require"
-        },
-        "pool_pre_ping": True,  # Check connection health before use
-        "pool_recycle": 300,    # Recycle connections every 5 minutes
-    }
-    print("🔒 SSL mode enabled for PostgreSQL connection")
+    print(
+        f"🔒 PostgreSQL pool: size={DB_POOL_SIZE} overflow={DB_MAX_OVERFLOW} "
+        f"timeout={DB_POOL_TIMEOUT}s sslmode={DB_SSLMODE}"
+        + (" (PgBouncer mode)" if PGBOUNCER else "")
+    )
 
 # Razorpay Payment Gateway Configuration
 try:
@@ -235,12 +269,10 @@ def load_user(user_id: str):
         role, id_str = user_id.split(":", 1)
         uid = int(id_str)
         
-        if role == "student":
-            return Student.query.get(uid)
-        elif role == "owner":
-            return Owner.query.get(uid)
-        elif role == "admin":
-            return Admin.query.get(uid)
+        model = {"student": Student, "owner": Owner, "admin": Admin}.get(role)
+        if model is not None:
+            # Served from the short-lived per-process cache when possible
+            return user_cache.load(db.session, model, uid)
     except (ValueError, AttributeError):
         return None
     
@@ -249,12 +281,23 @@ def load_user(user_id: str):
 logging.basicConfig(level=logging.INFO)
 app.logger.setLevel(logging.INFO)
 
+# Per-request SQL statement counts and memo hit rates
+init_request_stats(app)
+
+# SQL profiler / N+1 detector (debug mode or QUERY_PROFILER=1), report at /debug/queries
+query_profiler.init_app(app)
+
+# Prometheus-style /metrics (route latency, SQL time, external calls, caches)
+init_metrics(app)
+metrics.register_cache("users", lambda: (user_cache.hits, user_cache.misses))
+with app.app_context():
+    register_pool_metrics(db.engine)
+
 if app.config["SQLALCHEMY_DATABASE_URI"].startswith("sqlite"):
     @event.listens_for(Engine, "connect")
     def set_sqlite_pragma(dbapi_connection, connection_record):
-        cursor = dbapi_connection.cursor()
-        cursor.execute("PRAGMA foreign_keys=ON")
-        cursor.close()
+        # WAL, synchronous=NORMAL, busy_timeout, mmap/cache (SQLITE_PROFILE=safe: foreign keys only)
+        apply_pragmas(dbapi_connection)
 
 def admin_required(f):
     @wraps(f)
@@ -334,9 +377,9 @@ class Student(TimestampMixin, PasswordMixin, UserMixin, db.Model):
     def get_id(self) -> str:  # type: ignore[override]
         return f"student:{self.id}"
     
-    @property
+    @request_cached_property
     def active_subscription(self):
-        """Get active subscription if any."""
+        """Get active subscription if any (queried once per request)."""
         sub = UserSubscription.query.filter_by(
             user_id=self.id,
             user_type="student",
@@ -375,9 +418,9 @@ class Owner(TimestampMixin, PasswordMixin, UserMixin, db.Model):
     def get_id(self) -> str:  # type: ignore[override]
         return f"owner:{self.id}"
     
-    @property
+    @request_cached_property
     def active_subscription(self):
-        """Get active subscription if any."""
+        """Get active subscription if any (queried once per request)."""
         sub = UserSubscription.query.filter_by(
             user_id=self.id,
             user_type="owner",
@@ -393,15 +436,27 @@ class Owner(TimestampMixin, PasswordMixin, UserMixin, db.Model):
     @property
     def commission_rate(self):
         """Get applicable commission rate based on subscription."""
-        if self.is_premium and self.active_subscription.plan.commission_discount > 0:
+        subscription = self.active_subscription
+        if subscription is not None and subscription.plan.commission_discount > 0:
             base_rate = 25.0  # Base 25% commission
-            discount = self.active_subscription.plan.commission_discount
+            discount = subscription.plan.commission_discount
             return base_rate - (base_rate * discount / 100)
         return 25.0  # Default 25%
 
 
 class Room(TimestampMixin, db.Model):
     __tablename__ = "rooms"
+    # Match /api/rooms: verified filter + price/newest sort, property type and rent filters.
+    # Trigram GIN indexes for the ILIKE searches are PostgreSQL-only and live in
+    # migrations/add_performance_indexes.py.
+    __table_args__ = (
+        db.Index("ix_rooms_verified_price", "verified", "price"),
+        db.Index("ix_rooms_verified_created_at", "verified", "created_at"),
+        db.Index("ix_rooms_property_type_lower_price", func.lower(text("property_type")), "price"),
+        db.Index("ix_rooms_price", "price"),
+        db.Index("ix_rooms_college_nearby", "college_nearby"),
+        db.Index("ix_rooms_location", "location"),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(255), nullable=False)
@@ -492,6 +547,12 @@ class Room(TimestampMixin, db.Model):
         }
 
 
+# PostgreSQL: generated tsvector column + GIN index for /api/rooms?q= and /api/suggestions.
+# Not mapped on the model (SQLite has no tsvector); existing databases get it from
+# migrations/add_room_search_vector.py.
+install_search_vector_ddl(Room.__table__)
+
+
 class ContactMessage(TimestampMixin, db.Model):
     __tablename__ = "contact_messages"
 
@@ -549,6 +610,10 @@ class Verification(TimestampMixin, db.Model):
 class FlashDeal(TimestampMixin, db.Model):
     """Flash deals - 24hr limited offers with pulsing map markers."""
     __tablename__ = "flash_deals"
+    __table_args__ = (
+        db.Index("ix_flash_deals_expires_at", "expires_at"),
+        db.Index("ix_flash_deals_room_id_expires_at", "room_id", "expires_at"),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     room_id = db.Column(db.Integer, db.ForeignKey("rooms.id"), nullable=False)
@@ -638,6 +703,12 @@ class Referral(TimestampMixin, db.Model):
 
 class Booking(db.Model):
     __tablename__ = "bookings"
+    # /api/bookings/my and /api/owner/bookings filter by student/room and sort newest first
+    __table_args__ = (
+        db.Index("ix_bookings_student_id_created_at", "student_id", "created_at"),
+        db.Index("ix_bookings_room_id_created_at", "room_id", "created_at"),
+        db.Index("ix_bookings_booking_status", "booking_status"),
+    )
     id = db.Column(db.Integer, primary_key=True)
     student_id = db.Column(db.Integer, db.ForeignKey("students.id"), nullable=False)
     room_id = db.Column(db.Integer, db.ForeignKey("rooms.id"), nullable=False)
@@ -756,6 +827,9 @@ class Wallet(db.Model):
 
 class WalletTransaction(db.Model):
     __tablename__ = "wallet_transactions"
+    __table_args__ = (
+        db.Index("ix_wallet_transactions_wallet_id_created_at", "wallet_id", "created_at"),
+    )
     id = db.Column(db.Integer, primary_key=True)
     wallet_id = db.Column(db.Integer, db.ForeignKey("wallets.id"), nullable=False)
     amount = db.Column(db.Float, nullable=False)
@@ -1065,6 +1139,20 @@ class Analytics(db.Model):
     amount = db.Column(db.Float, default=0.0)
     date = db.Column(db.Date, default=datetime.utcnow().date)
 
+# Drop cached users once a change to their row commits (profile, verification, KYC)
+for _user_model in (Student, Owner, Admin):
+    user_cache.watch(_user_model)
+
+
+@event.listens_for(UserSubscription, "after_insert")
+@event.listens_for(UserSubscription, "after_update")
+@event.listens_for(UserSubscription, "after_delete")
+def _forget_subscription_memo(mapper, connection, target):
+    """Make the next is_premium/active_subscription read see subscription changes."""
+    owner_class = {"student": "Student", "owner": "Owner"}.get(target.user_type)
+    forget_request_memo((owner_class, "active_subscription", target.user_id))
+
+
 def get_current_owner():
     if current_user.is_authenticated and getattr(current_user, 'role', None) == 'owner':
         return current_user
@@ -1078,6 +1166,49 @@ def get_current_student():
 # ---------------------------------------------------------------------------
 # Search Index Initialization (Must be after Models)
 # ---------------------------------------------------------------------------
+# Reported by /readyz
+search_index_status = {"ready": False, "rooms": 0, "max_room_id": 0, "built_at": None, "error": None}
+
+
+def index_rooms_for_search(rows) -> int:
+    """Add (id, title, location, college) rows to the Trie."""
+    count = 0
+    for room_id, title, location, college in rows:
+        search_trie.insert(title, room_id)
+        search_trie.insert(location, room_id)
+        search_trie.insert(college, room_id)
+        search_index_status["max_room_id"] = max(search_index_status["max_room_id"], room_id)
+        count += 1
+    search_index_status["rooms"] += count
+    return count
+
+
+def sync_search_index() -> int:
+    """Index rooms created since the Trie was last updated (by any worker)."""
+    return index_rooms_for_search(
+        db.session.query(Room.id, Room.title, Room.location, Room.college_nearby)
+        .filter(Room.id > search_index_status["max_room_id"])
+    )
+
+
+def load_suggestion_rows():
+    """(id, college, location, title) for every room, for the suggestion index."""
+    # Own app context: also runs in the index's background refresh thread
+    with app.app_context():
+        return db.session.query(Room.id, Room.college_nearby, Room.location, Room.title).all()
+
+
+def load_vocabulary():
+    """(colleges, locations) as distinct values, for the vocabulary cache."""
+    with app.app_context():
+        colleges = [c for (c,) in db.session.query(Room.college_nearby).distinct()]
+        locations = [l for (l,) in db.session.query(Room.location).distinct()]
+    return colleges, locations
+
+
+vocabulary_cache.set_loader(load_vocabulary)
+
+
 def rebuild_search_index():
     """Populate the Trie with current database data."""
     with app.app_context():
@@ -1087,14 +1218,17 @@ def rebuild_search_index():
             if not inspector.has_table("rooms"):
                 return
 
-            rooms = Room.query.all()
-            for room in rooms:
-                # Index title, location, and college
-                search_trie.insert(room.title, room.id)
-                search_trie.insert(room.location, room.id)
-                search_trie.insert(room.college_nearby, room.id)
-            app.logger.info(f"Search index rebuilt with {len(rooms)} rooms.")
+            # Index title, location, and college (columns only, no ORM objects)
+            search_index_status.update(rooms=0, max_room_id=0)
+            count = index_rooms_for_search(
+                db.session.query(Room.id, Room.title, Room.location, Room.college_nearby)
+            )
+            search_index_status.update(
+                ready=True, built_at=datetime.utcnow().isoformat(), error=None
+            )
+            app.logger.info(f"Search index rebuilt with {count} rooms.")
         except Exception as e:
+            search_index_status["error"] = str(e)
             app.logger.error(f"Failed to rebuild search index: {e}")
 
 # Rebuild index on startup
@@ -2271,7 +2405,7 @@ def api_rooms():
         min_available = request.args.get("min_available", type=int)
         limit = request.args.get("limit", type=int) or 50
         offset = request.args.get("offset", type=int) or 0
-        sort_key = (request.args.get("sort") or "price_asc").lower()
+        sort_key = (request.args.get("sort") or ("relevance" if search else "price_asc")).lower()
 
         query = Room.query
         if not include_unverified:
@@ -2281,14 +2415,7 @@ def api_rooms():
         if city:
             query = query.filter(Room.location.ilike(f"%{city}%"))
         if search:
-            like = f"%{search}%"
-            query = query.filter(
-                or_(
-                    Room.title.ilike(like),
-                    Room.location.ilike(like),
-                    Room.college_nearby.ilike(like),
-                )
-            )
+            query = search_backend.filter_rooms(query, search)
         if property_type:
             query = query.filter(func.lower(Room.property_type) == property_type)
         if max_rent is not None:
@@ -2303,7 +2430,11 @@ def api_rooms():
             "slots_desc": (Room.capacity_total - Room.capacity_occupied).desc(),
         }
         order_clause = sort_map.get(sort_key, sort_map["price_asc"])
-        query = query.order_by(order_clause, Room.id.asc())
+        rank_clause = search_backend.rank(search) if search and sort_key == "relevance" else None
+        if rank_clause is not None:
+            query = query.order_by(rank_clause, order_clause, Room.id.asc())
+        else:
+            query = query.order_by(order_clause, Room.id.asc())
 
         total = query.count()
         rooms = query.offset(offset).limit(limit).all()
@@ -2341,8 +2472,7 @@ def api_room_detail(room_id):
 def api_colleges():
     """Get list of unique colleges for autocomplete/filter."""
     try:
-        colleges = db.session.query(Room.college_nearby).distinct().order_by(Room.college_nearby).all()
-        return jsonify([c[0] for c in colleges if c[0]])
+        return jsonify(vocabulary_cache.colleges())
     except Exception as e:
         app.logger.error(f"Failed to fetch colleges: {e}")
         return jsonify([]), 500
@@ -2355,30 +2485,10 @@ def api_suggestions():
         return jsonify([])
     
     try:
-        # Search Colleges
-        colleges = db.session.query(Room.college_nearby)\
-            .filter(Room.college_nearby.ilike(f"%{q}%"))\
-            .distinct().limit(3).all()
-            
-        # Search Locations
-        locations = db.session.query(Room.location)\
-            .filter(Room.location.ilike(f"%{q}%"))\
-            .distinct().limit(3).all()
-            
-        # Search Room Titles
-        titles = db.session.query(Room.title)\
-            .filter(Room.title.ilike(f"%{q}%"))\
-            .distinct().limit(3).all()
-            
-        results = []
-        for c in colleges:
-            if c[0]: results.append({"type": "College", "text": c[0]})
-        for l in locations:
-            if l[0]: results.append({"type": "Location", "text": l[0]})
-        for t in titles:
-            if t[0]: results.append({"type": "Room", "text": t[0]})
-            
-        return jsonify(results)
+        if suggestion_index.ready:
+            return jsonify(suggestion_index.lookup(q))
+        # Index failed to build: colleges, locations and titles in one query
+        return jsonify(search_backend.suggest(q))
     except Exception as e:
         app.logger.error(f"Suggestion API error: {e}")
         return jsonify([])
@@ -2492,6 +2602,11 @@ def create_listing():
         app.logger.exception("Failed to create listing", extra={"owner": owner.id})
         return jsonify({"error": "We could not publish this listing just yet."}), 500
 
+    sync_search_index()
+    suggestion_index.add_room(room.id, room.college_nearby, room.location, room.title)
+    vocabulary_cache.invalidate()
+    chat_index.invalidate()
+
     return jsonify(room.to_dict()), 201
 
 
@@ -2825,6 +2940,9 @@ def delete_listing(listing_id):
     try:
         db.session.delete(room)
         db.session.commit()
+        suggestion_index.remove_room(listing_id)
+        vocabulary_cache.invalidate()
+        chat_index.invalidate()
         flash(f"Listing '{title}' has been deleted.", "success")
     except SQLAlchemyError:
         db.session.rollback()
@@ -2915,69 +3033,64 @@ def admin_logout():
     return redirect(url_for("admin_login"))
 
 
+# Export column layouts: entity -> (sheet name, [(header, column), ...])
+ADMIN_EXPORTS = {
+    "hostels": ("Rooms", [
+        ("id", Room.id), ("title", Room.title), ("price", Room.price),
+        ("location", Room.location), ("college", Room.college_nearby),
+        ("latitude", Room.latitude), ("longitude", Room.longitude),
+        ("owner_id", Room.owner_id), ("verified", Room.verified),
+        ("property_type", Room.property_type), ("capacity_total", Room.capacity_total),
+    ]),
+    "owners": ("Owners", [
+        ("id", Owner.id), ("name", Owner.name), ("email", Owner.email),
+        ("kyc_verified", Owner.kyc_verified),
+    ]),
+    "students": ("Students", [
+        ("id", Student.id), ("name", Student.name), ("email", Student.email),
+        ("college", Student.college), ("verified", Student.verified),
+    ]),
+}
+
+
 @app.route("/admin/export/<entity>")
 @login_required
 @admin_required
 def admin_export_entity(entity):
-    """Export specific data entity to Excel."""
-    try:
-        import pandas as pd
-        import io
-        
-        output = io.BytesIO()
-        filename = f'roomies_{entity}_{datetime.now().strftime("%Y%m%d_%H%M%S")}.xlsx'
-        
-        with pd.ExcelWriter(output, engine='openpyxl') as writer:
-            if entity == 'hostels':
-                rooms = Room.query.all()
-                data = [{
-                    "id": r.id, "title": r.title, "price": r.price, 
-                    "location": r.location, "college": r.college_nearby,
-                    "latitude": r.latitude, "longitude": r.longitude,
-                    "owner_id": r.owner_id, "verified": r.verified,
-                    "property_type": r.property_type, "capacity_total": r.capacity_total
-                } for r in rooms]
-                pd.DataFrame(data).to_excel(writer, sheet_name='Rooms', index=False)
-                
-            elif entity == 'owners':
-                owners = Owner.query.all()
-                data = [{
-                    "id": o.id, "name": o.name, "email": o.email, 
-                    "kyc_verified": o.kyc_verified
-                } for o in owners]
-                pd.DataFrame(data).to_excel(writer, sheet_name='Owners', index=False)
-                
-            elif entity == 'students':
-                students = Student.query.all()
-                data = [{
-                    "id": s.id, "name": s.name, "email": s.email, 
-                    "college": s.college, "verified": s.verified
-                } for s in students]
-                pd.DataFrame(data).to_excel(writer, sheet_name='Students', index=False)
-            
-            else:
-                flash("Invalid entity type", "error")
-                return redirect(url_for("admin_dashboard"))
-
-        output.seek(0)
-        return send_file(
-            output,
-            mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
-            as_attachment=True,
-            download_name=filename
-        )
-    except Exception as e:
-        app.logger.error(f"Export failed: {e}")
-        flash(f"Export failed: {str(e)}", "danger")
+    """Stream a data entity as Excel (default) or CSV (?format=csv)."""
+    if entity not in ADMIN_EXPORTS:
+        flash("Invalid entity type", "error")
         return redirect(url_for("admin_dashboard"))
 
+    sheet_name, columns = ADMIN_EXPORTS[entity]
+    headers = [header for header, _ in columns]
+    statement = select(*[column for _, column in columns]).order_by(columns[0][1])
+    row_chunks = iter_row_chunks(db.session, statement)
+
+    export_format = (request.args.get("format") or "xlsx").lower()
+    stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    if export_format == "csv":
+        body = csv_chunks(headers, row_chunks)
+        mimetype = CSV_MIMETYPE
+        filename = f"roomies_{entity}_{stamp}.csv"
+    else:
+        body = xlsx_chunks(sheet_name, headers, row_chunks)
+        mimetype = XLSX_MIMETYPE
+        filename = f"roomies_{entity}_{stamp}.xlsx"
+
+    response = Response(stream_with_context(body), mimetype=mimetype)
+    response.headers["Content-Disposition"] = f'attachment; filename="{filename}"'
+    return response
+
 @app.route("/admin/import/<entity>", methods=["POST"])
 @login_required
 @admin_required
 def admin_import_entity(entity):
-    """Import specific data entity from Excel."""
+    """Import specific data entity from Excel using set-based inserts."""
     try:
         import pandas as pd
+        from utils.bulk_loader import bulk_insert
+        from utils.data_import import prepare_rooms, prepare_users
         
         if 'file' not in request.files:
             flash("No file part", "error")
@@ -2987,98 +3100,72 @@ def admin_import_entity(entity):
         if file.filename == '':
             flash("No selected file", "error")
             return redirect(url_for("admin_dashboard"))
+
+        if entity not in ADMIN_EXPORTS:
+            flash("Invalid entity type", "error")
+            return redirect(url_for("admin_dashboard"))
             
-        if file:
-            xls = pd.ExcelFile(file)
-            # Default sheet name matches entity, but allow fallback to first sheet
-            sheet_name = entity.capitalize()
-            if entity == 'hostels': sheet_name = 'Rooms'
-            
-            if sheet_name not in xls.sheet_names:
-                # If specific sheet not found, try the first sheet
-                df = pd.read_excel(xls, 0)
-            else:
-                df = pd.read_excel(xls, sheet_name)
-            
+        xls = pd.ExcelFile(file)
+        # Default sheet name matches the export layout, but allow fallback to first sheet
+        sheet_name = ADMIN_EXPORTS[entity][0]
+        if sheet_name not in xls.sheet_names:
+            df = pd.read_excel(xls, 0)
+        else:
+            df = pd.read_excel(xls, sheet_name)
+
+        new_room_floor = None
+        if entity in ('owners', 'students'):
+            model = Owner if entity == 'owners' else Student
+            # One query for every existing key instead of one lookup per row
+            existing = {email for (email,) in db.session.query(func.lower(model.email))}
             if entity == 'owners':
-                count = 0
-                for _, row in df.iterrows():
-                    email = str(row.get('email', '')).strip()
-                    if email and email != 'nan':
-                        owner = Owner.query.filter_by(email=email).first()
-                        if not owner:
-                            owner = Owner(
-                                email=email,
-                                name=row.get('name', 'Unknown'),
-                                kyc_verified=bool(row.get('kyc_verified', False))
-                            )
-                            owner.set_password("welcome123")
-                            db.session.add(owner)
-                            count += 1
-                flash(f"Imported {count} owners.", "success")
-
-            elif entity == 'students':
-                count = 0
-                for _, row in df.iterrows():
-                    email = str(row.get('email', '')).strip()
-                    if email and email != 'nan':
-                        student = Student.query.filter_by(email=email).first()
-                        if not student:
-                            student = Student(
-                                email=email,
-                                name=row.get('name', 'Unknown'),
-                                college=row.get('college', 'Unknown'),
-                                verified=bool(row.get('verified', False))
-                            )
-                            student.set_password("welcome123")
-                            db.session.add(student)
-                            count += 1
-                flash(f"Imported {count} students.", "success")
-
-            elif entity == 'hostels':
-                count = 0
-                # Ensure system owner exists
-                system_owner = Owner.query.filter_by(email="system@roomies.in").first()
-                if not system_owner:
-                    system_owner = Owner(email="system@roomies.in", name="System", kyc_verified=True)
-                    system_owner.set_password("system123")
-                    db.session.add(system_owner)
-                    db.session.commit()
+                rows, errors = prepare_users(df, existing, extra_flags=("kyc_verified",))
+            else:
+                rows, errors = prepare_users(
+                    df, existing, extra_text={"college": "Unknown"}, extra_flags=("verified",)
+                )
+            # Every imported account starts with the same password, so hash it once
+            password_hash = bcrypt.generate_password_hash("welcome123").decode("utf-8")
+            records = rows.assign(password=password_hash).to_dict("records")
+            count = bulk_insert(db.session, model, records)
 
-                for _, row in df.iterrows():
-                    title = row.get('title', 'Untitled')
-                    location = row.get('location', 'Unknown')
-                    
-                    # Try to find owner
-                    owner_email = str(row.get('owner_email', '')).strip()
-                    owner = None
-                    if owner_email and owner_email != 'nan':
-                        owner = Owner.query.filter_by(email=owner_email).first()
-                    
-                    if not owner:
-                        owner = system_owner
-
-                    existing_room = Room.query.filter_by(title=title, location=location).first()
-                    if not existing_room:
-                        room = Room(
-                            title=title,
-                            price=float(row.get('price', 0)),
-                            location=location,
-                            college_nearby=row.get('college', 'Unknown'),
-                            latitude=float(row.get('latitude', 0.0)) if pd.notna(row.get('latitude')) else None,
-                            longitude=float(row.get('longitude', 0.0)) if pd.notna(row.get('longitude')) else None,
-                            owner_id=owner.id,
-                            verified=bool(row.get('verified', False)),
-                            property_type=row.get('property_type', 'shared'),
-                            capacity_total=int(row.get('capacity_total', 1))
-                        )
-                        db.session.add(room)
-                        count += 1
-                flash(f"Imported {count} hostels.", "success")
-            
-            db.session.commit()
-            if entity == 'hostels':
-                rebuild_search_index()
+        else:
+            # Ensure system owner exists
+            system_owner = Owner.query.filter_by(email="system@roomies.in").first()
+            if not system_owner:
+                system_owner = Owner(email="system@roomies.in", name="System", kyc_verified=True)
+                system_owner.set_password("system123")
+                db.session.add(system_owner)
+                db.session.commit()
+
+            existing = {tuple(key) for key in db.session.query(Room.title, Room.location)}
+            rows, errors = prepare_rooms(df, existing)
+
+            owner_emails = sorted(set(rows["owner_email"]) - {""})
+            owner_ids = {}
+            if owner_emails:
+                owner_ids = dict(
+                    db.session.query(func.lower(Owner.email), Owner.id)
+                    .filter(func.lower(Owner.email).in_(owner_emails))
+                    .all()
+                )
+            rows["owner_id"] = rows["owner_email"].map(owner_ids).fillna(system_owner.id).astype(int)
+            records = rows.drop(columns=["owner_email"]).to_dict("records")
+
+            new_room_floor = db.session.query(func.max(Room.id)).scalar() or 0
+            count = bulk_insert(db.session, Room, records)
+
+        db.session.commit()
+        flash(f"Imported {count} {entity}.", "success")
+        if errors:
+            more = f" (+{len(errors) - 5} more)" if len(errors) > 5 else ""
+            flash(f"Rejected {len(errors)} rows: " + "; ".join(errors[:5]) + more, "warning")
+
+        if new_room_floor is not None and count:
+            sync_search_index()
+            suggestion_index.rebuild()
+            vocabulary_cache.invalidate()
+            chat_index.invalidate()
             
     except Exception as e:
         db.session.rollback()
@@ -3300,6 +3387,7 @@ def my_referral_code():
 
 @app.route("/api/referrals/apply", methods=["POST"])
 @login_required
+@serialized_write(db.session)
 def apply_referral():
     """Apply referral code during signup - gives ₹200 to both parties."""
     student = get_current_student()
@@ -3913,7 +4001,8 @@ def create_razorpay_order():
             }
         }
         
-        order = razorpay_client.order.create(data=order_data)
+        with track_external("razorpay"):
+            order = razorpay_client.order.create(data=order_data)
         
         return jsonify({
             "success": True,
@@ -3989,6 +4078,7 @@ def verify_razorpay_payment():
 
 @app.route("/api/bookings/create", methods=["POST"])
 @login_required
+@serialized_write(db.session)
 def create_booking():
     """Step 1: Student initiates booking with ₹999 booking fee."""
     student = get_current_student()
@@ -4453,9 +4543,10 @@ def my_bookings():
     if student is None:
         return jsonify({"error": "Only students can have bookings."}), 403
     
-    bookings = Booking.query.filter_by(student_id=student.id).order_by(
-        Booking.created_at.desc()
-    ).all()
+    # Room (and its owner, joined by Room.owner) in the same SELECT
+    bookings = Booking.query.options(joinedload(Booking.room)).filter_by(
+        student_id=student.id
+    ).order_by(Booking.created_at.desc()).all()
     
     return jsonify({
         "bookings": [b.to_dict() for b in bookings]
@@ -4470,10 +4561,13 @@ def owner_bookings():
     if owner is None:
         return jsonify({"error": "Only owners can view this."}), 403
     
-    # Get all rooms owned by this owner
-    room_ids = [room.id for room in owner.rooms]
+    # Owner's room ids as a subquery instead of loading every room
+    room_ids = select(Room.id).where(Room.owner_id == owner.id)
     
-    bookings = Booking.query.filter(Booking.room_id.in_(room_ids)).order_by(
+    bookings = Booking.query.options(
+        joinedload(Booking.room),
+        joinedload(Booking.student),
+    ).filter(Booking.room_id.in_(room_ids)).order_by(
         Booking.created_at.desc()
     ).all()
     
@@ -4492,6 +4586,7 @@ def owner_bookings():
 
 @app.route("/api/bookings/<int:booking_id>/cancel", methods=["POST"])
 @login_required
+@serialized_write(db.session)
 def cancel_booking(booking_id):
     """Cancel booking (with refund policy)."""
     user = current_user
@@ -4847,15 +4942,53 @@ def roommate_match():
     })
 
 
+def _ping_database():
+    with db.engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+
+
+database_check = CachedCheck(_ping_database)
+
+
 @app.route("/healthz")
 def healthcheck():
     status = {
         "authenticated": current_user.is_authenticated,
         "rooms": Room.query.count(),
+        # Rooms in the search index (0 until it is built; see /readyz)
+        "indexed_rooms": search_index_status["rooms"],
     }
     return jsonify(status)
 
 
+@app.route("/livez")
+def livez():
+    """Liveness probe: the process is up and serving. No I/O."""
+    return jsonify({"status": "ok"})
+
+
+@app.route("/readyz")
+def readyz():
+    """Readiness probe: database reachable (cached SELECT 1) and search index built."""
+    db_ok, db_detail = database_check.result()
+
+    try:
+        from utils.email_service import email_service
+        email_configured = bool(email_service.smtp_user and email_service.smtp_password)
+    except ImportError:
+        email_configured = False
+
+    checks = {
+        "database": {"ok": db_ok, **db_detail},
+        "search_index": {"ok": search_index_status["ready"], **search_index_status},
+        # Optional features: reported, but never make the instance unready
+        "ocr": {"ok": True, "available": ocr_reader is not None},
+        "email": {"ok": True, "configured": email_configured},
+    }
+    ready = db_ok and search_index_status["ready"]
+    return jsonify({"status": "ready" if ready else "unavailable", "checks": checks}), (200 if ready else 503)
+
+
 @app.route("/api/chat", methods=["POST"])
 def chat_api():
     """AI Chatbot API endpoint."""
@@ -4868,6 +5001,31 @@ def chat_api():
     response = chatbot.get_response(user_message)
     return jsonify({"response": response})
 
+
+@app.route("/api/chat/stream", methods=["POST"])
+def chat_stream_api():
+    """AI Chatbot API endpoint streaming the reply as Server-Sent Events."""
+    data = request.get_json(silent=True) or {}
+    user_message = data.get("message", "")
+
+    if not user_message:
+        return jsonify({"error": "No message provided"}), 400
+
+    def events():
+        try:
+            # Hand the DB connection back before Gemini runs for several seconds
+            for chunk in chatbot.stream_response(user_message, on_prompt_ready=db.session.close):
+                yield f"data: {json.dumps({'delta': chunk})}\n\n"
+        except Exception:
+            app.logger.exception("Chat stream failed")
+            yield f"event: error\ndata: {json.dumps({'error': 'Sorry, something went wrong.'})}\n\n"
+        yield "event: done\ndata: {}\n\n"
+
+    response = Response(stream_with_context(events()), mimetype="text/event-stream")
+    response.headers["Cache-Control"] = "no-cache"
+    response.headers["X-Accel-Buffering"] = "no"  # let proxies pass chunks through unbuffered
+    return response
+
 # ---------------------------------------------------------------------------
 # AI Agent Data Providers
 # ---------------------------------------------------------------------------
@@ -4881,15 +5039,14 @@ def get_rooms_for_chat(query_text):
         base_query = Room.query.filter(Room.verified == True)
         
         # 1. Location Filter
-        # Get all unique locations to check against query
-        # In production, use a proper NER or search engine
-        locations = db.session.query(Room.location).distinct().all()
-        found_location = False
-        for (loc,) in locations:
-            if loc and loc.lower() in query_text:
-                base_query = base_query.filter(Room.location.ilike(f"%{loc}%"))
-                found_location = True
-                break
+        # Known locations found in one pass over the message; the most specific wins
+        locations = vocabulary_cache.find_locations(query_text)
+        if locations:
+            base_query = base_query.filter(Room.location.ilike(f"%{locations[0]}%"))
+        ranked_ids = []
+        if not locations:
+            # No known location: rank rooms by similarity to the message instead
+            ranked_ids = [room_id for _, _, room_id in chat_index.search(query_text, k=20, kind="room", min_score=0.1)]
         
         # 2. Price Filter (Basic regex)
         import re
@@ -4911,6 +5068,11 @@ def get_rooms_for_chat(query_text):
             base_query = base_query.filter(Room.property_type == 'pg')
 
         # Limit results for context window
+        if ranked_ids:
+            rank = {room_id: position for position, room_id in enumerate(ranked_ids)}
+            rooms = sorted(base_query.filter(Room.id.in_(ranked_ids)).all(), key=lambda r: rank[r.id])[:5]
+            if rooms:
+                return [r.to_dict() for r in rooms]
         rooms = base_query.limit(5).all()
         return [r.to_dict() for r in rooms]
     except Exception as e:
@@ -4921,6 +5083,21 @@ def get_rooms_for_chat(query_text):
 chatbot.set_room_provider(get_rooms_for_chat)
 
 
+def load_room_documents():
+    """(id, description) of verified rooms for the chatbot's vector index."""
+    with app.app_context():
+        rows = db.session.query(
+            Room.id, Room.title, Room.location, Room.college_nearby, Room.property_type, Room.amenities
+        ).filter(Room.verified.is_(True)).order_by(Room.id)
+        return [
+            (room_id, " ".join(part for part in (title, location, college, property_type, amenities) if part))
+            for room_id, title, location, college, property_type, amenities in rows
+        ]
+
+
+chat_index.add_source("room", load_room_documents)
+
+
 def get_roommates_for_chat(user_id, preferences):
     """
     Retrieves compatible roommates for the chatbot based on preferences.
@@ -5013,7 +5190,11 @@ def get_news():
     try:
         limit = request.args.get('limit', 5, type=int)
         news = news_service.get_latest_news(limit=limit)
-        return jsonify({"success": True, "news": news})
+        response = jsonify({"success": True, "news": news})
+        if news:
+            # An empty list (feeds down on first load) is not worth caching in the browser
+            response.headers["Cache-Control"] = f"public, max-age={NEWS_BROWSER_CACHE_SECONDS}"
+        return response
     except Exception as e:
         app.logger.error(f"News API error: {e}")
         return jsonify({"success": False, "error": str(e)}), 500
@@ -5090,12 +5271,13 @@ def init_database():
                 ]
                 
                 try:
+                    from utils.bulk_loader import load_records, read_json
+
                     # Load data from JSON file
                     json_path = os.path.join(app.root_path, 'data', 'real_data_dump.json')
-                    with open(json_path, 'r', encoding='utf-8') as f:
-                        colleges_data = json.load(f)
+                    colleges_data = read_json(json_path)
                     
-                    count = 0
+                    records = []
                     for college_entry in colleges_data:
                         college_name = college_entry['college']
                         hostels = college_entry.get('nearby_hostels', [])
@@ -5114,24 +5296,25 @@ def init_database():
                             selected_images = random.sample(room_images, min(3, len(room_images)))
                             image_string = ",".join(selected_images)
                             
-                            room = Room(
-                                title=hostel['name'],
-                                price=price,
-                                location=f"Near {college_name}",
-                                college_nearby=college_name,
-                                amenities="WiFi,AC,Laundry,Security",
-                                property_type="Hostel" if hostel.get('type') == 'hostel' else "PG",
-                                capacity_total=capacity,
-                                capacity_occupied=occupied,
-                                latitude=hostel['lat'],
-                                longitude=hostel['lon'],
-                                owner_id=owner.id,
-                                verified=True,
-                                images=image_string
-                            )
-                            db.session.add(room)
-                            count += 1
+                            records.append({
+                                "title": hostel['name'],
+                                "price": price,
+                                "location": f"Near {college_name}",
+                                "college_nearby": college_name,
+                                "amenities": "WiFi,AC,Laundry,Security",
+                                "property_type": "Hostel" if hostel.get('type') == 'hostel' else "PG",
+                                "capacity_total": capacity,
+                                "capacity_occupied": occupied,
+                                "latitude": hostel['lat'],
+                                "longitude": hostel['lon'],
+                                "owner_id": owner.id,
+                                "verified": True,
+                                "images": image_string,
+                            })
                     
+                    count, _ = load_records(
+                        db.session, Room, records, ("title", "latitude", "longitude")
+                    )
                     db.session.commit()
                     print(f"✅ Added {count} hostels/rooms from {len(colleges_data)} colleges!")
                     
@@ -5313,6 +5496,28 @@ def init_database():
 # Auto-initialize on startup
 init_database()
 
+# First boot: tables (and seed rooms) only exist now, so index them
+if not search_index_status["ready"]:
+    rebuild_search_index()
+
+# Full-text search on PostgreSQL, the Trie elsewhere (SEARCH_BACKEND overrides)
+with app.app_context():
+    search_backend = get_search_backend(db, Room, search_trie, sync_search_index)
+print(f"🔎 Room search backend: {search_backend.name}")
+
+# Search box suggestions served from memory
+suggestion_index.set_loader(load_suggestion_rows)
+try:
+    print(f"✅ Suggestion index built ({suggestion_index.rebuild()} rooms)")
+except Exception as e:
+    print(f"⚠️ Suggestion index unavailable, suggestions will query the database: {e}")
+
+# Chatbot retrieval over FAQs and rooms (memory-mapped, rebuilt when documents change)
+try:
+    chat_index.refresh()
+except Exception as e:
+    print(f"⚠️ Vector index unavailable, chatbot will use keyword matching: {e}")
+
 
 if __name__ == "__main__":
     # Get port from environment variable (Render sets this)
@@ -0,0 +1,155 @@
+"""
+ASGI entry point for Roomies: async serving path for network-bound endpoints.
+
+Under the threaded WSGI worker every request holds a thread for as long as
+it waits on an upstream, so a slow Gemini or RSS feed caps a worker at
+GUNICORN_THREADS concurrent requests. Here the endpoints that spend almost
+all their time waiting are native coroutines on the worker's event loop:
+
+    POST /api/chat   Gemini via generate_content_async (same limiter/breaker)
+    GET  /api/news   served from the background-refreshed news cache
+
+One worker can hold hundreds of those waits at once. Neither handler makes
+an outbound HTTP call on the request path (Gemini has its own async client;
+feeds are fetched by the news service's background refresh on the pooled
+sync client), so there is no shared async HTTP pool. Everything else
+(pages, sessions, login/OAuth callbacks, payments) is passed to the Flask
+app unchanged through asgiref's WSGI adapter, which runs it on a thread
+pool exactly as before.
+
+Run:
+    GUNICORN_WORKER_CLASS=uvicorn.workers.UvicornWorker gunicorn asgi:application -c gunicorn.conf.py
+    uvicorn asgi:application --port 5000          # local development
+"""
+import asyncio
+import json
+import time
+from urllib.parse import parse_qs
+
+from asgiref.wsgi import WsgiToAsgi
+
+from app import NEWS_BROWSER_CACHE_SECONDS, app, chatbot, db, news_service
+from utils.metrics import REQUEST_COUNT, REQUEST_LATENCY, REQUESTS_IN_FLIGHT
+
+wsgi_app = WsgiToAsgi(app)
+
+# Largest request body read by the async handlers
+MAX_BODY_BYTES = 64 * 1024
+
+NEWS_CACHE_HEADERS = [(b"cache-control", f"public, max-age={NEWS_BROWSER_CACHE_SECONDS}".encode())]
+
+
+def run_in_app_context(func, *args):
+    """Run blocking code (DB queries) on a worker thread inside the Flask app context."""
+    def call():
+        with app.app_context():
+            try:
+                return func(*args)
+            finally:
+                db.session.remove()
+
+    return asyncio.to_thread(call)
+
+
+async def read_body(receive):
+    body = b""
+    more = True
+    while more:
+        message = await receive()
+        body += message.get("body", b"")
+        more = message.get("more_body", False)
+        if len(body) > MAX_BODY_BYTES:
+            return None
+    return body
+
+
+async def send_json(send, payload, status=200, headers=()):
+    body = json.dumps(payload).encode("utf-8")
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode()),
+                    *headers],
+    })
+    await send({"type": "http.response.body", "body": body})
+
+
+async def chat_api(scope, receive):
+    """AI Chatbot API endpoint (async twin of app.chat_api)."""
+    body = await read_body(receive)
+    if body is None:
+        return 413, {"error": "Request body too large"}
+    try:
+        data = json.loads(body) if body else {}
+    except ValueError:
+        data = None
+    if not isinstance(data, dict):
+        return 400, {"error": "Invalid JSON body"}
+
+    user_message = data.get("message", "")
+    if not user_message:
+        return 400, {"error": "No message provided"}
+
+    response = await chatbot.get_response_async(user_message, run_sync=run_in_app_context)
+    return 200, {"response": response}
+
+
+async def get_news(scope, receive):
+    """Latest college/education news (async twin of app.get_news)."""
+    query = parse_qs(scope.get("query_string", b"").decode("latin-1"))
+    try:
+        limit = int(query.get("limit", ["5"])[0])
+    except ValueError:
+        limit = 5
+    try:
+        news = await news_service.get_latest_news_async(limit=limit)
+        # An empty list (feeds down on first load) is not worth caching in the browser
+        return 200, {"success": True, "news": news}, NEWS_CACHE_HEADERS if news else []
+    except Exception as e:
+        app.logger.error(f"News API error: {e}")
+        return 500, {"success": False, "error": str(e)}
+
+
+# (method, path) -> (coroutine returning (status, payload[, headers]), endpoint name for /metrics)
+ASYNC_ROUTES = {
+    ("POST", "/api/chat"): (chat_api, "chat_api"),
+    ("GET", "/api/news"): (get_news, "get_news"),
+}
+
+
+async def lifespan(receive, send):
+    while True:
+        message = await receive()
+        if message["type"] == "lifespan.startup":
+            await send({"type": "lifespan.startup.complete"})
+        elif message["type"] == "lifespan.shutdown":
+            await send({"type": "lifespan.shutdown.complete"})
+            return
+
+
+async def application(scope, receive, send):
+    """ASGI app: async handlers for ASYNC_ROUTES, the Flask app for everything else."""
+    if scope["type"] == "lifespan":
+        await lifespan(receive, send)
+        return
+
+    route = ASYNC_ROUTES.get((scope.get("method"), scope.get("path"))) if scope["type"] == "http" else None
+    if route is None:
+        await wsgi_app(scope, receive, send)
+        return
+
+    handler, endpoint = route
+    started = time.perf_counter()
+    REQUESTS_IN_FLIGHT.inc()
+    status = 500
+    try:
+        status, payload, *headers = await handler(scope, receive)
+        await send_json(send, payload, status, *headers)
+    except Exception:
+        app.logger.exception(f"{endpoint} failed")
+        status = 500
+        await send_json(send, {"error": "Internal server error"}, status)
+    finally:
+        REQUESTS_IN_FLIGHT.dec()
+        REQUEST_LATENCY.observe(endpoint, scope["method"], value=time.perf_counter() - started)
+        REQUEST_COUNT.inc(endpoint, scope["method"], str(status))
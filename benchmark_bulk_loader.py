@@ -0,0 +1,115 @@
+"""
+Benchmark the shared bulk loader against the old one-ORM-object-per-row seeding.
+
+Runs against a throwaway SQLite database by default so it never touches real
+data. Pass --database-url to point it at a scratch PostgreSQL database, where
+the COPY FROM STDIN path is measured as well.
+
+Usage:
+    python benchmark_bulk_loader.py
+    python benchmark_bulk_loader.py --rooms 100000 --orm-rooms 5000
+    python benchmark_bulk_loader.py --database-url postgresql://localhost/roomies_bench
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+
+def make_records(count, owner_id, seed=42):
+    """Synthetic rooms with ~5% duplicate natural keys."""
+    rng = random.Random(seed)
+    colleges = [f"College {i}" for i in range(200)]
+    records = []
+    for i in range(count):
+        n = rng.randrange(int(count * 0.95)) if rng.random() < 0.05 else i
+        college = colleges[n % len(colleges)]
+        records.append({
+            "title": f"Bench Hostel {n}",
+            "price": rng.choice([7000, 8000, 9000, 10000, 12000, 15000]),
+            "location": f"Near {college}",
+            "college_nearby": college,
+            "amenities": "WiFi,AC,Laundry,Security",
+            "property_type": rng.choice(["Hostel", "PG"]),
+            "capacity_total": 4,
+            "capacity_occupied": rng.randint(0, 3),
+            "latitude": 19.0 + n * 1e-6,
+            "longitude": 72.8 + n * 1e-6,
+            "owner_id": owner_id,
+            "verified": True,
+            "images": "/static/images/room1.png",
+        })
+    return records
+
+
+def report(label, rows, seconds):
+    rate = rows / seconds if seconds else float("inf")
+    print(f"{label:<28} {rows:>8} rows  {seconds:>8.2f}s  {rate:>10,.0f} rows/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rooms", type=int, default=100_000, help="rows for the bulk paths")
+    parser.add_argument("--orm-rooms", type=int, default=5_000,
+                        help="rows for the legacy per-row ORM path (it is slow)")
+    parser.add_argument("--database-url", default=None)
+    args = parser.parse_args()
+
+    scratch = None
+    if args.database_url:
+        os.environ["DATABASE_URL"] = args.database_url
+    else:
+        scratch = tempfile.NamedTemporaryFile(suffix=".db", delete=False)
+        scratch.close()
+        os.environ["DATABASE_URL"] = f"sqlite:///{scratch.name}"
+
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    from app import app, db, Owner, Room
+    from utils.bulk_loader import load_records
+
+    key = ("title", "latitude", "longitude")
+    try:
+        with app.app_context():
+            owner_id = Owner.query.filter_by(email="system@roomies.in").first().id
+            dialect = db.engine.dialect.name
+            print(f"Backend: {dialect}\n")
+
+            def reset():
+                db.session.query(Room).filter(Room.title.like("Bench Hostel %")).delete(
+                    synchronize_session=False
+                )
+                db.session.commit()
+
+            # Legacy path: duplicate check query + ORM add per row
+            reset()
+            records = make_records(args.orm_rooms, owner_id)
+            start = time.perf_counter()
+            for record in records:
+                if Room.query.filter_by(**{k: record[k] for k in key}).first():
+                    continue
+                db.session.add(Room(**record))
+            db.session.commit()
+            report("orm per-row", args.orm_rooms, time.perf_counter() - start)
+
+            modes = [("bulk insert", False)]
+            if dialect == "postgresql":
+                modes.append(("copy from stdin", True))
+            for label, use_copy in modes:
+                reset()
+                records = make_records(args.rooms, owner_id)
+                start = time.perf_counter()
+                inserted, skipped = load_records(db.session, Room, records, key, use_copy=use_copy)
+                db.session.commit()
+                report(label, args.rooms, time.perf_counter() - start)
+                print(f"{'':<28} inserted {inserted}, skipped {skipped} duplicates")
+
+            reset()
+    finally:
+        if scratch:
+            os.remove(scratch.name)
+
+
+if __name__ == "__main__":
+    main()
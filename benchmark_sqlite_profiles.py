@@ -0,0 +1,143 @@
+"""
+Benchmark SQLite tuning profiles under concurrent readers and writers.
+
+Each run starts separate reader and writer processes (like gunicorn
+workers) against a scratch database for a fixed time. Writers run a
+booking-style transaction: check a room's free slots, insert a booking,
+update the room. Reported per combination of pragma profile ("safe" =
+the old foreign-keys-only setup, "performance" = WAL etc.) and write mode
+("deferred" = plain BEGIN, "immediate" = BEGIN IMMEDIATE as done by
+utils.sqlite_tuning.serialized_write):
+
+- reads/s and writes/s completed
+- "database is locked" errors
+
+Usage:
+    python benchmark_sqlite_profiles.py
+    python benchmark_sqlite_profiles.py --readers 8 --writers 4 --duration 10
+"""
+import argparse
+import multiprocessing
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from utils.sqlite_tuning import apply_pragmas
+
+ROOMS = 500
+
+
+def setup(path, profile):
+    conn = sqlite3.connect(path, isolation_level=None)
+    apply_pragmas(conn, profile)
+    if profile == "safe":
+        conn.execute("PRAGMA journal_mode=DELETE")
+    conn.executescript("""
+        CREATE TABLE rooms (id INTEGER PRIMARY KEY, title TEXT, capacity_total INTEGER,
+                            capacity_occupied INTEGER);
+        CREATE TABLE bookings (id INTEGER PRIMARY KEY, room_id INTEGER REFERENCES rooms(id),
+                               student_id INTEGER, status TEXT, created_at REAL);
+        CREATE INDEX ix_bookings_room ON bookings (room_id);
+    """)
+    conn.execute("BEGIN")
+    conn.executemany(
+        "INSERT INTO rooms (id, title, capacity_total, capacity_occupied) VALUES (?, ?, ?, 0)",
+        [(i, f"Room {i}", 1_000_000) for i in range(1, ROOMS + 1)],
+    )
+    conn.execute("COMMIT")
+    conn.close()
+
+
+def worker(path, profile, role, write_mode, duration, results):
+    rng = random.Random(os.getpid())
+    conn = sqlite3.connect(path, isolation_level=None, timeout=5.0)
+    apply_pragmas(conn, profile)
+    done = errors = 0
+    deadline = time.monotonic() + duration
+
+    while time.monotonic() < deadline:
+        room_id = rng.randint(1, ROOMS)
+        try:
+            if role == "reader":
+                conn.execute(
+                    "SELECT r.id, r.title, COUNT(b.id) FROM rooms r "
+                    "LEFT JOIN bookings b ON b.room_id = r.id "
+                    "WHERE r.id BETWEEN ? AND ? GROUP BY r.id",
+                    (room_id, room_id + 20),
+                ).fetchall()
+            else:
+                conn.execute("BEGIN IMMEDIATE" if write_mode == "immediate" else "BEGIN")
+                total, occupied = conn.execute(
+                    "SELECT capacity_total, capacity_occupied FROM rooms WHERE id = ?", (room_id,)
+                ).fetchone()
+                if occupied < total:
+                    conn.execute(
+                        "INSERT INTO bookings (room_id, student_id, status, created_at) VALUES (?, ?, 'pending', ?)",
+                        (room_id, rng.randint(1, 10_000), time.time()),
+                    )
+                    conn.execute(
+                        "UPDATE rooms SET capacity_occupied = capacity_occupied + 1 WHERE id = ?", (room_id,)
+                    )
+                conn.execute("COMMIT")
+            done += 1
+        except sqlite3.OperationalError as e:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            if "locked" not in str(e) and "busy" not in str(e):
+                raise
+            errors += 1
+
+    conn.close()
+    results.put((role, done, errors))
+
+
+def run(profile, write_mode, readers, writers, duration):
+    directory = tempfile.mkdtemp()
+    path = os.path.join(directory, "bench.db")
+    setup(path, profile)
+
+    results = multiprocessing.Queue()
+    processes = [
+        multiprocessing.Process(target=worker, args=(path, profile, role, write_mode, duration, results))
+        for role in ["reader"] * readers + ["writer"] * writers
+    ]
+    for process in processes:
+        process.start()
+    totals = {"reader": [0, 0], "writer": [0, 0]}
+    for _ in processes:
+        role, done, errors = results.get()
+        totals[role][0] += done
+        totals[role][1] += errors
+    for process in processes:
+        process.join()
+
+    for name in os.listdir(directory):
+        os.remove(os.path.join(directory, name))
+    os.rmdir(directory)
+    return totals
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--writers", type=int, default=4)
+    parser.add_argument("--duration", type=float, default=5.0, help="seconds per run")
+    args = parser.parse_args()
+
+    print(f"{args.readers} reader and {args.writers} writer processes, {args.duration:.0f}s per run\n")
+    print(f"{'profile':<12} {'writes':<10} {'reads/s':>10} {'writes/s':>10} {'locked errors':>14}")
+    for profile in ("safe", "performance"):
+        for write_mode in ("deferred", "immediate"):
+            totals = run(profile, write_mode, args.readers, args.writers, args.duration)
+            reads, read_errors = totals["reader"]
+            writes, write_errors = totals["writer"]
+            print(f"{profile:<12} {write_mode:<10} {reads / args.duration:>10,.0f} "
+                  f"{writes / args.duration:>10,.0f} {read_errors + write_errors:>14}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,27 @@
+"""
+Gunicorn settings for Roomies (used by the Procfile).
+
+Threaded workers (gthread): a streaming /api/chat/stream reply holds one
+thread for as long as Gemini generates, not a whole worker process, so
+slow LLM calls do not queue booking and search requests behind them.
+Keep DB_POOL_SIZE + DB_MAX_OVERFLOW at or above GUNICORN_THREADS.
+
+For the async path (asgi.py), serve `asgi:application` with
+GUNICORN_WORKER_CLASS=uvicorn.workers.UvicornWorker: chat and news then
+wait on the event loop instead of holding a thread each.
+
+Environment:
+    PORT                   Port to bind (default 5000)
+    WEB_CONCURRENCY        Worker processes (default 2)
+    GUNICORN_THREADS       Threads per worker (default 8)
+    GUNICORN_WORKER_CLASS  Worker class (default gthread)
+    GUNICORN_TIMEOUT       Seconds a worker may go silent before restart (default 120)
+"""
+import os
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '5000')}"
+workers = int(os.environ.get("WEB_CONCURRENCY", "2"))
+worker_class = os.environ.get("GUNICORN_WORKER_CLASS", "gthread")
+threads = int(os.environ.get("GUNICORN_THREADS", "8"))
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", "120"))
+keepalive = 5
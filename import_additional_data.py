@@ -1,6 +1,7 @@
 import random
 import re
 from app import app, db, Room, Owner, rebuild_search_index
+from utils.bulk_loader import load_records
 
 raw_data = """Indian Institute of Technology Bombay (IIT Bombay)	Powai	Premium Co-living PG	Stanza Living, Housr (Powai)	₹18,000 - ₹30,000	All meals, Wi-Fi, Gym, Laundry, Housekeeping	Hassle-free, premium living
 Veermata Jijabai Technological Institute (VJTI)	Matunga	College Hostel	VJTI Hostel	₹5,000 - ₹9,000	Basic lodging, Mess Food	Extreme budget focus
@@ -69,7 +70,7 @@ def import_data():
         ]
 
         lines = raw_data.strip().split('\n')
-        count = 0
+        records = []
         for line in lines:
             parts = line.split('\t')
             if len(parts) < 6:
@@ -94,27 +95,22 @@ def import_data():
             selected_images = random.sample(room_images, 3)
             image_string = ",".join(selected_images)
             
-            # Check if exists
-            existing = Room.query.filter_by(title=f"{acc_type} at {provider}", college_nearby=college).first()
-            if existing:
-                continue
-
-            room = Room(
-                title=f"{acc_type} at {provider}",
-                price=price,
-                location=location,
-                college_nearby=college,
-                amenities=amenities,
-                property_type=prop_type,
-                capacity_total=random.choice([1, 2, 3, 4]),
-                capacity_occupied=0,
-                owner_id=owner.id,
-                verified=True,
-                images=image_string
-            )
-            db.session.add(room)
-            count += 1
+            records.append({
+                "title": f"{acc_type} at {provider}",
+                "price": price,
+                "location": location,
+                "college_nearby": college,
+                "amenities": amenities,
+                "property_type": prop_type,
+                "capacity_total": random.choice([1, 2, 3, 4]),
+                "capacity_occupied": 0,
+                "owner_id": owner.id,
+                "verified": True,
+                "images": image_string,
+            })
         
+        # Skip listings that already exist (same title near the same college)
+        count, _ = load_records(db.session, Room, records, ("title", "college_nearby"))
         db.session.commit()
         print(f"Imported {count} new listings.")
         
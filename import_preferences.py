@@ -2,7 +2,6 @@
 Script to import student roommate preferences from CSV file.
 Run this script to populate the database with sample student data for AI matching.
 """
-import csv
 import os
 import sys
 import random
@@ -15,7 +14,8 @@ if sys.platform == 'win32':
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from app import app, db, Student, ProfileTag
+from app import app, bcrypt, db, Student, ProfileTag
+from utils.bulk_loader import bulk_insert, dedupe, fetch_existing_keys, read_csv
 
 
 def generate_email(name):
@@ -71,54 +71,56 @@ def import_preferences(csv_path, college="DJ Sanghvi College of Engineering"):
     """Import student preferences from CSV file."""
     
     with app.app_context():
-        imported = 0
-        skipped = 0
+        # Demo accounts share one password, so hash it once
+        password_hash = bcrypt.generate_password_hash("demo123").decode("utf-8")
         
-        with open(csv_path, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
+        records = []
+        tags_by_email = {}
+        for row in read_csv(csv_path):
+            name = (row.get('Name') or '').strip()
+            if not name:
+                continue
             
-            for row in reader:
-                name = row.get('Name', '').strip()
-                if not name:
-                    continue
-                
-                # Generate unique email
-                email = generate_email(name)
-                
-                # Check if student with this email exists
-                existing = Student.query.filter_by(email=email).first()
-                if existing:
-                    skipped += 1
-                    continue
-                
-                # Map values
-                sleep = map_sleep_schedule(row.get("What's your sleep schedule?", ""))
-                social = map_social_level(row.get("How social are you?", ""))
-                cleanliness = map_cleanliness(row.get("Cleanliness preference?", ""))
-                budget = map_budget_range(row.get("Budget range (monthly)", ""))
-                
-                # Create student
-                student = Student(
-                    email=email,
-                    name=name,
-                    college=college,
-                    verified=True,  # Auto-verify for demo data
-                    sleep_schedule=sleep,
-                    social_level=social,
-                    cleanliness_pref=cleanliness,
-                    budget_range=budget
-                )
-                student.set_password("demo123")  # Default password
-                db.session.add(student)
-                db.session.flush()  # Get the ID
-                
-                # Also create ProfileTags for backward compatibility
-                tags = [sleep, social, cleanliness]
-                for tag in tags:
-                    profile_tag = ProfileTag(student_id=student.id, tag=tag)
-                    db.session.add(profile_tag)
-                
-                imported += 1
+            # Generate unique email
+            email = generate_email(name)
+            
+            # Map values
+            sleep = map_sleep_schedule(row.get("What's your sleep schedule?") or "")
+            social = map_social_level(row.get("How social are you?") or "")
+            cleanliness = map_cleanliness(row.get("Cleanliness preference?") or "")
+            budget = map_budget_range(row.get("Budget range (monthly)") or "")
+            
+            records.append({
+                "email": email,
+                "name": name,
+                "college": college,
+                "verified": True,  # Auto-verify for demo data
+                "sleep_schedule": sleep,
+                "social_level": social,
+                "cleanliness_pref": cleanliness,
+                "budget_range": budget,
+                "password": password_hash,
+            })
+            tags_by_email.setdefault(email, [sleep, social, cleanliness])
+        
+        # Skip students whose email already exists
+        existing = fetch_existing_keys(db.session, Student, ("email",))
+        records, skipped = dedupe(records, ("email",), existing)
+        imported = bulk_insert(db.session, Student, records)
+        
+        # Also create ProfileTags for backward compatibility
+        new_emails = [record["email"] for record in records]
+        ids_by_email = dict(
+            db.session.query(Student.email, Student.id)
+            .filter(Student.email.in_(new_emails))
+            .all()
+        ) if new_emails else {}
+        tag_records = [
+            {"student_id": ids_by_email[email], "tag": tag}
+            for email in new_emails
+            for tag in tags_by_email[email]
+        ]
+        bulk_insert(db.session, ProfileTag, tag_records)
         
         db.session.commit()
         print(f"Imported {imported} students, skipped {skipped} duplicates")
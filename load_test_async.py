@@ -0,0 +1,208 @@
+"""
+Compare the sync gunicorn worker with the async (ASGI) path under slow upstreams.
+
+Starts a local stub RSS server that answers after --latency seconds and runs
+the chatbot against the fake Gemini model with the same latency
+(CHATBOT_FAKE_MODEL, CHATBOT_FAKE_LATENCY). Then boots the app twice on a
+scratch copy of the SQLite database, each time with a single worker
+process:
+
+    sync   gunicorn app:app, gthread worker, GUNICORN_THREADS threads
+    async  gunicorn asgi:application, uvicorn worker
+
+and drives both with the same closed-loop load (--clients concurrent
+clients alternating POST /api/chat and GET /api/news), printing
+throughput and latency percentiles side by side.
+
+Needs the dev requirements (httpx drives the load): pip install -r requirements-dev.txt
+
+Usage:
+    python load_test_async.py
+    python load_test_async.py --clients 100 --duration 15 --latency 1.0 --threads 8
+"""
+import argparse
+import asyncio
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+
+from load_test_pool import percentile
+
+RSS_BODY = b"""<?xml version="1.0"?><rss version="2.0"><channel><title>Stub</title>""" + b"".join(
+    b"<item><title>Headline %d</title><link>http://example.com/%d</link>"
+    b"<pubDate>Mon, 19 Oct 2026 10:00:00 GMT</pubDate><description>Summary %d</description></item>" % (i, i, i)
+    for i in range(10)
+) + b"</channel></rss>"
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_rss_stub(latency, etag=None):
+    """
+    Threaded HTTP server returning a small RSS feed after `latency` seconds.
+
+    With `etag`, the feed carries that ETag and a matching If-None-Match
+    gets a 304. Set `server.status` to another code (e.g. 500) to make the
+    feed fail; `server.statuses` records every status sent.
+    """
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            time.sleep(latency)
+            if server.status != 200:
+                self._reply(server.status, b"upstream error")
+            elif etag and self.headers.get("If-None-Match") == etag:
+                self._reply(304, b"")
+            else:
+                self._reply(200, RSS_BODY)
+
+        def _reply(self, status, body):
+            server.statuses.append(status)
+            self.send_response(status)
+            if status == 200:
+                self.send_header("Content-Type", "application/rss+xml")
+                if etag:
+                    self.send_header("ETag", etag)
+            if status != 304:
+                self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", free_port()), Handler)
+    server.daemon_threads = True
+    server.status = 200
+    server.statuses = []
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def start_server(mode, port, env):
+    target = "app:app" if mode == "sync" else "asgi:application"
+    env = dict(env, PORT=str(port), WEB_CONCURRENCY="1")
+    if mode == "async":
+        env["GUNICORN_WORKER_CLASS"] = "uvicorn.workers.UvicornWorker"
+    process = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", target, "-c", "gunicorn.conf.py"],
+        cwd=os.path.dirname(os.path.abspath(__file__)), env=env,
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + 120
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(f"http://127.0.0.1:{port}/livez", timeout=1).status_code == 200:
+                return process
+        except httpx.HTTPError:
+            pass
+        if process.poll() is not None:
+            raise RuntimeError(f"{mode} server exited with code {process.returncode}")
+        time.sleep(0.5)
+    process.kill()
+    raise RuntimeError(f"{mode} server did not start")
+
+
+async def drive(url, clients, duration):
+    """Closed loop: each client sends its next request when the last one returns."""
+    latencies = {"/api/chat": [], "/api/news": []}
+    errors = 0
+    stop_at = time.perf_counter() + duration
+    limits = httpx.Limits(max_connections=clients, max_keepalive_connections=clients)
+
+    async with httpx.AsyncClient(base_url=url, timeout=120, limits=limits) as client:
+        async def run(index):
+            nonlocal errors
+            i = index
+            while time.perf_counter() < stop_at:
+                path = "/api/chat" if i % 2 else "/api/news"
+                i += 1
+                started = time.perf_counter()
+                try:
+                    if path == "/api/chat":
+                        response = await client.post(path, json={"message": f"is the deposit refundable {i}"})
+                    else:
+                        response = await client.get(path)
+                    ok = response.status_code < 500
+                except httpx.HTTPError:
+                    ok = False
+                latencies[path].append(time.perf_counter() - started)
+                if not ok:
+                    errors += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(run(index) for index in range(clients)))
+        elapsed = time.perf_counter() - started
+    return latencies, errors, elapsed
+
+
+def report(mode, latencies, errors, elapsed):
+    total = sum(len(values) for values in latencies.values())
+    print(f"{mode:<6} {total / elapsed:8.1f} req/s  {errors:4d} errors", end="")
+    for path, values in latencies.items():
+        print(f"   {path} p50 {percentile(values, 50) * 1000:6.0f}ms p95 {percentile(values, 95) * 1000:6.0f}ms", end="")
+    print()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--clients", type=int, default=64, help="concurrent clients")
+    parser.add_argument("--duration", type=float, default=10, help="seconds per mode")
+    parser.add_argument("--latency", type=float, default=0.5, help="upstream (RSS, Gemini) latency in seconds")
+    parser.add_argument("--threads", type=int, default=8, help="GUNICORN_THREADS for the sync worker")
+    parser.add_argument("--mode", action="append", choices=("sync", "async"), help="modes to run (default both)")
+    args = parser.parse_args()
+
+    rss = start_rss_stub(args.latency)
+    base = os.path.dirname(os.path.abspath(__file__))
+    source = os.path.join(base, "instance", "roomies.db")
+    scratch = tempfile.NamedTemporaryFile(suffix=".db", delete=False)
+    scratch.close()
+    if os.path.exists(source):
+        shutil.copyfile(source, scratch.name)
+
+    env = dict(
+        os.environ,
+        DATABASE_URL=f"sqlite:///{scratch.name}",
+        NEWS_RSS_URL=f"http://127.0.0.1:{rss.server_address[1]}/feed.xml",
+        CHATBOT_FAKE_MODEL="1",
+        CHATBOT_FAKE_LATENCY=str(args.latency),
+        CHATBOT_FAKE_TOKEN_DELAY="0",
+        CHAT_CACHE_TTL="0",  # every chat request reaches the (fake) model
+        GEMINI_MAX_CONCURRENCY=str(args.clients),  # measure the serving path, not the limiter
+        GUNICORN_THREADS=str(args.threads),
+    )
+    print(f"{args.clients} clients, {args.duration:.0f}s per mode, upstream latency {args.latency * 1000:.0f}ms, "
+          f"sync worker with {args.threads} threads\n")
+
+    try:
+        for mode in args.mode or ["sync", "async"]:
+            port = free_port()
+            process = start_server(mode, port, env)
+            try:
+                latencies, errors, elapsed = asyncio.run(drive(f"http://127.0.0.1:{port}", args.clients, args.duration))
+            finally:
+                process.terminate()
+                process.wait(timeout=30)
+            report(mode, latencies, errors, elapsed)
+    finally:
+        rss.shutdown()
+        os.remove(scratch.name)
+
+
+if __name__ == "__main__":
+    main()
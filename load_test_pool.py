@@ -0,0 +1,146 @@
+"""
+Load-test the request path and report whether the DB pool is the bottleneck.
+
+Drives GET requests at a fixed target rate from a thread pool and prints
+latency percentiles next to connection pool checkout waits. If checkout
+waits stay near zero while latency grows, the pool is not what limits
+throughput; slow checkouts mean DB_POOL_SIZE / DB_MAX_OVERFLOW are too low
+for the concurrency.
+
+By default the app runs in-process against a scratch copy of the SQLite
+database. With --url it drives a running server and reads pool waits from
+its /metrics endpoint instead.
+
+Usage:
+    python load_test_pool.py
+    python load_test_pool.py --rps 200 --duration 20 --concurrency 32
+    python load_test_pool.py --url http://localhost:5000 --path /api/rooms --path /readyz
+"""
+import argparse
+import os
+import re
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def scrape_pool_wait(url):
+    """(count, sum) of roomies_db_pool_checkout_wait_seconds from /metrics."""
+    import requests
+
+    text = requests.get(f"{url}/metrics", timeout=10).text
+    count = re.search(r"^roomies_db_pool_checkout_wait_seconds_count (\S+)$", text, re.M)
+    total = re.search(r"^roomies_db_pool_checkout_wait_seconds_sum (\S+)$", text, re.M)
+    return (float(count.group(1)) if count else 0.0, float(total.group(1)) if total else 0.0)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rps", type=float, default=100, help="target requests per second")
+    parser.add_argument("--duration", type=float, default=10, help="seconds to run")
+    parser.add_argument("--concurrency", type=int, default=16, help="client threads")
+    parser.add_argument("--path", action="append", help="path(s) to request (default: /api/rooms, /readyz)")
+    parser.add_argument("--url", default=None, help="drive a running server instead of the in-process app")
+    args = parser.parse_args()
+    paths = args.path or ["/api/rooms", "/readyz"]
+
+    scratch = None
+    if args.url:
+        import requests
+
+        session = requests.Session()
+
+        def get(path):
+            return session.get(f"{args.url}{path}", timeout=30).status_code
+
+        before = scrape_pool_wait(args.url)
+    else:
+        base = os.path.dirname(os.path.abspath(__file__))
+        source = os.path.join(base, "instance", "roomies.db")
+        scratch = tempfile.NamedTemporaryFile(suffix=".db", delete=False)
+        scratch.close()
+        if os.path.exists(source):
+            shutil.copyfile(source, scratch.name)
+        os.environ["DATABASE_URL"] = f"sqlite:///{scratch.name}"
+
+        sys.path.insert(0, base)
+        from app import app, db
+
+        local = threading.local()
+
+        def get(path):
+            client = getattr(local, "client", None)
+            if client is None:
+                client = local.client = app.test_client()
+            return client.get(path).status_code
+
+        with app.app_context():
+            pool = db.engine.pool
+
+    latencies, errors = [], 0
+    lock = threading.Lock()
+
+    def fire(path):
+        nonlocal errors
+        start = time.perf_counter()
+        try:
+            status = get(path)
+        except Exception:
+            status = 599
+        elapsed = time.perf_counter() - start
+        with lock:
+            latencies.append(elapsed)
+            if status >= 500:
+                errors += 1
+
+    total = int(args.rps * args.duration)
+    interval = 1.0 / args.rps
+    print(f"Target: {args.rps:.0f} req/s for {args.duration:.0f}s ({total} requests), "
+          f"{args.concurrency} threads, paths {paths}\n")
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+        for i in range(total):
+            # Open-loop schedule: fire on time regardless of response latency
+            delay = started + i * interval - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            executor.submit(fire, paths[i % len(paths)])
+    elapsed = time.perf_counter() - started
+
+    print(f"Achieved:    {len(latencies) / elapsed:,.1f} req/s, {errors} errors (5xx)")
+    print(f"Latency:     p50 {percentile(latencies, 50) * 1000:.1f}ms  "
+          f"p95 {percentile(latencies, 95) * 1000:.1f}ms  p99 {percentile(latencies, 99) * 1000:.1f}ms")
+
+    if args.url:
+        after = scrape_pool_wait(args.url)
+        checkouts, waited = after[0] - before[0], after[1] - before[1]
+        if checkouts:
+            print(f"Pool wait:   {checkouts:.0f} checkouts, avg {waited / checkouts * 1000:.2f}ms")
+        else:
+            print("Pool wait:   no pool metrics reported by the server")
+    else:
+        stats = getattr(pool, "wait_stats", None)
+        if stats and stats["checkouts"]:
+            print(f"Pool wait:   {stats['checkouts']} checkouts, "
+                  f"avg {stats['total_seconds'] / stats['checkouts'] * 1000:.2f}ms, "
+                  f"max {stats['max_seconds'] * 1000:.1f}ms, {stats['slow']} slow")
+            print(f"Pool:        size {pool.size()}, overflow used {max(pool.overflow(), 0)}")
+        else:
+            print("Pool wait:   pool telemetry not enabled for this database")
+        os.remove(scratch.name)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+"""
+Migration: Add indexes for hot filter, sort and join columns.
+
+Creates the indexes declared in the models' __table_args__ (Room,
+Booking, WalletTransaction, FlashDeal) on databases created before they
+existed. On PostgreSQL it also enables pg_trgm and adds trigram GIN
+indexes so the `ILIKE '%term%'` searches in /api/rooms, /api/colleges and
+/api/suggestions can use an index instead of scanning every room.
+
+Safe to run repeatedly. Run with --explain to print the query plans of
+the hot queries and fail if any of them cannot use an index.
+
+Usage:
+    python migrations/add_performance_indexes.py
+    python migrations/add_performance_indexes.py --explain
+"""
+
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import app, db, Booking, FlashDeal, Room, WalletTransaction
+from sqlalchemy import text
+
+MODELS = (Room, Booking, WalletTransaction, FlashDeal)
+
+# PostgreSQL trigram indexes for substring (ILIKE) search
+TRIGRAM_INDEXES = {
+    "ix_rooms_title_trgm": ("rooms", "title"),
+    "ix_rooms_location_trgm": ("rooms", "location"),
+    "ix_rooms_college_nearby_trgm": ("rooms", "college_nearby"),
+}
+
+# (description, SQL, index expected in the plan); parameters are bound below
+EXPLAIN_QUERIES = [
+    ("verified rooms by price",
+     "SELECT id FROM rooms WHERE verified = :true ORDER BY price, id LIMIT 50",
+     "ix_rooms_verified_price"),
+    ("newest verified rooms",
+     "SELECT id FROM rooms WHERE verified = :true ORDER BY created_at DESC LIMIT 50",
+     "ix_rooms_verified_created_at"),
+    ("rooms by property type under max rent",
+     "SELECT id FROM rooms WHERE lower(property_type) = 'pg' AND price <= 10000",
+     "ix_rooms_property_type_lower_price"),
+    ("student's bookings",
+     "SELECT id FROM bookings WHERE student_id = 1 ORDER BY created_at DESC",
+     "ix_bookings_student_id_created_at"),
+    ("bookings for a room",
+     "SELECT id FROM bookings WHERE room_id = 1 ORDER BY created_at DESC",
+     "ix_bookings_room_id_created_at"),
+    ("bookings by status",
+     "SELECT id FROM bookings WHERE booking_status = 'pending'",
+     "ix_bookings_booking_status"),
+    ("wallet transactions",
+     "SELECT id FROM wallet_transactions WHERE wallet_id = 1 ORDER BY created_at DESC",
+     "ix_wallet_transactions_wallet_id_created_at"),
+    ("live flash deals",
+     "SELECT id FROM flash_deals WHERE expires_at > CURRENT_TIMESTAMP",
+     "ix_flash_deals_expires_at"),
+]
+
+POSTGRES_EXPLAIN_QUERIES = [
+    ("college substring search",
+     "SELECT id FROM rooms WHERE college_nearby ILIKE '%engineering%'",
+     "ix_rooms_college_nearby_trgm"),
+    ("location substring search",
+     "SELECT id FROM rooms WHERE location ILIKE '%andheri%'",
+     "ix_rooms_location_trgm"),
+    ("title substring search",
+     "SELECT id FROM rooms WHERE title ILIKE '%hostel%'",
+     "ix_rooms_title_trgm"),
+]
+
+
+def existing_index_names(connection, table_name):
+    """Index names on a table, including expression indexes reflection skips."""
+    dialect = connection.dialect.name
+    if dialect == "sqlite":
+        sql = "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = :table"
+    elif dialect == "postgresql":
+        sql = "SELECT indexname FROM pg_indexes WHERE tablename = :table"
+    else:
+        return {index["name"] for index in db.inspect(connection).get_indexes(table_name)}
+    return {row[0] for row in connection.execute(text(sql), {"table": table_name})}
+
+
+def create_model_indexes():
+    """Create any model-declared index that is missing."""
+    created = 0
+    for model in MODELS:
+        table = model.__table__
+        with db.engine.connect() as connection:
+            existing = existing_index_names(connection, table.name)
+        for index in sorted(table.indexes, key=lambda index: index.name):
+            if index.name in existing:
+                print(f"⏭️  {index.name} already exists")
+                continue
+            index.create(db.engine)
+            print(f"✅ Created {index.name}")
+            created += 1
+    return created
+
+
+def create_trigram_indexes():
+    """Enable pg_trgm and add GIN trigram indexes (PostgreSQL only)."""
+    created = 0
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+    with db.engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+        connection.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+        existing = existing_index_names(connection, "rooms")
+        for name, (table, column) in TRIGRAM_INDEXES.items():
+            if name in existing:
+                print(f"⏭️  {name} already exists")
+                continue
+            connection.execute(text(
+                f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} "
+                f"ON {table} USING gin ({column} gin_trgm_ops)"
+            ))
+            print(f"✅ Created {name}")
+            created += 1
+    return created
+
+
+def explain(connection, dialect, sql):
+    """Return the query plan as one string."""
+    params = {"true": True} if ":true" in sql else {}
+    if dialect == "postgresql":
+        rows = connection.execute(text(f"EXPLAIN {sql}"), params)
+        return "\n".join(row[0] for row in rows)
+    rows = connection.execute(text(f"EXPLAIN QUERY PLAN {sql}"), params)
+    return "\n".join(row[-1] for row in rows)
+
+
+def check_plans():
+    """Print plans for the hot queries; return the ones not using their index."""
+    dialect = db.engine.dialect.name
+    queries = list(EXPLAIN_QUERIES)
+    if dialect == "postgresql":
+        queries += POSTGRES_EXPLAIN_QUERIES
+
+    missing = []
+    with db.engine.connect() as connection:
+        if dialect == "postgresql":
+            # Small tables make the planner prefer seq scans; ask whether the index is usable
+            connection.execute(text("SET enable_seqscan = off"))
+        elif dialect == "sqlite":
+            connection.execute(text("ANALYZE"))
+
+        for description, sql, index_name in queries:
+            plan = explain(connection, dialect, sql)
+            ok = index_name in plan
+            print(f"{'✅' if ok else '❌'} {description}: expects {index_name}")
+            print("   " + plan.replace("\n", "\n   "))
+            if not ok:
+                missing.append(description)
+        connection.rollback()
+    return missing
+
+
+def migrate(run_explain=False):
+    with app.app_context():
+        print("Adding performance indexes...\n")
+        created = create_model_indexes()
+        if db.engine.dialect.name == "postgresql":
+            created += create_trigram_indexes()
+        print(f"\n✅ Migration completed! Created {created} indexes.")
+
+        if run_explain:
+            print("\n📋 Query plans:\n")
+            missing = check_plans()
+            if missing:
+                print(f"\n❌ {len(missing)} queries cannot use their index: {', '.join(missing)}")
+                sys.exit(1)
+            print("\n✅ All hot queries use an index.")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Add indexes for hot filter, sort and join columns.")
+    parser.add_argument("--explain", action="store_true", help="verify query plans use the indexes")
+    args = parser.parse_args()
+    migrate(run_explain=args.explain)
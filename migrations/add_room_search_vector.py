@@ -0,0 +1,66 @@
+"""
+Migration: Add the full-text search column and GIN index to rooms.
+
+PostgreSQL only. Adds `rooms.search_vector`, a generated tsvector over
+title, location and college, and a GIN index on it, used by
+utils.search_backend.PostgresSearchBackend for /api/rooms?q= and
+/api/suggestions. The index is built CONCURRENTLY so listings stay
+writable; adding the generated column rewrites the table once.
+
+Safe to run repeatedly. Run with --explain to check a prefix search uses
+the index. On SQLite there is nothing to do: search uses the in-memory
+Trie.
+
+Usage:
+    python migrations/add_room_search_vector.py
+    python migrations/add_room_search_vector.py --explain
+"""
+
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import app, db
+from sqlalchemy import text
+from utils.search_backend import SEARCH_INDEX_DDL, SEARCH_VECTOR_DDL
+
+INDEX_NAME = "ix_rooms_search_vector"
+
+
+def migrate(run_explain=False):
+    with app.app_context():
+        if db.engine.dialect.name != "postgresql":
+            print("⏭️  Not PostgreSQL: room search uses the in-memory index, nothing to migrate.")
+            return
+
+        print("Adding room full-text search column...\n")
+        # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+        with db.engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+            connection.execute(text(SEARCH_VECTOR_DDL))
+            print("✅ rooms.search_vector present")
+            connection.execute(text(SEARCH_INDEX_DDL.replace("CREATE INDEX", "CREATE INDEX CONCURRENTLY", 1)))
+            print(f"✅ {INDEX_NAME} present")
+        print("\n✅ Migration completed! Restart the app to switch to full-text search.")
+
+        if run_explain:
+            with db.engine.connect() as connection:
+                connection.execute(text("SET enable_seqscan = off"))
+                plan = "\n".join(row[0] for row in connection.execute(text(
+                    "EXPLAIN SELECT id FROM rooms "
+                    "WHERE search_vector @@ to_tsquery('simple', 'andheri:*')"
+                )))
+                connection.rollback()
+            ok = INDEX_NAME in plan
+            print(f"\n{'✅' if ok else '❌'} prefix search: expects {INDEX_NAME}")
+            print("   " + plan.replace("\n", "\n   "))
+            if not ok:
+                sys.exit(1)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Add the full-text search column and GIN index to rooms.")
+    parser.add_argument("--explain", action="store_true", help="verify prefix search uses the GIN index")
+    args = parser.parse_args()
+    migrate(run_explain=args.explain)
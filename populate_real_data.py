@@ -1,6 +1,10 @@
-import json
 import random
+from sqlalchemy import update
 from app import app, db, Room, Owner, Admin
+from utils.bulk_loader import bulk_insert, dedupe, fetch_existing_keys, read_json
+
+# Natural key used to recognise a hostel that is already in the database
+ROOM_KEY = ("title", "latitude", "longitude")
 
 def populate_db():
     with app.app_context():
@@ -36,8 +40,7 @@ def populate_db():
 
         # 2. Load Real Data
         try:
-            with open('data/real_data_dump.json', 'r', encoding='utf-8') as f:
-                colleges_data = json.load(f)
+            colleges_data = read_json('data/real_data_dump.json')
         except FileNotFoundError:
             print("Error: data/real_data_dump.json not found. Run fetch_real_data.py first.")
             return
@@ -68,8 +71,10 @@ def populate_db():
             "https://images.unsplash.com/photo-1512918760532-3c50f8f2c5d7?w=600&q=80", # Small apartment
         ]
 
-        count = 0
-        updated_count = 0
+        # One query for every existing key instead of one lookup per hostel
+        existing = fetch_existing_keys(db.session, Room, ROOM_KEY)
+        records = []
+        image_updates = []
         
         for college_entry in colleges_data:
             college_name = college_entry['college']
@@ -80,17 +85,10 @@ def populate_db():
                 selected_images = random.sample(room_images, 3)
                 image_string = ",".join(selected_images)
 
-                # Check if room already exists
-                existing = Room.query.filter_by(
-                    title=hostel['name'], 
-                    latitude=hostel['lat'], 
-                    longitude=hostel['lon']
-                ).first()
-                
-                if existing:
-                    # Update images for existing rooms
-                    existing.images = image_string
-                    updated_count += 1
+                # Update images for rooms that already exist
+                existing_id = existing.get((hostel['name'], hostel['lat'], hostel['lon']))
+                if existing_id is not None:
+                    image_updates.append({"id": existing_id, "images": image_string})
                     continue
 
                 # Generate random attributes
@@ -98,26 +96,28 @@ def populate_db():
                 capacity = random.choice([1, 2, 3, 4])
                 occupied = random.randint(0, capacity)
                 
-                room = Room(
-                    title=hostel['name'],
-                    price=price,
-                    location=f"Near {college_name}",
-                    college_nearby=college_name,
-                    amenities="WiFi,AC,Laundry,Security",
-                    property_type="Hostel" if hostel['type'] == 'hostel' else "PG",
-                    capacity_total=capacity,
-                    capacity_occupied=occupied,
-                    latitude=hostel['lat'],
-                    longitude=hostel['lon'],
-                    owner_id=owner.id,
-                    verified=True,
-                    images=image_string
-                )
-                db.session.add(room)
-                count += 1
+                records.append({
+                    "title": hostel['name'],
+                    "price": price,
+                    "location": f"Near {college_name}",
+                    "college_nearby": college_name,
+                    "amenities": "WiFi,AC,Laundry,Security",
+                    "property_type": "Hostel" if hostel['type'] == 'hostel' else "PG",
+                    "capacity_total": capacity,
+                    "capacity_occupied": occupied,
+                    "latitude": hostel['lat'],
+                    "longitude": hostel['lon'],
+                    "owner_id": owner.id,
+                    "verified": True,
+                    "images": image_string,
+                })
         
+        records, _ = dedupe(records, ROOM_KEY)
+        count = bulk_insert(db.session, Room, records)
+        if image_updates:
+            db.session.execute(update(Room), image_updates)
         db.session.commit()
-        print(f"Successfully added {count} new hostels and updated {updated_count} existing ones with real photos!")
+        print(f"Successfully added {count} new hostels and updated {len(image_updates)} existing ones with real photos!")
 
 if __name__ == "__main__":
     populate_db()
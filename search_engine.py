@@ -1,3 +1,6 @@
+import re
+
+
 class TrieNode:
     def __init__(self):
         self.children = {}
@@ -15,9 +18,8 @@ class SearchTrie:
         text = text.lower()
         # We want to be able to search by any word in the text
         # e.g. "Sardar Patel" -> Search "Patel" should find it.
-        # So we insert suffixes or just words?
-        # Let's insert each word as a starting point for the Trie.
-        words = text.split()
+        # Words are \w+ runs, so "(VESIT)," is indexed as "vesit"
+        words = re.findall(r"\w+", text)
         for word in words:
             self._insert_word(word, room_id)
 
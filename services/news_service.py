@@ -1,35 +1,172 @@
-import feedparser
+"""
+College/education news for the home page widget (/api/news).
+
+Feeds are fetched in the background, never on the request path:
+
+- items are served from memory; once older than NEWS_REFRESH_SECONDS the
+  next request starts a background refresh and still gets the current copy
+  (only the very first request of a process waits for a fetch)
+- all feeds in NEWS_RSS_URLS are fetched concurrently on the pooled HTTP
+  client, with conditional GET (If-None-Match / If-Modified-Since), so an
+  unchanged feed costs a 304 and no parsing
+- a feed that fails to refresh keeps serving its last good items (with
+  nothing cached yet, it is retried after NEWS_RETRY_SECONDS)
+"""
+import asyncio
+import calendar
+import os
 import ssl
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import feedparser
+
+from utils.http_client import http_client
+
+# Comma-separated RSS feeds; Times of India Education by default
+NEWS_RSS_URLS = [
+    url.strip() for url in os.environ.get(
+        "NEWS_RSS_URLS",
+        os.environ.get("NEWS_RSS_URL", "https://timesofindia.indiatimes.com/rssfeeds/913168846.cms"),
+    ).split(",") if url.strip()
+]
+
+# Seconds before cached news is refreshed
+NEWS_REFRESH_SECONDS = float(os.environ.get("NEWS_REFRESH_SECONDS", "900"))
+
+# Seconds before retrying while no feed has produced any items yet
+NEWS_RETRY_SECONDS = 60.0
+
+# Items kept per feed
+NEWS_ITEMS_PER_FEED = 20
+
+
+class _Feed:
+    """Last good copy of one feed plus its validators for conditional GET."""
+
+    def __init__(self, url):
+        self.url = url
+        self.etag = None
+        self.modified = None
+        self.items = []
+        self.fetched_at = None
+
 
 class NewsService:
-    def __init__(self):
-        # Using Times of India Education RSS Feed as a source
-        self.rss_url = "https://timesofindia.indiatimes.com/rssfeeds/913168846.cms"
-        
+    def __init__(self, urls=None, refresh_seconds=NEWS_REFRESH_SECONDS):
+        self.urls = urls or NEWS_RSS_URLS
+        self.rss_url = self.urls[0]
+        self.refresh_seconds = refresh_seconds
+        self._feeds = [_Feed(url) for url in self.urls]
+        self._items = []
+        self._refreshed_at = 0.0
+        self._refreshing = threading.Lock()
+
         # Handle SSL certificate issues if any
         if hasattr(ssl, '_create_unverified_context'):
             ssl._create_default_https_context = ssl._create_unverified_context
 
+    def _news_items(self, feed, limit):
+        news_items = []
+
+        for entry in feed.entries[:limit]:
+            # Extract image if available (some feeds have it in media_content or summary)
+            image_url = None
+            if 'media_content' in entry:
+                image_url = entry.media_content[0]['url']
+
+            published = entry.get('published_parsed') or entry.get('updated_parsed')
+            news_items.append({
+                'title': entry.get('title', ''),
+                'link': entry.get('link', ''),
+                'published': entry.get('published', ''),
+                'summary': entry.get('summary', ''),
+                'image': image_url,
+                '_timestamp': calendar.timegm(published) if published else 0,
+            })
+
+        return news_items
+
+    def _fetch(self, feed):
+        """Refresh one feed in place; keeps the last good items on any failure."""
+        headers = {}
+        if feed.etag:
+            headers['If-None-Match'] = feed.etag
+        if feed.modified:
+            headers['If-Modified-Since'] = feed.modified
+        try:
+            response = http_client.request("news", "GET", feed.url, headers=headers)
+            if response.status_code == 304:
+                feed.fetched_at = time.time()
+                return
+            response.raise_for_status()
+            parsed = feedparser.parse(response.content)
+            if parsed.bozo and not parsed.entries:
+                raise ValueError(f"unparseable feed: {parsed.bozo_exception}")
+            feed.items = self._news_items(parsed, NEWS_ITEMS_PER_FEED)
+            feed.etag = response.headers.get('ETag')
+            feed.modified = response.headers.get('Last-Modified')
+            feed.fetched_at = time.time()
+        except Exception as e:
+            print(f"Error fetching news from {feed.url}: {e}")
+
+    def refresh(self):
+        """
+        Fetch every feed concurrently and rebuild the merged item list.
+
+        Returns:
+            Number of items now cached
+        """
+        with ThreadPoolExecutor(max_workers=min(8, len(self._feeds))) as executor:
+            list(executor.map(self._fetch, self._feeds))
+
+        # Newest first across feeds; the same story from two feeds is listed once
+        seen, items = set(), []
+        for item in sorted((item for feed in self._feeds for item in feed.items),
+                           key=lambda item: -item['_timestamp']):
+            if item['link'] not in seen:
+                seen.add(item['link'])
+                items.append({key: value for key, value in item.items() if key != '_timestamp'})
+        self._items = items
+        self._refreshed_at = time.monotonic()
+        return len(items)
+
+    def _maybe_refresh(self):
+        interval = self.refresh_seconds if self._items else min(self.refresh_seconds, NEWS_RETRY_SECONDS)
+        if time.monotonic() - self._refreshed_at < interval:
+            return
+        if not self._refreshing.acquire(blocking=False):
+            return
+        self._refreshed_at = time.monotonic()
+
+        def run():
+            try:
+                self.refresh()
+            finally:
+                self._refreshing.release()
+
+        threading.Thread(target=run, name="news-refresh", daemon=True).start()
+
+    def _load_first(self):
+        # First request in this process: wait for one fetch (or for the one in flight)
+        with self._refreshing:
+            if not self._items and self._refreshed_at == 0.0:
+                self.refresh()
+
     def get_latest_news(self, limit=5):
         try:
-            feed = feedparser.parse(self.rss_url)
-            news_items = []
-            
-            for entry in feed.entries[:limit]:
-                # Extract image if available (some feeds have it in media_content or summary)
-                image_url = None
-                if 'media_content' in entry:
-                    image_url = entry.media_content[0]['url']
-                
-                news_items.append({
-                    'title': entry.title,
-                    'link': entry.link,
-                    'published': entry.published,
-                    'summary': entry.summary,
-                    'image': image_url
-                })
-                
-            return news_items
+            if self._refreshed_at == 0.0:
+                self._load_first()
+            else:
+                self._maybe_refresh()
+            return self._items[:limit]
         except Exception as e:
             print(f"Error fetching news: {e}")
             return []
+
+    async def get_latest_news_async(self, limit=5):
+        """get_latest_news() for the ASGI path; only the first call waits, on a thread."""
+        if self._refreshed_at == 0.0:
+            return await asyncio.to_thread(self.get_latest_news, limit)
+        return self.get_latest_news(limit)
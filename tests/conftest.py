@@ -0,0 +1,36 @@
+"""
+Shared fixtures. The environment is set before `app` is first imported:
+a throwaway SQLite database, the fake Gemini model and no response cache.
+"""
+import contextlib
+import io
+import os
+import sys
+import tempfile
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+_TMP = tempfile.mkdtemp(prefix="roomies-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_TMP, 'roomies.db')}"
+os.environ["VECTOR_INDEX_DIR"] = os.path.join(_TMP, "vector_index")
+os.environ["CHATBOT_FAKE_MODEL"] = "1"
+os.environ["CHATBOT_FAKE_TOKEN_DELAY"] = "0"
+os.environ["CHAT_CACHE_TTL"] = "0"
+os.environ["QUERY_PROFILER"] = "1"
+
+
+@pytest.fixture(scope="session")
+def app_module():
+    """The `app` module, imported (and its database seeded) once per run."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        import app
+    app.app.config.update(TESTING=True, WTF_CSRF_ENABLED=False)
+    return app
+
+
+@pytest.fixture
+def client(app_module):
+    return app_module.app.test_client()
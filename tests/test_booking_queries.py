@@ -0,0 +1,90 @@
+"""Booking list endpoints issue a fixed number of SQL statements, however many bookings there are."""
+import itertools
+from types import SimpleNamespace
+
+import pytest
+
+_ids = itertools.count(1)
+
+
+@pytest.fixture
+def make(app_module):
+    """Factories for owners, rooms, students and bookings, inside the app context."""
+    A = app_module
+    ctx = A.app.app_context()
+    ctx.push()
+
+    def add(obj):
+        A.db.session.add(obj)
+        A.db.session.commit()
+        return obj
+
+    def owner():
+        o = A.Owner(email=f"owner{next(_ids)}@test.local", name="Owner")
+        o.set_password("password")
+        return add(o)
+
+    def room(owner):
+        return add(A.Room(title=f"Room {next(_ids)}", price=8000, location="Andheri",
+                          college_nearby="VJTI", owner_id=owner.id, verified=True))
+
+    def student():
+        s = A.Student(email=f"student{next(_ids)}@test.local", name="Student", college="VJTI")
+        s.set_password("password")
+        return add(s)
+
+    def booking(student, room):
+        return add(A.Booking(student_id=student.id, room_id=room.id, monthly_rent=room.price))
+
+    yield SimpleNamespace(owner=owner, room=room, student=student, booking=booking)
+    A.db.session.remove()
+    ctx.pop()
+
+
+def query_count(app_module, client, user_id, path):
+    """Statements issued by one authenticated GET of `path`."""
+    with client.session_transaction() as session:
+        session["_user_id"] = user_id
+        session["_fresh"] = True
+    app_module.user_cache.clear()
+    response = client.get(path)
+    assert response.status_code == 200, response.get_data(as_text=True)
+    profile = app_module.query_profiler.last_profile()
+    assert profile["path"] == path
+    return profile["query_count"], len(response.json["bookings"])
+
+
+def test_my_bookings_query_count_is_constant(app_module, client, make):
+    owner = make.owner()
+    rooms = [make.room(owner) for _ in range(6)]
+    student = make.student()
+    user_id = f"student:{student.id}"
+
+    make.booking(student, rooms[0])
+    few, listed = query_count(app_module, client, user_id, "/api/bookings/my")
+    assert listed == 1
+
+    for room in rooms[1:]:
+        make.booking(student, room)
+    many, listed = query_count(app_module, client, user_id, "/api/bookings/my")
+    assert listed == 6
+
+    assert many == few
+
+
+def test_owner_bookings_query_count_is_constant(app_module, client, make):
+    owner = make.owner()
+    rooms = [make.room(owner) for _ in range(3)]
+    user_id = f"owner:{owner.id}"
+
+    make.booking(make.student(), rooms[0])
+    few, listed = query_count(app_module, client, user_id, "/api/owner/bookings")
+    assert listed == 1
+
+    # More bookings, by different students, across all the owner's rooms
+    for room in rooms * 2:
+        make.booking(make.student(), room)
+    many, listed = query_count(app_module, client, user_id, "/api/owner/bookings")
+    assert listed == 7
+
+    assert many == few
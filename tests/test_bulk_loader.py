@@ -0,0 +1,79 @@
+"""Bulk loader round-trip on SQLite: read_csv -> fetch_existing_keys -> dedupe -> bulk_insert."""
+from datetime import datetime
+
+import pytest
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, create_engine, select
+from sqlalchemy.orm import Session
+
+from utils.bulk_loader import bulk_insert, dedupe, fetch_existing_keys, load_records, read_csv, read_records
+
+metadata = MetaData()
+rooms = Table(
+    "rooms", metadata,
+    Column("id", Integer, primary_key=True),
+    Column("title", String, nullable=False),
+    Column("location", String, nullable=False),
+    Column("property_type", String, default="shared"),
+    Column("created_at", DateTime, default=datetime.utcnow),
+)
+
+
+@pytest.fixture
+def session():
+    engine = create_engine("sqlite://")
+    metadata.create_all(engine)
+    with Session(engine) as session:
+        yield session
+
+
+@pytest.fixture
+def rooms_csv(tmp_path):
+    path = tmp_path / "rooms.csv"
+    path.write_text(
+        "title,location,property_type\n"
+        "Sunrise PG,Andheri,\n"
+        "Lake View,Powai,single\n"
+        "Sunrise PG,Andheri,double\n"
+        "Old Hostel,Dadar,\n",
+        encoding="utf-8",
+    )
+    return str(path)
+
+
+def test_read_csv_keeps_strings_and_maps_empty_cells_to_none(rooms_csv):
+    records = read_csv(rooms_csv)
+    assert records[0] == {"title": "Sunrise PG", "location": "Andheri", "property_type": None}
+    assert len(records) == 4
+    assert read_records(rooms_csv) == records
+    with pytest.raises(ValueError):
+        read_records("rooms.xlsx")
+
+
+def test_dedupe_skips_existing_and_repeated_keys():
+    records = [{"k": 1}, {"k": 2}, {"k": 1}, {"k": 3}]
+    unique, skipped = dedupe(records, ("k",), existing_keys=[(3,)])
+    assert unique == [{"k": 1}, {"k": 2}]
+    assert skipped == 2
+
+
+def test_round_trip_inserts_only_new_rows_with_defaults(session, rooms_csv):
+    bulk_insert(session, rooms, [{"title": "Old Hostel", "location": "Dadar"}])
+    existing = fetch_existing_keys(session, rooms, ("title", "location"))
+    assert existing == {("Old Hostel", "Dadar"): 1}
+
+    unique, skipped = dedupe(read_csv(rooms_csv), ("title", "location"), existing)
+    assert skipped == 2
+    # Small batches exercise more than one executemany call
+    assert bulk_insert(session, rooms, unique, batch_size=1) == 2
+    session.commit()
+
+    rows = session.execute(select(rooms).order_by(rooms.c.id)).all()
+    assert [(r.title, r.location, r.property_type) for r in rows] == [
+        ("Old Hostel", "Dadar", "shared"),
+        ("Sunrise PG", "Andheri", "shared"),
+        ("Lake View", "Powai", "single"),
+    ]
+    assert all(r.created_at is not None for r in rows)
+
+    # Loading the same file again inserts nothing
+    assert load_records(session, rooms, read_csv(rooms_csv), ("title", "location")) == (0, 4)
@@ -0,0 +1,84 @@
+"""/api/chat/stream Server-Sent Events framing with the fake Gemini model."""
+import json
+
+import pytest
+
+from agents import chatbot_lite
+from agents.fake_model import FakeStreamingModel
+from utils.resilience import CircuitBreaker
+
+QUESTION = "Which rooms near VJTI allow pets?"
+
+
+def sse_events(response):
+    """[(event, data), ...] from a text/event-stream body."""
+    assert response.mimetype == "text/event-stream"
+    events = []
+    for block in response.get_data(as_text=True).split("\n\n"):
+        if not block:
+            continue
+        fields = dict(line.split(": ", 1) for line in block.split("\n"))
+        events.append((fields.get("event", "message"), json.loads(fields["data"])))
+    return events
+
+
+@pytest.fixture
+def bot(app_module, monkeypatch):
+    bot = app_module.chatbot
+    monkeypatch.setattr(bot, "model", FakeStreamingModel(delay=0, tokens=6, latency=0, fail_rate=0))
+    monkeypatch.setattr(chatbot_lite, "gemini_breaker",
+                        CircuitBreaker("test_chat_stream", failure_threshold=5, reset_timeout=30))
+    return bot
+
+
+def test_deltas_in_order_then_done(client, bot):
+    response = client.post("/api/chat/stream", json={"message": QUESTION})
+
+    assert response.headers["Cache-Control"] == "no-cache"
+    assert sse_events(response) == [
+        ("message", {"delta": "(fake "}),
+        ("message", {"delta": "reply) "}),
+        ("message", {"delta": "You "}),
+        ("message", {"delta": "asked: "}),
+        ("message", {"delta": "Which "}),
+        ("message", {"delta": "rooms "}),
+        ("done", {}),
+    ]
+
+
+def test_model_failure_streams_faq_fallback(client, bot):
+    bot.model.fail_rate = 1.0
+
+    events = sse_events(client.post("/api/chat/stream", json={"message": QUESTION}))
+
+    assert events == [("message", {"delta": bot._fallback_response(QUESTION)}), ("done", {})]
+
+
+def test_open_breaker_streams_faq_fallback(client, bot):
+    for _ in range(chatbot_lite.gemini_breaker.failure_threshold):
+        chatbot_lite.gemini_breaker.record_failure()
+
+    events = sse_events(client.post("/api/chat/stream", json={"message": QUESTION}))
+
+    assert events == [("message", {"delta": bot._fallback_response(QUESTION)}), ("done", {})]
+
+
+def test_error_mid_stream_sends_error_then_done(client, bot, monkeypatch):
+    def broken_stream(user_message, **kwargs):
+        yield "Partial "
+        raise RuntimeError("provider crashed")
+
+    monkeypatch.setattr(bot, "stream_response", broken_stream)
+
+    events = sse_events(client.post("/api/chat/stream", json={"message": QUESTION}))
+
+    assert events == [
+        ("message", {"delta": "Partial "}),
+        ("error", {"error": "Sorry, something went wrong."}),
+        ("done", {}),
+    ]
+
+
+def test_missing_message_is_rejected(client):
+    response = client.post("/api/chat/stream", json={})
+    assert response.status_code == 400
@@ -0,0 +1,81 @@
+"""Admin export: streamed CSV and XLSX for one entity."""
+import csv
+import io
+import re
+
+import pytest
+from openpyxl import load_workbook
+from sqlalchemy import select
+
+from utils.data_export import csv_chunks, iter_row_chunks
+
+
+@pytest.fixture
+def admin_client(app_module, client):
+    A = app_module
+    with A.app.app_context():
+        admin = A.Admin.query.filter_by(email="export-admin@test.local").first()
+        if admin is None:
+            admin = A.Admin(email="export-admin@test.local", name="Admin")
+            admin.set_password("password")
+            A.db.session.add(admin)
+            A.db.session.commit()
+        user_id = admin.get_id()
+    with client.session_transaction() as session:
+        session["_user_id"] = user_id
+        session["_fresh"] = True
+    return client
+
+
+@pytest.fixture
+def room_count(app_module):
+    with app_module.app.app_context():
+        return app_module.Room.query.count()
+
+
+def expected_headers(app_module):
+    return [header for header, _ in app_module.ADMIN_EXPORTS["hostels"][1]]
+
+
+def test_rooms_csv(app_module, admin_client, room_count):
+    response = admin_client.get("/admin/export/hostels?format=csv")
+
+    assert response.status_code == 200
+    assert response.mimetype == "text/csv"
+    rows = list(csv.reader(io.StringIO(response.get_data(as_text=True))))
+    assert re.fullmatch(r'attachment; filename="roomies_hostels_\d{8}_\d{6}\.csv"',
+                        response.headers["Content-Disposition"])
+    assert rows[0] == expected_headers(app_module)
+    assert len(rows) == room_count + 1
+
+
+def test_rooms_xlsx(app_module, admin_client, room_count):
+    response = admin_client.get("/admin/export/hostels")
+
+    assert response.status_code == 200
+    assert response.mimetype == "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+    sheet = load_workbook(io.BytesIO(response.get_data()), read_only=True)["Rooms"]
+    assert response.headers["Content-Disposition"].endswith('.xlsx"')
+    rows = list(sheet.iter_rows(values_only=True))
+    assert list(rows[0]) == expected_headers(app_module)
+    assert len(rows) == room_count + 1
+
+
+def test_unknown_entity_redirects(admin_client):
+    response = admin_client.get("/admin/export/passwords?format=csv")
+    assert response.status_code == 302
+
+
+def test_export_requires_admin(client):
+    assert client.get("/admin/export/hostels?format=csv").status_code == 302
+
+
+def test_csv_rows_span_chunks(app_module, room_count):
+    A = app_module
+    with A.app.app_context():
+        chunks = list(iter_row_chunks(A.db.session, select(A.Room.id).order_by(A.Room.id), chunk_size=7))
+        text = "".join(csv_chunks(["id"], iter(chunks)))
+
+    assert max(len(chunk) for chunk in chunks) == 7
+    assert len(text.splitlines()) == room_count + 1
+
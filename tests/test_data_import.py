@@ -0,0 +1,59 @@
+"""Admin sheet validation: per-row errors, in-file duplicates and rows already in the database."""
+import pandas as pd
+
+from utils.data_import import prepare_rooms, prepare_users
+
+
+def test_prepare_users_reports_bad_rows_by_sheet_row():
+    df = pd.DataFrame({
+        "email": ["a@x.in", None, "not-an-email", "A@X.IN", "b@x.in", "old@x.in"],
+        "name": ["A", "B", "C", "A again", None, "Old"],
+        "is_verified": ["yes", "no", "1", "true", "", "t"],
+    })
+    valid, errors = prepare_users(df, existing_emails={"old@x.in"}, extra_flags=("is_verified",))
+
+    # Header is row 1, so DataFrame index 1 is sheet row 3
+    assert errors == [
+        "Row 3: missing email",
+        "Row 4: invalid email",
+        "Row 5: duplicate email in file",
+    ]
+    assert list(valid["email"]) == ["a@x.in", "b@x.in"]
+    assert list(valid["name"]) == ["A", "Unknown"]
+    assert list(valid["is_verified"]) == [True, False]
+
+
+def test_prepare_users_carries_extra_text_columns_with_defaults():
+    df = pd.DataFrame({"email": ["a@x.in", "b@x.in"], "college": ["VJTI", float("nan")]})
+    valid, errors = prepare_users(df, set(), extra_text={"college": "Unknown", "phone": ""})
+    assert errors == []
+    assert list(valid["college"]) == ["VJTI", "Unknown"]
+    assert list(valid["phone"]) == ["", ""]
+
+
+def test_prepare_rooms_validates_price_capacity_and_duplicates():
+    df = pd.DataFrame({
+        "title": ["Sunrise PG", "Bad price", "Negative", "No room", "Sunrise PG", "Existing", None],
+        "location": ["Andheri", "Dadar", "Dadar", "Dadar", "Andheri", "Bandra", "Kurla"],
+        "price": [8000, "abc", -5, 9000, 8500, 7000, 6000.0],
+        "capacity_total": [2, 1, 1, 0, 3, None, None],
+        "owner_email": ["Owner@X.in", "", "", "", "", "", ""],
+        "latitude": [19.1, None, None, None, None, None, None],
+        "verified": ["Yes", "", "", "", "", "", "0"],
+    })
+    valid, errors = prepare_rooms(df, existing_keys={("Existing", "Bandra")})
+
+    assert errors == [
+        "Row 3: price must be a non-negative number",
+        "Row 4: price must be a non-negative number",
+        "Row 5: capacity_total must be at least 1",
+        "Row 6: duplicate title/location in file",
+    ]
+    assert list(zip(valid["title"], valid["location"])) == [("Sunrise PG", "Andheri"), ("Untitled", "Kurla")]
+    assert list(valid["price"]) == [8000, 6000]
+    assert list(valid["capacity_total"]) == [2, 1]
+    assert list(valid["owner_email"]) == ["owner@x.in", ""]
+    assert list(valid["verified"]) == [True, False]
+    assert list(valid["latitude"]) == [19.1, None]
+    assert list(valid["longitude"]) == [None, None]
+    assert list(valid["college_nearby"]) == ["Unknown", "Unknown"]
@@ -0,0 +1,74 @@
+"""engine_options(): DB_POOL_* / DB_* environment variables mapped to SQLAlchemy engine options."""
+import json
+import os
+import subprocess
+import sys
+
+from sqlalchemy.pool import NullPool
+
+from utils import db_pool
+from utils.db_pool import TimedQueuePool, engine_options
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PG_URL = "postgresql://roomies@db/roomies"
+
+
+def options_in_subprocess(database_url, **env):
+    """engine_options() in a fresh interpreter, so the module reads `env` at import."""
+    script = (
+        "import json, sys; from utils.db_pool import engine_options; "
+        "options = engine_options(sys.argv[1]); "
+        "options['poolclass'] = options['poolclass'].__name__; "
+        "print(json.dumps(options))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", script, database_url],
+        cwd=ROOT, env={**os.environ, **env}, capture_output=True, text=True, check=True,
+    )
+    return json.loads(result.stdout)
+
+
+def test_postgres_options_read_from_environment():
+    options = options_in_subprocess(
+        PG_URL,
+        DB_POOL_SIZE="12", DB_MAX_OVERFLOW="3", DB_POOL_TIMEOUT="7.5",
+        DB_POOL_RECYCLE="120", DB_SSLMODE="disable",
+    )
+    assert options == {
+        "connect_args": {"sslmode": "disable"},
+        "pool_pre_ping": True,
+        "poolclass": "TimedQueuePool",
+        "pool_size": 12,
+        "max_overflow": 3,
+        "pool_timeout": 7.5,
+        "pool_recycle": 120,
+    }
+
+
+def test_pool_size_zero_hands_pooling_to_pgbouncer(monkeypatch):
+    monkeypatch.setattr(db_pool, "DB_POOL_SIZE", 0)
+    options = engine_options(PG_URL)
+    assert options["poolclass"] is NullPool
+    assert "pool_size" not in options
+
+
+def test_pgbouncer_disables_psycopg3_prepared_statements(monkeypatch):
+    monkeypatch.setattr(db_pool, "PGBOUNCER", True)
+    assert engine_options("postgresql+psycopg://roomies@db/roomies")["connect_args"]["prepare_threshold"] is None
+    # psycopg2 never prepares server-side, so nothing to turn off
+    assert "prepare_threshold" not in engine_options("postgresql+psycopg2://roomies@db/roomies")["connect_args"]
+
+
+def test_sqlite_file_uses_timed_pool_without_ssl_or_recycle(monkeypatch):
+    monkeypatch.setattr(db_pool, "DB_POOL_SIZE", 0)
+    options = engine_options("sqlite:///roomies.db")
+    assert options["poolclass"] is TimedQueuePool
+    assert options["pool_size"] == 1
+    assert "connect_args" not in options and "pool_recycle" not in options
+
+
+def test_in_memory_sqlite_and_other_databases_keep_defaults():
+    assert engine_options("sqlite://") == {}
+    assert engine_options("sqlite:///:memory:") == {}
+    assert engine_options("mysql://roomies@db/roomies") == {}
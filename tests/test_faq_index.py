@@ -0,0 +1,70 @@
+"""FAQ index: IDF-weighted ranking, thresholds and hot reload when the file changes."""
+import json
+import os
+
+import pytest
+
+from agents.faq_index import FAQIndex
+
+FAQS = [
+    {"question": "How do I get a refund of my deposit?", "answer": "refund"},
+    {"question": "How do I book a room?", "answer": "book"},
+    {"question": "How do I contact the owner?", "answer": "contact"},
+    {"question": "Is wifi included in the rent?", "answer": "wifi"},
+]
+
+
+def write(path, faqs, mtime):
+    path.write_text(json.dumps(faqs), encoding="utf-8")
+    os.utime(path, (mtime, mtime))
+
+
+@pytest.fixture
+def faq_file(tmp_path):
+    path = tmp_path / "faqs.json"
+    write(path, FAQS, 1_000_000)
+    return path
+
+
+def answers(results):
+    return [faq["answer"] for faq in results]
+
+
+def test_rare_terms_outweigh_common_ones(faq_file):
+    index = FAQIndex(str(faq_file), reload_interval=60)
+    snapshot = index._snapshot
+    # "how" is in three questions, "refund" in one
+    assert snapshot.idf["how"] < snapshot.idf["refund"]
+    assert answers(index.search("how do i refund")) == ["refund", "book", "contact"]
+    assert answers(index.search("refund")) == ["refund"]
+
+
+def test_max_results_min_score_and_no_overlap(faq_file):
+    index = FAQIndex(str(faq_file), reload_interval=60)
+    assert len(index.search("how do i", max_results=2)) == 2
+    assert index.search("how do i", min_score=0.99) == []
+    assert index.search("parking availability") == []
+    assert index.search("") == []
+
+
+def test_hot_reload_after_the_file_changes(faq_file):
+    index = FAQIndex(str(faq_file), reload_interval=0)
+    assert index.search("pets allowed") == []
+
+    write(faq_file, FAQS + [{"question": "Are pets allowed?", "answer": "pets"}], 1_000_100)
+    assert answers(index.search("pets allowed")) == ["pets"]
+    assert len(index.faqs) == 5
+
+
+def test_bad_file_keeps_serving_the_previous_index(faq_file):
+    index = FAQIndex(str(faq_file), reload_interval=0)
+    faq_file.write_text("{not json", encoding="utf-8")
+    os.utime(faq_file, (1_000_200, 1_000_200))
+    assert answers(index.search("wifi rent")) == ["wifi"]
+
+
+def test_reload_waits_for_the_interval(faq_file):
+    index = FAQIndex(str(faq_file), reload_interval=3600)
+    index.search("warm up")  # first check
+    write(faq_file, [{"question": "Are pets allowed?", "answer": "pets"}], 1_000_300)
+    assert index.search("pets allowed") == []
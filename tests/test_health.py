@@ -0,0 +1,51 @@
+"""/livez, /readyz and /healthz probes."""
+from utils.health import CachedCheck
+
+
+def failing_ping():
+    raise ConnectionError("could not connect to server")
+
+
+def test_livez_is_ok(client):
+    response = client.get("/livez")
+    assert response.status_code == 200
+    assert response.json == {"status": "ok"}
+
+
+def test_readyz_ready(client, app_module):
+    response = client.get("/readyz")
+    assert response.status_code == 200
+    assert response.json["status"] == "ready"
+    assert response.json["checks"]["database"]["ok"] is True
+
+
+def test_readyz_503_when_database_check_fails(client, app_module, monkeypatch):
+    monkeypatch.setattr(app_module, "database_check", CachedCheck(failing_ping, ttl=0))
+
+    response = client.get("/readyz")
+
+    assert response.status_code == 503
+    assert response.json["status"] == "unavailable"
+    assert response.json["checks"]["database"]["ok"] is False
+    assert "could not connect" in response.json["checks"]["database"]["error"]
+
+
+def test_readyz_503_until_search_index_is_built(client, app_module, monkeypatch):
+    monkeypatch.setitem(app_module.search_index_status, "ready", False)
+
+    response = client.get("/readyz")
+
+    assert response.status_code == 503
+    assert response.json["checks"]["search_index"]["ok"] is False
+    assert response.json["checks"]["database"]["ok"] is True
+
+
+def test_healthz_rooms_is_the_database_count(client, app_module, monkeypatch):
+    monkeypatch.setitem(app_module.search_index_status, "rooms", 0)
+    with app_module.app.app_context():
+        rooms = app_module.Room.query.count()
+
+    response = client.get("/healthz")
+
+    assert response.json["rooms"] == rooms > 0
+    assert response.json["indexed_rooms"] == 0
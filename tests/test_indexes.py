@@ -0,0 +1,33 @@
+"""Hot room, booking, wallet and flash-deal queries use their indexes (migrations/add_performance_indexes.py)."""
+import re
+
+import pytest
+from sqlalchemy import text
+
+from migrations import add_performance_indexes as migration
+
+# A plan line that reads a whole table: "SCAN rooms" (no index)
+FULL_SCAN_RE = re.compile(r"^SCAN (TABLE )?\w+$")
+
+
+@pytest.fixture
+def connection(app_module):
+    with app_module.app.app_context():
+        with app_module.db.engine.connect() as connection:
+            connection.execute(text("ANALYZE"))
+            yield connection
+            connection.rollback()
+
+
+def test_check_plans_reports_nothing_missing(app_module, capsys):
+    with app_module.app.app_context():
+        assert migration.check_plans() == []
+
+
+@pytest.mark.parametrize("description, sql, index_name", migration.EXPLAIN_QUERIES,
+                         ids=[query[0] for query in migration.EXPLAIN_QUERIES])
+def test_query_uses_its_index(connection, description, sql, index_name):
+    plan = migration.explain(connection, "sqlite", sql)
+
+    assert index_name in plan, plan
+    assert not any(FULL_SCAN_RE.match(line.strip()) for line in plan.splitlines()), plan
@@ -0,0 +1,81 @@
+"""/metrics exposition: route latency histograms, per-request SQL series and outbound-call series."""
+import re
+
+import pytest
+from flask import Response
+
+from utils import metrics as metrics_module
+from utils.metrics import track_external
+
+SAMPLE_RE = re.compile(r"^([a-zA-Z_:][a-zA-Z0-9_:]*)(\{[^}]*\})? (\S+)$")
+
+
+def scrape(client):
+    """{(name, labels): value} for every sample, checking each line is valid exposition text."""
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.content_type == "text/plain; version=0.0.4; charset=utf-8"
+    samples = {}
+    for line in response.get_data(as_text=True).splitlines():
+        if line.startswith("# HELP ") or line.startswith("# TYPE "):
+            continue
+        match = SAMPLE_RE.match(line)
+        assert match, f"not an exposition line: {line!r}"
+        name, labels, value = match.groups()
+        samples[(name, labels or "")] = float(value)
+    return samples
+
+
+def test_route_latency_histogram_and_request_counter(client):
+    before = scrape(client)
+    client.get("/livez")
+    client.get("/livez")
+    after = scrape(client)
+
+    labels = '{endpoint="livez",method="GET"'
+    count = ("roomies_http_request_duration_seconds_count", labels + "}")
+    assert after[count] - before.get(count, 0) == 2
+    # Buckets are cumulative and end at +Inf == _count
+    buckets = [value for (name, label), value in after.items()
+               if name == "roomies_http_request_duration_seconds_bucket" and label.startswith(labels)]
+    assert buckets == sorted(buckets)
+    assert after[("roomies_http_request_duration_seconds_bucket", labels + ',le="+Inf"}')] == after[count]
+    assert after[("roomies_http_requests_total", labels + ',status="200"}')] >= 2
+
+
+def test_sql_time_and_statement_count_per_request(client):
+    before = scrape(client)
+    assert client.get("/healthz").status_code == 200
+    after = scrape(client)
+
+    labels = '{endpoint="healthcheck"}'
+    assert after[("roomies_db_queries_per_request_count", labels)] \
+        - before.get(("roomies_db_queries_per_request_count", labels), 0) == 1
+    assert after[("roomies_db_queries_per_request_sum", labels)] \
+        - before.get(("roomies_db_queries_per_request_sum", labels), 0) >= 1
+    assert after[("roomies_db_time_per_request_seconds_sum", labels)] > 0
+
+
+def test_external_call_latency_errors_and_per_request_time(client, app_module):
+    app = app_module.app
+    with app.test_request_context("/livez"):
+        app.preprocess_request()
+        with track_external("test-service"):
+            pass
+        with pytest.raises(TimeoutError):
+            with track_external("test-service"):
+                raise TimeoutError("upstream timed out")
+        app.process_response(Response())
+
+    samples = scrape(client)
+    service = '{service="test-service"}'
+    assert samples[("roomies_external_call_duration_seconds_count", service)] == 2
+    assert samples[("roomies_external_call_errors_total", service)] == 1
+    assert samples[("roomies_external_time_per_request_seconds_count", '{endpoint="livez"}')] >= 1
+
+
+def test_scrape_requires_token_when_configured(client, monkeypatch):
+    monkeypatch.setattr(metrics_module, "METRICS_TOKEN", "s3cret")
+    assert client.get("/metrics").status_code == 401
+    response = client.get("/metrics", headers={"Authorization": "Bearer s3cret"})
+    assert response.status_code == 200
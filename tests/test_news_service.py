@@ -0,0 +1,46 @@
+"""NewsService against a local RSS server: conditional GET and last good copy."""
+import pytest
+
+from load_test_async import start_rss_stub
+from services.news_service import NewsService
+
+
+@pytest.fixture
+def feed_server():
+    server = start_rss_stub(0, etag='"v1"')
+    yield server
+    server.shutdown()
+
+
+def test_unchanged_feed_is_a_304_and_keeps_items(feed_server):
+    news = NewsService(urls=[f"http://127.0.0.1:{feed_server.server_port}/rss"])
+
+    assert news.refresh() == 10
+    assert news.refresh() == 10
+
+    assert feed_server.statuses == [200, 304]
+    assert news.get_latest_news(limit=3)[0]["title"].startswith("Headline")
+
+
+def test_failing_feed_serves_last_good_copy(feed_server):
+    news = NewsService(urls=[f"http://127.0.0.1:{feed_server.server_port}/rss"])
+    assert news.refresh() == 10
+    before = news.get_latest_news(limit=10)
+
+    feed_server.status = 500
+    assert news.refresh() == 10
+
+    assert feed_server.statuses == [200, 500]
+    assert news.get_latest_news(limit=10) == before
+
+
+def test_empty_news_is_not_browser_cached(app_module, client, monkeypatch):
+    monkeypatch.setattr(app_module.news_service, "get_latest_news", lambda limit=5: [])
+    response = client.get("/api/news")
+    assert response.json == {"success": True, "news": []}
+    assert "Cache-Control" not in response.headers
+
+    item = {"title": "Headline", "link": "http://example.com/1"}
+    monkeypatch.setattr(app_module.news_service, "get_latest_news", lambda limit=5: [item])
+    response = client.get("/api/news")
+    assert response.headers["Cache-Control"] == f"public, max-age={app_module.NEWS_BROWSER_CACHE_SECONDS}"
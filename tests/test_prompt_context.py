@@ -0,0 +1,53 @@
+"""Prompt context: stays within the token budget and keeps the sections the message asks about."""
+import pytest
+
+from agents.prompt_context import GUIDE_HEADER, GUIDE_SECTIONS, SUMMARY, assemble, count_tokens, relevant_sections
+
+FAQS = [
+    "Q: How do I get my deposit back?\nA: Deposits are refunded within 7 days of checkout.",
+    "Q: Can I visit before booking?\nA: Yes, ask the owner for a visit slot.",
+    "Q: Are meals included?\nA: Most PGs include breakfast and dinner.",
+]
+ROOMS = [f"- Room {i} in Andheri West, ₹{8000 + i * 500}/month, PG near VJTI" for i in range(40)]
+MESSAGES = ["is the deposit refundable?", "hello there", "roommate matching and price", "contact support"]
+
+
+@pytest.mark.parametrize("budget", [60, 120, 250, 450, 2000])
+@pytest.mark.parametrize("message", MESSAGES)
+def test_context_never_exceeds_the_budget(message, budget):
+    context, tokens, _ = assemble(message, FAQS, ROOMS, budget=budget)
+    # The reported count is the real count of the text sent, headers included
+    assert tokens == count_tokens(context)
+    assert tokens <= max(budget, SUMMARY.tokens + count_tokens(GUIDE_HEADER))
+    assert SUMMARY.text in context
+
+
+def test_intent_sections_are_kept_and_others_dropped():
+    context, _, names = assemble("how much is the deposit and is it refundable?", FAQS, ROOMS, budget=200)
+    assert names == ["pricing"]
+    assert "Security Deposit" in context
+    assert "AI ROOMMATE MATCHING" not in context
+    # The best FAQ goes in before the listings fill the budget
+    assert FAQS[0] in context
+
+
+def test_matched_sections_outrank_room_listings():
+    pricing = next(section for section in GUIDE_SECTIONS if section.name == "pricing")
+    budget = SUMMARY.tokens + count_tokens(GUIDE_HEADER) + pricing.tokens
+    context, _, names = assemble("what is the price?", (), ROOMS, budget=budget)
+    assert names == ["pricing"]
+    assert "Available Rooms" not in context
+
+    context, _, names = assemble("what is the price?", (), ROOMS, budget=budget + 40)
+    assert names == ["pricing"]
+    assert ROOMS[0] in context
+
+
+def test_no_intent_fills_remaining_budget_with_guide_in_order():
+    _, _, names = assemble("hello there", (), (), budget=10_000)
+    assert names == [section.name for section in GUIDE_SECTIONS]
+
+
+def test_relevant_sections_match_whole_words():
+    assert [s.name for s in relevant_sections("Looking for a ROOMMATE")] == ["ai_matching"]
+    assert relevant_sections("bookworm here") == []
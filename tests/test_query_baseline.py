@@ -0,0 +1,53 @@
+"""
+Per-endpoint SQL statement counts against tests/query_baseline.json.
+
+Fails when a main endpoint issues more statements than the committed
+baseline (usually a new N+1). After an intended change, regenerate with:
+
+    QUERY_BASELINE_UPDATE=1 python -m pytest tests/test_query_baseline.py
+"""
+import os
+
+import pytest
+
+from utils.query_profiler import load_baseline
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "query_baseline.json")
+
+# Anonymous GETs for the main pages and APIs; {room_id} is a seeded room
+PATHS = (
+    "/",
+    "/explore",
+    "/api/rooms",
+    "/api/rooms?q=vjti",
+    "/api/rooms?college=VJTI&max_rent=15000&sort=price_desc",
+    "/api/room/{room_id}",
+    "/api/colleges",
+    "/api/suggestions?q=and",
+    "/api/search/autocomplete?q=and",
+    "/api/flash-deals",
+    "/api/subscription-plans",
+    "/api/services",
+    "/api/news",
+)
+
+
+def test_endpoints_within_query_baseline(app_module, client, monkeypatch):
+    monkeypatch.setattr(app_module.news_service, "get_latest_news", lambda limit=5: [])
+    with app_module.app.app_context():
+        room_id = app_module.db.session.query(app_module.Room.id).order_by(app_module.Room.id).first()[0]
+
+    profiler = app_module.query_profiler
+    profiler.reset()
+    for path in PATHS:
+        response = client.get(path.format(room_id=room_id))
+        assert response.status_code == 200, path
+
+    if os.environ.get("QUERY_BASELINE_UPDATE"):
+        profiler.write_baseline(BASELINE_PATH)
+        pytest.skip(f"baseline written to {BASELINE_PATH}")
+
+    baseline = load_baseline(BASELINE_PATH)
+    assert set(baseline) == set(profiler.endpoint_counts), "endpoints changed; regenerate the baseline"
+    regressions = profiler.compare_baseline(baseline)
+    assert not regressions, regressions
@@ -0,0 +1,58 @@
+"""request_cached_property: one load per request and instance row, forget_request_memo() reloads."""
+from flask import Flask, g
+
+from utils.request_cache import forget_request_memo, request_cached_property
+
+
+class Owner:
+    loads = 0
+
+    def __init__(self, id):
+        self.id = id
+
+    @request_cached_property
+    def active_subscription(self):
+        Owner.loads += 1
+        return None if self.id == 2 else f"plan-{self.id}-{Owner.loads}"
+
+
+def test_property_is_memoized_per_request_and_row():
+    Owner.loads = 0
+    app = Flask(__name__)
+
+    with app.test_request_context():
+        first = Owner(1).active_subscription
+        # Another instance of the same row shares the value
+        assert Owner(1).active_subscription == first
+        # None is cached too
+        assert Owner(2).active_subscription is None
+        assert Owner(2).active_subscription is None
+        assert Owner.loads == 2
+        assert (g._memo_misses, g._memo_hits) == (2, 2)
+
+    with app.test_request_context():
+        assert Owner(1).active_subscription != first
+        assert Owner.loads == 3
+
+
+def test_forget_reloads_on_next_access():
+    Owner.loads = 0
+    app = Flask(__name__)
+    owner = Owner(1)
+
+    with app.test_request_context():
+        before = owner.active_subscription
+        forget_request_memo(("Owner", "active_subscription", owner.id))
+        after = owner.active_subscription
+        assert before != after
+        assert owner.active_subscription == after
+        assert Owner.loads == 2
+
+
+def test_outside_a_request_the_loader_runs_every_time():
+    Owner.loads = 0
+    owner = Owner(1)
+    owner.active_subscription
+    owner.active_subscription
+    forget_request_memo(("Owner", "active_subscription", owner.id))  # no-op without a request
+    assert Owner.loads == 2
@@ -0,0 +1,152 @@
+"""guarded_call(): limiter queue timeout, breaker open / half-open, chatbot FAQ fallback."""
+import threading
+import time
+
+import pytest
+
+from agents import chatbot_lite
+from utils.resilience import (
+    CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpen, ConcurrencyLimiter, LimiterFull, guarded_call,
+)
+
+
+class FlakyUpstream:
+    """Fake upstream call: fails while `failing` is set, can block until released."""
+
+    def __init__(self):
+        self.calls = 0
+        self.failing = False
+        self.release = threading.Event()
+        self.release.set()
+        self.entered = threading.Event()
+
+    def __call__(self):
+        self.calls += 1
+        self.entered.set()
+        self.release.wait(5)
+        if self.failing:
+            raise RuntimeError("upstream down")
+        return "ok"
+
+
+def call_in_thread(limiter, breaker, upstream):
+    """Start a guarded call on another thread; returns the thread."""
+    def run():
+        try:
+            with guarded_call(limiter, breaker):
+                upstream()
+        except Exception:
+            pass
+
+    thread = threading.Thread(target=run)
+    thread.start()
+    assert upstream.entered.wait(5)
+    return thread
+
+
+def test_limiter_full_after_max_wait():
+    limiter = ConcurrencyLimiter("test_limiter_full", max_concurrent=1, max_wait=0.1)
+    breaker = CircuitBreaker("test_limiter_full", failure_threshold=3, reset_timeout=30)
+    slow = FlakyUpstream()
+    slow.release.clear()
+    holder = call_in_thread(limiter, breaker, slow)
+
+    started = time.perf_counter()
+    with pytest.raises(LimiterFull):
+        with guarded_call(limiter, breaker):
+            pytest.fail("upstream called without a free slot")
+    waited = time.perf_counter() - started
+
+    slow.release.set()
+    holder.join()
+    assert 0.1 <= waited < 1
+    # A queue timeout is not an upstream failure
+    assert breaker.state == CLOSED
+    assert limiter.in_flight == 0
+
+
+def test_breaker_opens_after_threshold_failures():
+    limiter = ConcurrencyLimiter("test_breaker_opens", max_concurrent=4, max_wait=1)
+    breaker = CircuitBreaker("test_breaker_opens", failure_threshold=3, reset_timeout=30)
+    upstream = FlakyUpstream()
+    upstream.failing = True
+
+    for _ in range(3):
+        assert breaker.state == CLOSED
+        with pytest.raises(RuntimeError):
+            with guarded_call(limiter, breaker):
+                upstream()
+    assert breaker.state == OPEN
+
+    with pytest.raises(CircuitOpen):
+        with guarded_call(limiter, breaker):
+            upstream()
+    assert upstream.calls == 3
+    assert breaker.rejects()
+
+
+def test_half_open_allows_one_trial():
+    limiter = ConcurrencyLimiter("test_half_open", max_concurrent=4, max_wait=1)
+    breaker = CircuitBreaker("test_half_open", failure_threshold=1, reset_timeout=0.05)
+    upstream = FlakyUpstream()
+    upstream.failing = True
+    with pytest.raises(RuntimeError):
+        with guarded_call(limiter, breaker):
+            upstream()
+    assert breaker.state == OPEN
+
+    time.sleep(0.06)
+    upstream.failing = False
+    upstream.release.clear()
+    upstream.entered.clear()
+    trial = call_in_thread(limiter, breaker, upstream)
+    assert breaker.state == HALF_OPEN
+
+    # Only the trial goes through while it is running
+    with pytest.raises(CircuitOpen):
+        with guarded_call(limiter, breaker):
+            upstream()
+
+    upstream.release.set()
+    trial.join()
+    assert breaker.state == CLOSED
+    assert upstream.calls == 2
+
+
+def test_failed_trial_reopens():
+    limiter = ConcurrencyLimiter("test_failed_trial", max_concurrent=4, max_wait=1)
+    breaker = CircuitBreaker("test_failed_trial", failure_threshold=1, reset_timeout=0.05)
+    upstream = FlakyUpstream()
+    upstream.failing = True
+    for _ in range(2):
+        with pytest.raises(RuntimeError):
+            with guarded_call(limiter, breaker):
+                upstream()
+        assert breaker.state == OPEN
+        time.sleep(0.06)
+
+
+def test_chatbot_answers_from_faq_while_open(monkeypatch):
+    breaker = CircuitBreaker("test_chatbot_breaker", failure_threshold=2, reset_timeout=30)
+    monkeypatch.setattr(chatbot_lite, "gemini_breaker", breaker)
+
+    class FailingModel:
+        calls = 0
+
+        def generate_content(self, prompt, **kwargs):
+            FailingModel.calls += 1
+            raise TimeoutError("deadline exceeded")
+
+    bot = chatbot_lite.chatbot
+    monkeypatch.setattr(bot, "model", FailingModel())
+    question = "Is the security deposit refundable when I move out?"
+    fallback = bot._fallback_response(question)
+
+    assert bot.get_response(question) == fallback
+    assert bot.get_response(question) == fallback
+    assert breaker.state == OPEN
+    assert FailingModel.calls == 2
+
+    # Open: straight to the FAQ answer without calling the model
+    assert bot.get_response(question) == fallback
+    assert FailingModel.calls == 2
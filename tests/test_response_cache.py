@@ -0,0 +1,78 @@
+"""ResponseCache: TTL expiry, LRU eviction and the near-duplicate threshold."""
+from types import SimpleNamespace
+
+import pytest
+
+from utils import response_cache as rc
+from utils.response_cache import ResponseCache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Controllable time.monotonic() for the cache module."""
+    now = SimpleNamespace(value=1000.0)
+    monkeypatch.setattr(rc, "time", SimpleNamespace(monotonic=lambda: now.value))
+    return now
+
+
+def test_exact_hit_ignores_case_and_punctuation():
+    cache = ResponseCache(ttl=60, max_entries=10)
+    cache.set("How does the refund work?", "ctx", "Refunds take 7 days.")
+    assert cache.get("how does the REFUND work", "ctx") == "Refunds take 7 days."
+    assert cache.get("how does the refund work", "other-ctx") is None
+
+
+def test_entries_expire_after_ttl(clock):
+    cache = ResponseCache(ttl=60, max_entries=10)
+    cache.set("is wifi included", "ctx", "Yes.")
+
+    clock.value += 59
+    assert cache.get("is wifi included", "ctx") == "Yes."
+    clock.value += 2
+    assert cache.get("is wifi included", "ctx") is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_least_recently_used_is_evicted():
+    cache = ResponseCache(ttl=60, max_entries=2)
+    cache.set("first question", "ctx", "one")
+    cache.set("second question", "ctx", "two")
+    assert cache.get("first question", "ctx") == "one"  # now most recently used
+
+    cache.set("third question", "ctx", "three")
+
+    assert cache.get("second question", "ctx") is None
+    assert cache.get("first question", "ctx") == "one"
+    assert cache.get("third question", "ctx") == "three"
+
+
+def test_near_duplicates_are_off_by_default():
+    assert rc.CHAT_CACHE_SIMILARITY == 0
+    cache = ResponseCache(ttl=60, max_entries=10)
+    cache.set("how does the refund work", "ctx", "Refunds take 7 days.")
+    assert cache.get("how does refund work", "ctx") is None
+
+
+def test_near_duplicate_threshold():
+    cache = ResponseCache(ttl=60, max_entries=10, similarity=0.8)
+    cache.set("how does the refund process work", "ctx", "Refunds take 7 days.")
+
+    # 5 of 6 tokens shared: Jaccard 0.83
+    assert cache.get("how does refund process work", "ctx") == "Refunds take 7 days."
+    # 4 of 7 tokens shared: Jaccard 0.57
+    assert cache.get("how does refund work for deposits", "ctx") is None
+    assert cache.near_hits == 1
+
+
+def test_negation_never_matches_a_near_duplicate():
+    cache = ResponseCache(ttl=60, max_entries=10, similarity=0.5)
+    cache.set("is wifi included in the rent", "ctx", "Yes, wifi is included.")
+
+    assert cache.get("is wifi not included in the rent", "ctx") is None
+    assert cache.get("wifi isn't included in the rent", "ctx") is None
+
+
+def test_zero_ttl_disables_the_cache():
+    cache = ResponseCache(ttl=0, max_entries=10)
+    cache.set("is wifi included", "ctx", "Yes.")
+    assert cache.get("is wifi included", "ctx") is None
@@ -0,0 +1,104 @@
+"""Room search backends: trie word-prefix path, ILIKE fallback, PostgreSQL tsvector SQL."""
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from search_engine import SearchTrie
+from utils import search_backend
+from utils.search_backend import IlikeSearchBackend, PostgresSearchBackend, TrieSearchBackend, tokenize
+
+
+def sql(query, dialect=None):
+    return str(query.statement.compile(dialect=dialect))
+
+
+@pytest.fixture
+def backends(app_module):
+    A = app_module
+    with A.app.app_context():
+        trie = SearchTrie()
+        rows = A.db.session.query(A.Room.id, A.Room.title, A.Room.location, A.Room.college_nearby).all()
+        for room_id, *texts in rows:
+            for value in texts:
+                trie.insert(value, room_id)
+        yield (TrieSearchBackend(A.db, A.Room, trie, sync=lambda: 0),
+               IlikeSearchBackend(A.db, A.Room), A.Room)
+
+
+def test_tokenize_keeps_word_characters_only():
+    assert tokenize("(VESIT), Chembur-East") == ["vesit", "chembur", "east"]
+
+
+def test_trie_indexes_words_without_punctuation():
+    trie = SearchTrie()
+    trie.insert("Near (VESIT), Chembur", 7)
+    assert trie.search("vesit") == {7}
+    assert trie.search("chem") == {7}
+    assert trie.search("esit") == set()
+
+
+def test_trie_matches_word_prefixes(backends):
+    trie_backend, ilike_backend, Room = backends
+    query = trie_backend.filter_rooms(Room.query, "VESIT")
+
+    assert " IN " in sql(query) and "LIKE" not in sql(query).upper()
+    assert {room.id for room in query} == {room.id for room in ilike_backend.filter_rooms(Room.query, "VESIT")}
+    assert query.count() > 0
+    suggestions = trie_backend.suggest("vesit")
+    assert suggestions and all("vesit" in tokenize(item["text"]) for item in suggestions)
+
+
+def test_substring_inside_a_word_falls_back_to_ilike(backends):
+    trie_backend, ilike_backend, Room = backends
+    query = trie_backend.filter_rooms(Room.query, "ngineering")
+
+    assert "LIKE" in sql(query).upper()
+    assert query.count() == ilike_backend.filter_rooms(Room.query, "ngineering").count() > 0
+    assert trie_backend.suggest("ngineering") == ilike_backend.suggest("ngineering")
+
+
+def test_broad_prefix_falls_back_to_ilike(backends, monkeypatch):
+    trie_backend, _, Room = backends
+    monkeypatch.setattr(search_backend, "TRIE_MAX_IDS", 2)
+    assert len(trie_backend.matching_ids("v")) > 2
+
+    compiled = sql(trie_backend.filter_rooms(Room.query, "v"))
+    assert "LIKE" in compiled.upper() and " IN " not in compiled
+
+
+def test_suggestions_bind_at_most_the_candidate_rows(backends, monkeypatch):
+    trie_backend, _, _ = backends
+    monkeypatch.setattr(search_backend, "SUGGESTION_CANDIDATES", 3)
+    statements = []
+    monkeypatch.setattr(trie_backend.db.session, "execute",
+                        lambda statement: statements.append(statement) or [])
+    trie_backend.suggest("v")
+    (bound,) = statements[0].compile().params.values()
+    assert len(bound) == 3
+
+
+def test_empty_query_leaves_rooms_unfiltered(backends):
+    trie_backend, _, Room = backends
+    assert trie_backend.filter_rooms(Room.query, "  ") is not None
+    assert trie_backend.matching_ids("!!") is None
+    assert trie_backend.suggest("") == []
+
+
+def test_tsquery_text():
+    assert PostgresSearchBackend.tsquery_text("Andheri PG") == "andheri:* & pg:*"
+    assert PostgresSearchBackend.tsquery_text("it's (vjti)") == "it:* & s:* & vjti:*"
+    assert PostgresSearchBackend.tsquery_text("!!") is None
+
+
+def test_postgres_filter_and_rank_sql(app_module):
+    A = app_module
+    backend = PostgresSearchBackend(A.db, A.Room)
+    with A.app.app_context():
+        query = backend.filter_rooms(A.Room.query, "andheri pg").order_by(backend.rank("andheri pg"))
+        compiled = query.statement.compile(dialect=postgresql.dialect())
+
+        assert "rooms.search_vector @@ to_tsquery(%(to_tsquery_1)s::REGCONFIG, %(to_tsquery_2)s::VARCHAR)" in str(compiled)
+        assert "ts_rank(rooms.search_vector, to_tsquery(" in str(compiled)
+        assert str(compiled).rstrip().endswith("DESC")
+        assert {"simple", "andheri:* & pg:*"} <= set(compiled.params.values())
+        assert backend.filter_rooms(A.Room.query, "!!") is not None
+        assert backend.rank("!!") is None
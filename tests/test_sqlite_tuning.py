@@ -0,0 +1,78 @@
+"""serialized_write: takes the SQLite write lock with BEGIN IMMEDIATE and rolls back on exception."""
+import sqlite3
+
+import pytest
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.orm import Session
+
+from utils.sqlite_tuning import apply_pragmas, serialized_write
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'wallet.db'}")
+    event.listen(engine, "connect", lambda dbapi_connection, _: apply_pragmas(dbapi_connection))
+    with engine.begin() as connection:
+        connection.exec_driver_sql("CREATE TABLE wallet (id INTEGER PRIMARY KEY, balance INTEGER)")
+        connection.exec_driver_sql("INSERT INTO wallet VALUES (1, 100)")
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    engine.statements = statements
+    yield engine
+    engine.dispose()
+
+
+def other_writer(engine):
+    """A second connection that fails at once instead of waiting for the lock."""
+    connection = sqlite3.connect(engine.url.database, timeout=0)
+    connection.execute("PRAGMA busy_timeout=0")
+    return connection
+
+
+def test_block_holds_the_write_lock_from_the_start(engine):
+    with Session(engine) as session:
+        with serialized_write(session):
+            assert engine.statements[0] == "BEGIN IMMEDIATE"
+            balance = session.execute(text("SELECT balance FROM wallet WHERE id = 1")).scalar()
+
+            # Even before this block writes, nobody else can
+            writer = other_writer(engine)
+            with pytest.raises(sqlite3.OperationalError, match="locked"):
+                writer.execute("UPDATE wallet SET balance = 0")
+            writer.close()
+
+            session.execute(text("UPDATE wallet SET balance = :b WHERE id = 1"), {"b": balance - 30})
+            session.commit()
+
+    with engine.connect() as connection:
+        assert connection.execute(text("SELECT balance FROM wallet")).scalar() == 70
+
+
+def test_exception_rolls_back_and_releases_the_lock(engine):
+    with Session(engine) as session:
+        with pytest.raises(RuntimeError):
+            with serialized_write(session):
+                session.execute(text("UPDATE wallet SET balance = 0 WHERE id = 1"))
+                raise RuntimeError("insufficient seats")
+        assert not session.in_transaction()
+
+    writer = other_writer(engine)
+    assert writer.execute("SELECT balance FROM wallet").fetchone() == (100,)
+    writer.execute("UPDATE wallet SET balance = 90")
+    writer.commit()
+    writer.close()
+
+
+def test_works_as_a_view_decorator(engine):
+    session = Session(engine)
+
+    @serialized_write(session)
+    def book():
+        session.execute(text("UPDATE wallet SET balance = balance - 10"))
+        session.commit()
+
+    book()
+    book()
+    assert engine.statements.count("BEGIN IMMEDIATE") == 2
+    assert session.execute(text("SELECT balance FROM wallet")).scalar() == 80
+    session.close()
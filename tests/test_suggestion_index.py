@@ -0,0 +1,76 @@
+"""Suggestion ranking: prefix, then word start, then substring; heavier entries first within each."""
+import threading
+
+from utils.suggestion_index import SuggestionIndex
+
+ROWS = [
+    (1, "Vivekanand Education Society", "Chembur", "Vivekanand Boys PG"),
+    (2, "Sardar Patel Institute", "Andheri West", "Patel Nagar Rooms"),
+    (3, "Sardar Patel Institute", "Andheri East", "Compatible Flat"),
+    (4, "VJTI", "Andheri West", "Andheri Studio"),
+    (5, "Sardar Patel Institute", "Andheri West", None),
+]
+
+
+def build(rows=ROWS, **kwargs):
+    index = SuggestionIndex(**kwargs)
+    index.set_loader(lambda: list(rows))
+    assert index.rebuild() == len(rows)
+    return index
+
+
+def texts(results, kind):
+    return [r["text"] for r in results if r["type"] == kind]
+
+
+def test_prefix_then_word_start_then_substring():
+    results = build().lookup("pat")
+    # "Patel Nagar Rooms" is a prefix match; "Compatible Flat" only contains "pat"
+    assert texts(results, "Room") == ["Patel Nagar Rooms", "Compatible Flat"]
+    assert texts(results, "College") == ["Sardar Patel Institute"]
+    assert texts(results, "Location") == []
+
+
+def test_heavier_entries_rank_first_within_a_group():
+    results = build().lookup("ANDHERI ")
+    # Three listings in Andheri West, one in Andheri East
+    assert texts(results, "Location") == ["Andheri West", "Andheri East"]
+    assert texts(results, "Room") == ["Andheri Studio"]
+
+
+def test_per_type_limit_and_empty_query():
+    index = build()
+    assert len(texts(index.lookup("a", per_type=1), "Location")) == 1
+    assert index.lookup("   ") == []
+
+
+def test_add_and_remove_room_update_weights():
+    index = build()
+    index.add_room(6, "VJTI", "Andheri East", "Sea View")
+    index.add_room(7, "VJTI", "Andheri East", "Sea View Annexe")
+    index.add_room(8, "VJTI", "Andheri East", None)
+    assert texts(index.lookup("andheri"), "Location") == ["Andheri East", "Andheri West"]
+
+    for room_id in (6, 7, 8):
+        index.remove_room(room_id)
+    assert texts(index.lookup("andheri"), "Location") == ["Andheri West", "Andheri East"]
+    assert index.lookup("sea") == []
+
+    # Editing a listing replaces its old values
+    index.add_room(4, "VJTI", "Dadar", "Dadar Studio")
+    assert texts(index.lookup("andheri"), "Room") == []
+    assert index.stats()["rooms"] == len(ROWS)
+
+
+def test_stale_index_reloads_in_the_background():
+    rows = list(ROWS)
+    index = build(rows, refresh_seconds=0)
+    rows.append((9, "VJTI", "Matunga", "Matunga Hostel"))
+
+    # The lookup that notices staleness starts the reload and does not wait for it
+    index.lookup("matunga")
+    for thread in threading.enumerate():
+        if thread.name == "suggestion-index-refresh":
+            thread.join()
+    index.refresh_seconds = 60
+    assert texts(index.lookup("matunga"), "Location") == ["Matunga"]
@@ -0,0 +1,147 @@
+"""TokenVerifier with locally signed tokens: claim checks, algorithms, JWKS refresh and the claims cache."""
+import datetime
+import json
+import time
+from types import SimpleNamespace
+
+import jwt
+import pytest
+from cryptography.hazmat.primitives.asymmetric import ec
+from jwt.algorithms import ECAlgorithm
+
+from utils import token_verifier as tv
+from utils.token_verifier import InvalidToken, TokenVerifier
+
+SECRET = "test-secret-that-is-long-enough-for-hs256"
+JWKS_URL = "https://project.supabase.co/auth/v1/.well-known/jwks.json"
+
+
+def claims(**overrides):
+    values = {"sub": "user-1", "aud": "authenticated", "email": "a@test.local", "exp": int(time.time()) + 600}
+    values.update(overrides)
+    return {key: value for key, value in values.items() if value is not None}
+
+
+def hs256(**overrides):
+    return jwt.encode(claims(**overrides), SECRET, algorithm="HS256")
+
+
+@pytest.fixture
+def verifier():
+    return TokenVerifier(JWKS_URL, secret=SECRET, name="test_token")
+
+
+class FakeJWKS:
+    """Stands in for http_client: serves a JWKS document and counts fetches."""
+
+    def __init__(self, keys):
+        self.keys = keys
+        self.fetches = 0
+
+    def request(self, service, method, url, **kwargs):
+        self.fetches += 1
+        jwks = self
+
+        class Response:
+            def raise_for_status(self):
+                pass
+
+            def json(self):
+                return {"keys": jwks.keys}
+
+        return Response()
+
+
+def es256_key(kid):
+    private = ec.generate_private_key(ec.SECP256R1())
+    jwk = json.loads(ECAlgorithm.to_jwk(private.public_key()))
+    jwk.update(kid=kid, alg="ES256", use="sig")
+    return private, jwk
+
+
+def test_valid_token_returns_claims(verifier):
+    assert verifier.verify(hs256())["sub"] == "user-1"
+
+
+def test_expired_token_is_rejected(verifier):
+    with pytest.raises(InvalidToken):
+        verifier.verify(hs256(exp=int(time.time()) - tv.TOKEN_LEEWAY - 60))
+
+
+def test_wrong_audience_is_rejected(verifier):
+    with pytest.raises(InvalidToken):
+        verifier.verify(hs256(aud="anon"))
+
+
+def test_missing_sub_is_rejected(verifier):
+    with pytest.raises(InvalidToken):
+        verifier.verify(hs256(sub=None))
+
+
+def test_alg_none_is_rejected(verifier):
+    token = jwt.encode(claims(), None, algorithm="none")
+    with pytest.raises(InvalidToken):
+        verifier.verify(token)
+
+
+def test_hs512_is_rejected(verifier):
+    token = jwt.encode(claims(), SECRET, algorithm="HS512")
+    with pytest.raises(InvalidToken):
+        verifier.verify(token)
+
+
+def test_hs256_without_secret_falls_back_to_remote():
+    verifier = TokenVerifier(JWKS_URL, secret="", name="test_token_no_secret")
+    assert verifier.verify(hs256()) is None
+
+
+def test_unknown_kid_refetches_jwks_at_most_once_per_min_refresh(monkeypatch):
+    old_private, old_jwk = es256_key("old")
+    new_private, new_jwk = es256_key("new")
+    jwks = FakeJWKS([old_jwk])
+    monkeypatch.setattr(tv, "http_client", jwks)
+    verifier = TokenVerifier(JWKS_URL, name="test_token_jwks")
+
+    assert verifier.verify(jwt.encode(claims(), old_private, algorithm="ES256", headers={"kid": "old"}))
+    assert jwks.fetches == 1
+
+    # Key rotated: the first unknown kid inside JWKS_MIN_REFRESH is not fetched again
+    jwks.keys = [old_jwk, new_jwk]
+    rotated = jwt.encode(claims(), new_private, algorithm="ES256", headers={"kid": "new"})
+    assert verifier.verify(rotated) is None
+    assert verifier.verify(jwt.encode(claims(sub="user-2"), new_private, algorithm="ES256",
+                                      headers={"kid": "new"})) is None
+    assert jwks.fetches == 1
+
+    # Once JWKS_MIN_REFRESH has passed, one fetch picks up the new key
+    verifier._keys_fetched_at -= tv.JWKS_MIN_REFRESH + 1
+    assert verifier.verify(rotated)["sub"] == "user-1"
+    assert verifier.verify(jwt.encode(claims(sub="user-3"), new_private, algorithm="ES256",
+                                      headers={"kid": "new"}))["sub"] == "user-3"
+    assert jwks.fetches == 2
+
+
+def test_cached_claims_are_not_used_after_exp(verifier, monkeypatch):
+    token = hs256(exp=int(time.time()) + 5)
+    assert verifier.verify(token)
+    assert verifier.verify(token)
+    assert (verifier.hits, verifier.misses) == (1, 1)
+
+    # Past exp + leeway the cache entry is dropped and the token decoded (and rejected) again
+    later = time.time() + 5 + tv.TOKEN_LEEWAY + 1
+    monkeypatch.setattr(tv, "time", SimpleNamespace(time=lambda: later, monotonic=time.monotonic))
+    monkeypatch.setattr(jwt.api_jwt, "datetime", _frozen_datetime(later))
+    with pytest.raises(InvalidToken):
+        verifier.verify(token)
+    assert (verifier.hits, verifier.misses) == (1, 2)
+
+
+def _frozen_datetime(timestamp):
+    """datetime for PyJWT's own expiry check, stopped at `timestamp`."""
+
+    class FrozenDatetime(datetime.datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return datetime.datetime.fromtimestamp(timestamp, tz)
+
+    return FrozenDatetime
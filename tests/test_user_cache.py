@@ -0,0 +1,71 @@
+"""UserCache: invalidation at commit, so load_user never serves a replaced row."""
+import threading
+
+import pytest
+
+
+@pytest.fixture
+def student(app_module):
+    A = app_module
+    with A.app.app_context():
+        student = A.Student(email="cached@test.local", name="Before", college="VJTI")
+        student.set_password("password")
+        A.db.session.add(student)
+        A.db.session.commit()
+        yield student
+        A.db.session.delete(A.db.session.get(A.Student, student.id))
+        A.db.session.commit()
+        A.db.session.remove()
+
+
+def load_name(app_module, student_id):
+    """load_user() as a fresh request would run it."""
+    with app_module.app.app_context():
+        try:
+            return app_module.load_user(f"student:{student_id}").name
+        finally:
+            app_module.db.session.remove()
+
+
+def test_update_is_seen_by_next_load_user(app_module, student):
+    A = app_module
+    assert load_name(A, student.id) == "Before"
+    assert load_name(A, student.id) == "Before"  # served from the cache
+
+    student.name = "After"
+    A.db.session.commit()
+
+    assert load_name(A, student.id) == "After"
+
+
+def test_load_between_flush_and_commit_is_not_kept(app_module, student):
+    A = app_module
+    assert load_name(A, student.id) == "Before"
+
+    student.name = "After"
+    A.db.session.flush()
+    # Another request in this process loads the user before the commit: the old row is cached again
+    seen = []
+    other = threading.Thread(target=lambda: seen.append(load_name(A, student.id)))
+    A.user_cache.clear()
+    other.start()
+    other.join()
+    assert seen == ["Before"]
+
+    A.db.session.commit()
+    assert load_name(A, student.id) == "After"
+
+
+def test_delete_drops_cached_user(app_module, student):
+    A = app_module
+    assert load_name(A, student.id) == "Before"
+    ghost = A.Student(email="ghost@test.local", name="Ghost", college="VJTI")
+    ghost.set_password("password")
+    A.db.session.add(ghost)
+    A.db.session.commit()
+    assert load_name(A, ghost.id) == "Ghost"
+
+    A.db.session.delete(ghost)
+    A.db.session.commit()
+    with A.app.app_context():
+        assert A.load_user(f"student:{ghost.id}") is None
@@ -0,0 +1,102 @@
+"""VectorIndex: sparse rows, persistence round-trip, fingerprint directories and top-k search."""
+import os
+
+import numpy as np
+import pytest
+
+from agents.vector_index import VectorIndex
+
+FAQS = [
+    ("deposit", "Is the security deposit refundable when I move out?"),
+    ("wifi", "Is wifi included in the monthly rent?"),
+    ("food", "Do PG rooms include breakfast and dinner?"),
+    ("visitors", "Can friends and family visit in the evening?"),
+]
+ROOMS = [
+    (1, "Sunrise PG near VJTI Matunga with wifi and meals"),
+    (2, "Girls hostel in Andheri West close to the station"),
+]
+
+
+def make_index(directory, faqs=FAQS):
+    index = VectorIndex(str(directory), dim=512, ttl=3600)
+    index.add_source("faq", lambda: list(faqs))
+    index.add_source("room", lambda: list(ROOMS))
+    index.refresh()
+    return index
+
+
+def test_rows_are_sparse_and_normalized(tmp_path):
+    index = make_index(tmp_path)
+    matrix = index._state[0]
+
+    assert matrix.shape == (len(FAQS) + len(ROOMS), 512)
+    # Tens of non-zeros per row, not dim
+    assert len(matrix.data) < 100 * matrix.shape[0]
+    for row in range(matrix.shape[0]):
+        weights = np.asarray(matrix.data[matrix.indptr[row]:matrix.indptr[row + 1]])
+        assert np.isclose(np.linalg.norm(weights), 1.0)
+
+
+def test_top_k_search(tmp_path):
+    index = make_index(tmp_path)
+
+    results = index.search("is the deposit refundable", k=2, kind="faq")
+    assert [doc_id for _, _, doc_id in results][0] == "deposit"
+    assert len(results) == 2 and results[0][0] > results[1][0]
+    assert all(kind == "faq" for _, kind, _ in results)
+
+    rooms = index.search("hostel in andheri", k=5, kind="room", min_score=0.1)
+    assert [doc_id for _, _, doc_id in rooms] == [2]
+    assert index.search("anything", kind="unknown") == []
+
+
+def test_persisted_index_is_loaded_not_rebuilt(tmp_path, monkeypatch):
+    built = make_index(tmp_path)
+    expected = built.search("wifi in the rent", k=3)
+
+    monkeypatch.setattr(VectorIndex, "_build", lambda *args: pytest.fail("index rebuilt"))
+    loaded = make_index(tmp_path)
+
+    assert loaded.search("wifi in the rent", k=3) == expected
+    assert isinstance(loaded._state[0].data, np.memmap)
+
+
+def test_one_directory_per_document_set(tmp_path):
+    first = make_index(tmp_path)
+    first_dir = first._state[5]
+    assert os.listdir(tmp_path) == [first_dir]
+    assert sorted(os.listdir(tmp_path / first_dir)) == ["data.npy", "docs.json", "idf.npy",
+                                                         "indices.npy", "indptr.npy"]
+
+    # Same documents: the same directory is reused
+    assert make_index(tmp_path)._state[5] == first_dir
+
+    # Changed documents: a new directory replaces the old one
+    changed = make_index(tmp_path, FAQS + [("laundry", "Is there a washing machine?")])
+    assert changed._state[5] != first_dir
+    assert os.listdir(tmp_path) == [changed._state[5]]
+    assert changed.search("washing machine", k=1)[0][2] == "laundry"
+
+
+def test_inconsistent_files_are_rebuilt(tmp_path):
+    index = make_index(tmp_path)
+    folder = tmp_path / index._state[5]
+    np.save(folder / "indptr.npy", np.array([0, 1], dtype=np.int64))
+
+    rebuilt = []
+    original = VectorIndex._build
+
+    class Tracking(VectorIndex):
+        def _build(self, docs, fingerprint):
+            rebuilt.append(fingerprint)
+            return original(self, docs, fingerprint)
+
+    tracked = Tracking(str(tmp_path), dim=512, ttl=3600)
+    tracked.add_source("faq", lambda: list(FAQS))
+    tracked.add_source("room", lambda: list(ROOMS))
+    tracked.refresh()
+    assert rebuilt == [index._state[5]]
+
+    # The damaged copy was replaced, so the next process loads it again
+    assert len(np.load(folder / "indptr.npy")) == len(FAQS) + len(ROOMS) + 1
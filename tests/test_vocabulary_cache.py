@@ -0,0 +1,41 @@
+"""Location matcher: whole-word matches, offsets into the original text, longest first."""
+from utils.vocabulary_cache import AhoCorasick, VocabularyCache
+
+
+def spans(patterns, text):
+    return [(text[start:end], pattern) for start, end, pattern in AhoCorasick(patterns).find_all(text)]
+
+
+def test_matches_only_on_word_boundaries():
+    assert spans(["Andheri"], "pg in andheri?") == [("andheri", "Andheri")]
+    assert spans(["Andheri"], "andherix flats") == []
+    assert spans(["Andheri"], "xandheri flats") == []
+    assert spans(["Andheri"], "Andheri") == [("Andheri", "Andheri")]
+
+
+def test_overlapping_and_multi_word_patterns():
+    text = "room near ANDHERI WEST station"
+    assert spans(["Andheri", "Andheri West", "West"], text) == [
+        ("ANDHERI", "Andheri"),
+        ("ANDHERI WEST", "Andheri West"),
+        ("WEST", "West"),
+    ]
+    assert spans(["Andheri West"], "andheri westend") == []
+
+
+def test_offsets_index_the_original_text_when_lowering_changes_length():
+    # "İ".lower() is two characters, which shifts every later offset in the lowered text
+    text = "İİ near Vile Parle"
+    matches = AhoCorasick(["Vile Parle", "İstanbul"]).find_all(text)
+    assert [(text[start:end], pattern) for start, end, pattern in matches] == [("Vile Parle", "Vile Parle")]
+
+    text = "PG in İstanbul"
+    assert spans(["İstanbul"], text) == [("İstanbul", "İstanbul")]
+
+
+def test_find_locations_returns_distinct_names_longest_first():
+    cache = VocabularyCache(ttl=60)
+    cache.set_loader(lambda: (["VJTI"], ["Andheri", "Andheri West", "Dadar", None]))
+    message = "andheri west or dadar, anywhere in Andheri really"
+    assert cache.find_locations(message) == ["Andheri West", "Andheri", "Dadar"]
+    assert cache.find_locations("nothing known here") == []
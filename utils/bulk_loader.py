@@ -0,0 +1,262 @@
+"""
+Bulk Loader for Roomies Database
+
+Set-based inserts for imports and seeding:
+- JSON / CSV sources read into plain record dicts
+- Dedupe by natural key in memory against keys prefetched in one query
+- Batched executemany `INSERT`s on every backend; SQLAlchemy rewrites them
+  into multi-row `VALUES (...), (...)` with one cached compiled statement
+- `COPY ... FROM STDIN` on PostgreSQL for large loads
+
+Records are plain dicts keyed by column name. Python-side column defaults
+(timestamps, role, counters) are filled in here because COPY bypasses them
+and every row in a batch must carry the same keys.
+
+Usage:
+    records = read_records("data/rooms.csv")
+    inserted, skipped = load_records(db.session, Room, records, ("title", "location"))
+    db.session.commit()
+"""
+
+import csv
+import io
+import json
+import os
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import Table, select
+
+# Rows handed to the driver per execute call
+DEFAULT_BATCH_SIZE = 1000
+
+# Token written for NULL values in the COPY stream
+COPY_NULL = r"\N"
+
+
+def _table_of(target) -> Table:
+    """Accept either a model class or a Table."""
+    return getattr(target, "__table__", target)
+
+
+def fill_defaults(target, records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Give every record the same keys, applying Python-side column defaults.
+
+    Callable defaults (e.g. `datetime.utcnow`) are evaluated once per call,
+    so a whole batch shares the same timestamp.
+
+    Args:
+        target: Model class or Table
+        records: Row dicts, modified in place
+
+    Returns:
+        The same list of records
+    """
+    table = _table_of(target)
+    defaults = {}
+    for column in table.columns:
+        default = column.default
+        if default is None:
+            continue
+        if default.is_callable:
+            defaults[column.name] = default.arg(None)
+        elif default.is_scalar:
+            defaults[column.name] = default.arg
+
+    keys = set(defaults)
+    for record in records:
+        keys.update(record)
+
+    for record in records:
+        for key in keys:
+            if record.get(key) is None and key in defaults:
+                record[key] = defaults[key]
+            else:
+                record.setdefault(key, None)
+    return records
+
+
+def _batches(records: List[Dict[str, Any]], size: int) -> Iterable[List[Dict[str, Any]]]:
+    for start in range(0, len(records), size):
+        yield records[start:start + size]
+
+
+def copy_from_stdin(session, target, records: List[Dict[str, Any]]) -> int:
+    """
+    Load records with PostgreSQL `COPY ... FROM STDIN` (psycopg2).
+
+    Runs on the session's current connection, so it joins the caller's
+    transaction and is committed or rolled back with it.
+
+    Args:
+        session: SQLAlchemy session bound to PostgreSQL
+        target: Model class or Table
+        records: Row dicts
+
+    Returns:
+        Number of rows copied
+    """
+    if not records:
+        return 0
+
+    table = _table_of(target)
+    fill_defaults(table, records)
+    columns = list(records[0].keys())
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for record in records:
+        writer.writerow([COPY_NULL if record[c] is None else record[c] for c in columns])
+    buffer.seek(0)
+
+    column_list = ", ".join(f'"{c}"' for c in columns)
+    sql = f"COPY \"{table.name}\" ({column_list}) FROM STDIN WITH (FORMAT csv, NULL '{COPY_NULL}')"
+
+    dbapi_connection = session.connection().connection.dbapi_connection
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.copy_expert(sql, buffer)
+    finally:
+        cursor.close()
+    return len(records)
+
+
+def bulk_insert(
+    session,
+    target,
+    records: List[Dict[str, Any]],
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    use_copy: Optional[bool] = None,
+) -> int:
+    """
+    Insert many rows with as few round trips as possible.
+
+    Does not commit; the caller owns the transaction.
+
+    Args:
+        session: SQLAlchemy session
+        target: Model class or Table
+        records: Row dicts
+        batch_size: Rows per execute call
+        use_copy: Force COPY on/off. Defaults to COPY on PostgreSQL.
+
+    Returns:
+        Number of rows inserted
+    """
+    if not records:
+        return 0
+
+    table = _table_of(target)
+    dialect = session.get_bind().dialect.name
+
+    if use_copy is None:
+        use_copy = dialect == "postgresql"
+    if use_copy and dialect == "postgresql":
+        return copy_from_stdin(session, table, records)
+
+    fill_defaults(table, records)
+    statement = table.insert()
+    for batch in _batches(records, batch_size):
+        session.execute(statement, batch)
+    return len(records)
+
+
+def read_json(path: str) -> List[Dict[str, Any]]:
+    """Read a JSON array of objects."""
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def read_csv(path: str) -> List[Dict[str, Any]]:
+    """Read a CSV file with a header row. Values stay strings; empty cells become None."""
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        return [
+            {key: (value if value != "" else None) for key, value in row.items()}
+            for row in csv.DictReader(f)
+        ]
+
+
+def read_records(path: str) -> List[Dict[str, Any]]:
+    """Read records from a .json or .csv file based on its extension."""
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".json":
+        return read_json(path)
+    if extension == ".csv":
+        return read_csv(path)
+    raise ValueError(f"Unsupported source format: {extension}")
+
+
+def fetch_existing_keys(session, target, key_fields: Sequence[str]) -> Dict[Tuple, Any]:
+    """
+    Map natural key -> primary key for every row already in the table.
+
+    One column-only query, so it stays cheap even for large tables.
+
+    Args:
+        session: SQLAlchemy session
+        target: Model class or Table
+        key_fields: Column names forming the natural key
+
+    Returns:
+        Dict of key tuple to primary key value
+    """
+    table = _table_of(target)
+    pk = list(table.primary_key.columns)[0]
+    columns = [table.c[name] for name in key_fields]
+    return {tuple(row[1:]): row[0] for row in session.execute(select(pk, *columns))}
+
+
+def dedupe(records: Iterable[Dict[str, Any]], key_fields: Sequence[str],
+           existing_keys: Iterable[Tuple] = ()) -> Tuple[List[Dict[str, Any]], int]:
+    """
+    Drop records whose natural key is already present or repeated.
+
+    Args:
+        records: Row dicts
+        key_fields: Column names forming the natural key
+        existing_keys: Keys already stored in the database
+
+    Returns:
+        Tuple of (unique new records, number skipped)
+    """
+    seen = set(existing_keys)
+    unique = []
+    skipped = 0
+    for record in records:
+        key = tuple(record.get(name) for name in key_fields)
+        if key in seen:
+            skipped += 1
+            continue
+        seen.add(key)
+        unique.append(record)
+    return unique, skipped
+
+
+def load_records(
+    session,
+    target,
+    records: Iterable[Dict[str, Any]],
+    key_fields: Sequence[str],
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    use_copy: Optional[bool] = None,
+) -> Tuple[int, int]:
+    """
+    Insert records that are not already in the table, deduped by natural key.
+
+    Does not commit; the caller owns the transaction.
+
+    Args:
+        session: SQLAlchemy session
+        target: Model class or Table
+        records: Row dicts
+        key_fields: Column names forming the natural key
+        batch_size: Rows per execute call
+        use_copy: Force COPY on/off. Defaults to COPY on PostgreSQL.
+
+    Returns:
+        Tuple of (inserted, skipped)
+    """
+    existing = fetch_existing_keys(session, target, key_fields)
+    unique, skipped = dedupe(records, key_fields, existing)
+    inserted = bulk_insert(session, target, unique, batch_size=batch_size, use_copy=use_copy)
+    return inserted, skipped
@@ -0,0 +1,136 @@
+"""
+Spreadsheet Import Validation for Roomies Admin Panel
+
+Turns an uploaded sheet (pandas DataFrame) into clean insert records using
+vectorized column operations instead of `iterrows()`. Every rejected row is
+reported with its spreadsheet row number so admins can fix and re-upload.
+
+All functions return a tuple of (valid DataFrame, list of error strings).
+"""
+
+from typing import List, Tuple
+
+import pandas as pd
+
+# Spreadsheet row of DataFrame index 0 (row 1 is the header)
+FIRST_DATA_ROW = 2
+
+TRUE_STRINGS = {"true", "1", "yes", "y", "t"}
+
+
+def _text(df: pd.DataFrame, column: str, default: str = "") -> pd.Series:
+    """String column with NaN/'nan' mapped to `default` and whitespace trimmed."""
+    if column not in df.columns:
+        return pd.Series(default, index=df.index, dtype=object)
+    series = df[column].astype(str).str.strip()
+    missing = df[column].isna() | series.eq("") | series.str.lower().eq("nan")
+    return series.mask(missing, default)
+
+
+def _flag(df: pd.DataFrame, column: str) -> pd.Series:
+    """Boolean column that understands True/'yes'/'1' style spreadsheet values."""
+    if column not in df.columns:
+        return pd.Series(False, index=df.index)
+    return df[column].astype(str).str.strip().str.lower().isin(TRUE_STRINGS)
+
+
+def _number(df: pd.DataFrame, column: str) -> pd.Series:
+    """Numeric column with unparseable values as NaN."""
+    if column not in df.columns:
+        return pd.Series(float("nan"), index=df.index)
+    return pd.to_numeric(df[column], errors="coerce")
+
+
+def _collect_errors(errors: list, mask: pd.Series, message: str) -> None:
+    for index in mask[mask].index:
+        errors.append((index + FIRST_DATA_ROW, message))
+
+
+def _format_errors(errors: list) -> List[str]:
+    return [f"Row {row}: {message}" for row, message in sorted(errors)]
+
+
+def prepare_users(df: pd.DataFrame, existing_emails: set, extra_text: dict = None,
+                  extra_flags: tuple = ()) -> Tuple[pd.DataFrame, List[str]]:
+    """
+    Validate owner/student rows keyed by email.
+
+    Args:
+        df: Raw sheet
+        existing_emails: Lower-cased emails already in the database
+        extra_text: {column: default} text columns to carry over
+        extra_flags: Boolean columns to carry over
+
+    Returns:
+        Tuple of (rows to insert, per-row errors)
+    """
+    df = df.reset_index(drop=True)
+    errors = []
+
+    out = pd.DataFrame(index=df.index)
+    out["email"] = _text(df, "email")
+    out["name"] = _text(df, "name", "Unknown")
+    for column, default in (extra_text or {}).items():
+        out[column] = _text(df, column, default)
+    for column in extra_flags:
+        out[column] = _flag(df, column)
+
+    email_key = out["email"].str.lower()
+    missing = out["email"].eq("")
+    malformed = ~missing & ~out["email"].str.contains("@", regex=False)
+    duplicate = ~missing & email_key.duplicated(keep="first")
+
+    _collect_errors(errors, missing, "missing email")
+    _collect_errors(errors, malformed, "invalid email")
+    _collect_errors(errors, duplicate, "duplicate email in file")
+
+    valid = ~(missing | malformed | duplicate) & ~email_key.isin(existing_emails)
+    return out[valid], _format_errors(errors)
+
+
+def prepare_rooms(df: pd.DataFrame, existing_keys: set) -> Tuple[pd.DataFrame, List[str]]:
+    """
+    Validate hostel rows keyed by (title, location).
+
+    Args:
+        df: Raw sheet
+        existing_keys: (title, location) pairs already in the database
+
+    Returns:
+        Tuple of (rows to insert, per-row errors). Rows keep an
+        `owner_email` column for the caller to resolve.
+    """
+    df = df.reset_index(drop=True)
+    errors = []
+
+    out = pd.DataFrame(index=df.index)
+    out["title"] = _text(df, "title", "Untitled")
+    out["location"] = _text(df, "location", "Unknown")
+    out["college_nearby"] = _text(df, "college", "Unknown")
+    out["property_type"] = _text(df, "property_type", "shared")
+    out["owner_email"] = _text(df, "owner_email").str.lower()
+    out["verified"] = _flag(df, "verified")
+
+    price = _number(df, "price") if "price" in df.columns else pd.Series(0.0, index=df.index)
+    capacity = _number(df, "capacity_total").fillna(1)
+    out["price"] = price
+    out["capacity_total"] = capacity
+    out["latitude"] = _number(df, "latitude")
+    out["longitude"] = _number(df, "longitude")
+
+    bad_price = price.isna() | (price < 0)
+    bad_capacity = capacity < 1
+    key = pd.Series(list(zip(out["title"], out["location"])), index=df.index)
+    duplicate = key.duplicated(keep="first")
+
+    _collect_errors(errors, bad_price, "price must be a non-negative number")
+    _collect_errors(errors, bad_capacity, "capacity_total must be at least 1")
+    _collect_errors(errors, duplicate, "duplicate title/location in file")
+
+    valid = ~(bad_price | bad_capacity | duplicate) & ~key.isin(existing_keys)
+    out = out[valid].copy()
+    out["price"] = out["price"].astype(int)
+    out["capacity_total"] = out["capacity_total"].astype(int)
+    out["latitude"] = out["latitude"].astype(object).where(out["latitude"].notna(), None)
+    out["longitude"] = out["longitude"].astype(object).where(out["longitude"].notna(), None)
+    return out, _format_errors(errors)
@@ -0,0 +1,147 @@
+"""
+Database Connection Pool Configuration for Roomies
+
+Builds `SQLALCHEMY_ENGINE_OPTIONS` from environment variables and adds pool
+telemetry: how long requests wait to check out a connection, exported to
+/metrics, with a warning when a checkout is slow (the pool is saturated).
+
+Environment:
+    DB_POOL_SIZE               Persistent connections per worker (default 5; 0 = no pooling)
+    DB_MAX_OVERFLOW            Extra connections allowed under burst (default 10)
+    DB_POOL_TIMEOUT            Seconds to wait for a connection before failing (default 30)
+    DB_POOL_RECYCLE            Seconds before a connection is replaced (default 300)
+    DB_POOL_SLOW_CHECKOUT_MS   Log checkouts slower than this (default 100)
+    DB_PGBOUNCER               1 when connecting through PgBouncer in transaction mode:
+                               disables driver-side prepared statement caches
+    DB_SSLMODE                 libpq sslmode (default "require")
+"""
+
+import logging
+import os
+import threading
+import time
+from typing import Any, Dict
+
+from sqlalchemy.pool import NullPool, QueuePool
+
+from utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+DB_POOL_SIZE = int(os.environ.get("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.environ.get("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.environ.get("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.environ.get("DB_POOL_RECYCLE", "300"))
+SLOW_CHECKOUT_MS = float(os.environ.get("DB_POOL_SLOW_CHECKOUT_MS", "100"))
+PGBOUNCER = os.environ.get("DB_PGBOUNCER", "").lower() in {"1", "true", "yes"}
+DB_SSLMODE = os.environ.get("DB_SSLMODE", "require")
+
+POOL_WAIT = metrics.histogram(
+    "roomies_db_pool_checkout_wait_seconds", "Time spent waiting for a pooled connection.",
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0, 30.0),
+)
+SLOW_CHECKOUTS = metrics.counter(
+    "roomies_db_pool_slow_checkouts_total", "Checkouts slower than DB_POOL_SLOW_CHECKOUT_MS."
+)
+
+
+class TimedQueuePool(QueuePool):
+    """QueuePool that records how long each checkout waited (including connect time)."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._stats_lock = threading.Lock()
+        self.wait_stats = {"checkouts": 0, "total_seconds": 0.0, "max_seconds": 0.0, "slow": 0}
+
+    def _do_get(self):
+        start = time.perf_counter()
+        connection = super()._do_get()
+        waited = time.perf_counter() - start
+
+        POOL_WAIT.observe(value=waited)
+        slow = waited * 1000 >= SLOW_CHECKOUT_MS
+        with self._stats_lock:
+            stats = self.wait_stats
+            stats["checkouts"] += 1
+            stats["total_seconds"] += waited
+            stats["max_seconds"] = max(stats["max_seconds"], waited)
+            stats["slow"] += slow
+        if slow:
+            SLOW_CHECKOUTS.inc()
+            logger.warning(
+                f"Slow DB pool checkout: waited {waited * 1000:.0f}ms "
+                f"({self.checkedout()} checked out, pool size {self.size()}, overflow {self.overflow()})"
+            )
+        return connection
+
+
+def engine_options(database_url: str) -> Dict[str, Any]:
+    """
+    SQLAlchemy engine options for `database_url`, read from the environment.
+
+    Args:
+        database_url: SQLAlchemy database URL
+
+    Returns:
+        Dict suitable for `SQLALCHEMY_ENGINE_OPTIONS`
+    """
+    if database_url.startswith("sqlite"):
+        if ":memory:" in database_url or database_url.rstrip("/") == "sqlite:":
+            return {}
+        # Same pool (and telemetry) as production; SQLite needs no SSL or recycling
+        return {
+            "poolclass": TimedQueuePool,
+            "pool_size": max(DB_POOL_SIZE, 1),
+            "max_overflow": DB_MAX_OVERFLOW,
+            "pool_timeout": DB_POOL_TIMEOUT,
+        }
+    if not database_url.startswith("postgresql"):
+        return {}
+
+    connect_args: Dict[str, Any] = {"sslmode": DB_SSLMODE}
+    options: Dict[str, Any] = {
+        "connect_args": connect_args,
+        "pool_pre_ping": True,  # Check connection health before use
+    }
+
+    if DB_POOL_SIZE <= 0:
+        # Let an external pooler (PgBouncer) own the connections
+        options["poolclass"] = NullPool
+    else:
+        options.update(
+            poolclass=TimedQueuePool,
+            pool_size=DB_POOL_SIZE,
+            max_overflow=DB_MAX_OVERFLOW,
+            pool_timeout=DB_POOL_TIMEOUT,
+            pool_recycle=DB_POOL_RECYCLE,
+        )
+
+    if PGBOUNCER:
+        # Transaction pooling hands each transaction a different server
+        # connection, so server-side prepared statements cannot be reused.
+        # psycopg2 never prepares statements server-side; psycopg 3 does.
+        if "+psycopg" in database_url and "+psycopg2" not in database_url:
+            connect_args["prepare_threshold"] = None
+
+    return options
+
+
+def register_pool_metrics(engine) -> None:
+    """Export pool occupancy for `engine` as gauges on /metrics."""
+    pool = engine.pool
+    if not isinstance(pool, QueuePool):
+        return
+
+    def _occupancy():
+        current = engine.pool
+        return {
+            ("size",): current.size(),
+            ("checked_out",): current.checkedout(),
+            ("overflow",): max(current.overflow(), 0),
+            ("idle",): current.checkedin(),
+        }
+
+    metrics.gauge(
+        "roomies_db_pool_connections", "Connection pool occupancy by state.", ("state",),
+        callback=_occupancy,
+    )
@@ -8,6 +8,8 @@ from email.mime.application import MIMEApplication
 from datetime import datetime
 import logging
 
+from utils.metrics import track_external
+
 logger = logging.getLogger(__name__)
 
 
@@ -52,7 +54,8 @@ class EmailService:
             
             # Send email
             # Use explicit timeout and EHLO/HELO sequence
-            with smtplib.SMTP(self.smtp_host, self.smtp_port, timeout=10) as server:
+            with track_external("smtp"), \
+                    smtplib.SMTP(self.smtp_host, self.smtp_port, timeout=10) as server:
                 server.set_debuglevel(1)  # Enable debug output for logs
                 server.ehlo()  # Identify to server
                 
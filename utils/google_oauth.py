@@ -10,6 +10,8 @@ from typing import Optional, Dict, Any, Tuple
 from urllib.parse import urlencode
 from dotenv import load_dotenv
 
+from utils.http_client import http_client
+
 load_dotenv()
 
 # Google OAuth Configuration
@@ -23,6 +25,11 @@ GOOGLE_TOKEN_URL = "https://oauth2.googleapis.com/token"
 GOOGLE_USERINFO_URL = "https://www.googleapis.com/oauth2/v2/userinfo"
 
 
+def _http(method: str, url: str, **kwargs) -> requests.Response:
+    """Outbound Google API call on the pooled session (timeouts, retries, /metrics)."""
+    return http_client.request("google_oauth", method, url, **kwargs)
+
+
 class GoogleOAuthService:
     """
     Service class for Google OAuth 2.0 authentication.
@@ -102,7 +109,7 @@ class GoogleOAuthService:
                 "grant_type": "authorization_code",
             }
             
-            response = requests.post(GOOGLE_TOKEN_URL, data=data)
+            response = _http("POST", GOOGLE_TOKEN_URL, data=data)
             
             if response.status_code == 200:
                 return True, response.json()
@@ -129,7 +136,7 @@ class GoogleOAuthService:
                 "Authorization": f"Bearer {access_token}"
             }
             
-            response = requests.get(GOOGLE_USERINFO_URL, headers=headers)
+            response = _http("GET", GOOGLE_USERINFO_URL, headers=headers)
             
             if response.status_code == 200:
                 user_data = response.json()
@@ -0,0 +1,63 @@
+"""
+Health Probes for Roomies
+
+Liveness (`/livez`) never touches I/O. Readiness (`/readyz`) runs its
+checks through `CachedCheck`, which keeps the last result for a short TTL
+and lets only one caller refresh it at a time; concurrent probes get the
+previous result instead of queueing on the database. However often the
+load balancer probes, each worker runs at most one `SELECT 1` per TTL.
+
+Usage:
+    database_check = CachedCheck(lambda: db.session.execute(text("SELECT 1")))
+    ok, detail = database_check.result()
+"""
+
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+# Seconds a readiness check result is reused
+READINESS_TTL = float(os.environ.get("READINESS_TTL", "5"))
+
+
+class CachedCheck:
+    """Run a health check at most once per TTL and share the result."""
+
+    def __init__(self, check: Callable[[], Any], ttl: float = READINESS_TTL):
+        self.check = check
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._result: Optional[Tuple[bool, Dict[str, Any]]] = None
+        self._checked_at = 0.0
+
+    def result(self) -> Tuple[bool, Dict[str, Any]]:
+        """
+        Return the cached (ok, detail) pair, refreshing it when stale.
+
+        Returns:
+            Tuple of (ok, detail dict with `age_seconds` and any error)
+        """
+        now = time.monotonic()
+        if self._result is None or now - self._checked_at >= self.ttl:
+            # Only one probe refreshes; the rest reuse the previous result
+            if self._lock.acquire(blocking=self._result is None):
+                try:
+                    if self._result is None or time.monotonic() - self._checked_at >= self.ttl:
+                        self._refresh()
+                finally:
+                    self._lock.release()
+
+        ok, detail = self._result
+        return ok, {**detail, "age_seconds": round(time.monotonic() - self._checked_at, 2)}
+
+    def _refresh(self) -> None:
+        start = time.perf_counter()
+        try:
+            self.check()
+            ok, detail = True, {}
+        except Exception as e:
+            ok, detail = False, {"error": str(e)}
+        detail["latency_ms"] = round((time.perf_counter() - start) * 1000, 2)
+        self._result = (ok, detail)
+        self._checked_at = time.monotonic()
@@ -0,0 +1,125 @@
+"""
+Pooled HTTP sessions for outbound API calls (Supabase, Google OAuth).
+
+Bare `requests.get/post` opens a new TCP + TLS connection per call and
+waits forever if no timeout is passed. Here each upstream service gets one
+`requests.Session` per process with:
+
+- keep-alive connection pooling, at most HTTP_POOL_MAXSIZE connections per
+  host (callers wait for a free one rather than opening more)
+- default (connect, read) timeouts when the caller passes none
+- retries with exponential backoff and jitter: connection failures for
+  any method (the request was never sent), 429/502/503/504 responses for
+  idempotent methods only, so single-use OAuth codes are never replayed;
+  read timeouts are not retried, so a slow upstream costs one read timeout
+- per-service metrics: call latency/errors via track_external and
+  roomies_http_retries_total{service}
+
+Usage:
+    response = http_client.request("supabase", "POST", url, json=payload)
+"""
+
+import os
+import threading
+from typing import Dict
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from utils.metrics import metrics, track_external
+
+# Connections kept per host
+HTTP_POOL_MAXSIZE = int(os.environ.get("HTTP_POOL_MAXSIZE", "10"))
+
+# Default timeouts in seconds (connect, read)
+HTTP_CONNECT_TIMEOUT = float(os.environ.get("HTTP_CONNECT_TIMEOUT", "3.05"))
+HTTP_READ_TIMEOUT = float(os.environ.get("HTTP_READ_TIMEOUT", "10"))
+
+# Retries per call, base backoff and maximum random jitter in seconds
+HTTP_RETRIES = int(os.environ.get("HTTP_RETRIES", "2"))
+HTTP_BACKOFF = float(os.environ.get("HTTP_BACKOFF", "0.2"))
+HTTP_BACKOFF_JITTER = float(os.environ.get("HTTP_BACKOFF_JITTER", "0.2"))
+
+HTTP_RETRIES_TOTAL = metrics.counter(
+    "roomies_http_retries_total", "Outbound HTTP attempts retried, by service.", ("service",)
+)
+
+
+class _CountingRetry(Retry):
+    """Retry policy that counts every retry for its service."""
+
+    def __init__(self, *args, service: str = "", **kwargs):
+        self.service = service
+        super().__init__(*args, **kwargs)
+
+    def new(self, **kwargs):
+        kwargs["service"] = self.service
+        return super().new(**kwargs)
+
+    def increment(self, *args, **kwargs):
+        retry = super().increment(*args, **kwargs)
+        HTTP_RETRIES_TOTAL.inc(self.service)
+        return retry
+
+
+class HTTPClient:
+    """Lazily created pooled session per service (re-created after a fork)."""
+
+    def __init__(self):
+        self._sessions: Dict[str, requests.Session] = {}
+        self._pid = os.getpid()
+        self._lock = threading.Lock()
+
+    def _new_session(self, service: str) -> requests.Session:
+        retry = _CountingRetry(
+            total=HTTP_RETRIES,
+            connect=HTTP_RETRIES,
+            read=0,  # a slow upstream is not retried: worst case stays ~ one read timeout
+            status=HTTP_RETRIES,
+            status_forcelist=(429, 502, 503, 504),
+            backoff_factor=HTTP_BACKOFF,
+            backoff_jitter=HTTP_BACKOFF_JITTER,
+            respect_retry_after_header=True,
+            raise_on_status=False,
+            service=service,
+        )
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=HTTP_POOL_MAXSIZE,
+                              pool_block=True, max_retries=retry)
+        session = requests.Session()
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    def session(self, service: str) -> requests.Session:
+        """The shared session for `service`."""
+        with self._lock:
+            if self._pid != os.getpid():
+                # Never share pooled sockets with a parent process
+                self._sessions.clear()
+                self._pid = os.getpid()
+            session = self._sessions.get(service)
+            if session is None:
+                session = self._sessions[service] = self._new_session(service)
+            return session
+
+    def request(self, service: str, method: str, url: str, **kwargs) -> requests.Response:
+        """
+        Outbound call on the pooled session for `service`, timed for /metrics.
+
+        Args:
+            service: Upstream name (metrics label and pool key)
+            method: HTTP method
+            url: Absolute URL
+            **kwargs: Passed to requests (json, data, headers, timeout, ...)
+
+        Returns:
+            requests.Response
+        """
+        kwargs.setdefault("timeout", (HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT))
+        with track_external(service):
+            return self.session(service).request(method, url, **kwargs)
+
+
+# Singleton instance
+http_client = HTTPClient()
@@ -0,0 +1,272 @@
+"""
+Prometheus-style Metrics for Roomies
+
+A small in-process metrics registry rendered in the Prometheus text
+exposition format at `/metrics`. No client library is required; recording
+a sample is a dict lookup, a bisect and a lock, so it is cheap enough to
+run on every request.
+
+Recorded out of the box by `init_metrics(app)`:
+- per-route request latency histograms and request counters
+- SQL time and statement count per request
+- requests in flight
+- cache hit/miss counters for every cache registered with `register_cache()`
+
+External calls are timed with `track_external()`:
+
+    with track_external("gemini"):
+        response = model.generate_content(prompt)
+"""
+
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Sequence, Tuple
+
+from flask import Response, g, has_request_context, request
+
+from utils.sql_stats import request_sql_totals
+
+# Latency buckets in seconds (requests, SQL, external calls)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Statements-per-request buckets
+QUERY_COUNT_BUCKETS = (1, 2, 5, 10, 20, 50, 100)
+
+# Optional bearer token required to scrape /metrics
+METRICS_TOKEN = os.environ.get("METRICS_TOKEN", "")
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labelnames: Sequence[str], values: Tuple, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(labelnames, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    """Monotonically increasing value per label set, or read from a callback at scrape time."""
+
+    kind = "counter"
+
+    def __init__(self, name, documentation, labelnames=(), callback: Callable[[], Dict[Tuple, float]] = None):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple, float] = {}
+        self._callback = callback
+
+    def inc(self, *labels, amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def render(self) -> List[str]:
+        if self._callback is not None:
+            items = sorted(self._callback().items())
+        else:
+            with self._lock:
+                items = sorted(self._values.items())
+        return self._header() + [
+            f"{self.name}{_format_labels(self.labelnames, labels)} {value}"
+            for labels, value in items
+        ]
+
+
+class Gauge(Counter):
+    """Value that goes up and down."""
+
+    kind = "gauge"
+
+    def dec(self, *labels, amount: float = 1.0) -> None:
+        self.inc(*labels, amount=-amount)
+
+    def set(self, *labels, value: float) -> None:
+        with self._lock:
+            self._values[labels] = value
+
+
+class Histogram(_Metric):
+    """Cumulative bucket counts, sum and count per label set."""
+
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # labels -> [per-bucket counts..., +Inf count, sum]
+        self._values: Dict[Tuple, List[float]] = {}
+
+    def observe(self, *labels, value: float) -> None:
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._values.get(labels)
+            if series is None:
+                series = self._values[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+            series[index] += 1
+            series[-1] += value
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted((labels, list(series)) for labels, series in self._values.items())
+        lines = self._header()
+        for labels, series in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets, series):
+                cumulative += count
+                bucket_labels = _format_labels(self.labelnames, labels, f'le="{bound}"')
+                lines.append(f"{self.name}_bucket{bucket_labels} {cumulative}")
+            cumulative += series[len(self.buckets)]
+            bucket_labels = _format_labels(self.labelnames, labels, 'le="+Inf"')
+            lines.append(f"{self.name}_bucket{bucket_labels} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, labels)} {series[-1]}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, labels)} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """Holds metrics and renders them in registration order."""
+
+    def __init__(self):
+        self._metrics: List[_Metric] = []
+        self._caches: Dict[str, Callable[[], Tuple[float, float]]] = {}
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def counter(self, name, documentation, labelnames=(), callback=None) -> Counter:
+        return self.register(Counter(name, documentation, labelnames, callback))
+
+    def gauge(self, name, documentation, labelnames=(), callback=None) -> Gauge:
+        return self.register(Gauge(name, documentation, labelnames, callback))
+
+    def histogram(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def register_cache(self, name: str, stats: Callable[[], Tuple[float, float]]) -> None:
+        """
+        Expose a cache's hit/miss totals.
+
+        Args:
+            name: Value of the `cache` label
+            stats: Function returning (hits, misses) since process start
+        """
+        self._caches[name] = stats
+
+    def cache_stats(self) -> Dict[str, Tuple[float, float]]:
+        return {name: stats() for name, stats in self._caches.items()}
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+# Singleton registry and the metrics the app records
+metrics = MetricsRegistry()
+
+REQUEST_LATENCY = metrics.histogram(
+    "roomies_http_request_duration_seconds", "Request latency by route.", ("endpoint", "method")
+)
+REQUEST_COUNT = metrics.counter(
+    "roomies_http_requests_total", "Requests served by route and status.", ("endpoint", "method", "status")
+)
+REQUESTS_IN_FLIGHT = metrics.gauge(
+    "roomies_http_requests_in_flight", "Requests currently being served by this worker."
+)
+DB_TIME = metrics.histogram(
+    "roomies_db_time_per_request_seconds", "Time spent in SQL per request.", ("endpoint",)
+)
+DB_QUERIES = metrics.histogram(
+    "roomies_db_queries_per_request", "SQL statements per request.", ("endpoint",), QUERY_COUNT_BUCKETS
+)
+EXTERNAL_LATENCY = metrics.histogram(
+    "roomies_external_call_duration_seconds", "Outbound call latency by service.", ("service",)
+)
+EXTERNAL_TIME = metrics.histogram(
+    "roomies_external_time_per_request_seconds", "Time spent in outbound calls per request.", ("endpoint",)
+)
+EXTERNAL_ERRORS = metrics.counter(
+    "roomies_external_call_errors_total", "Outbound calls that raised, by service.", ("service",)
+)
+CACHE_HITS = metrics.counter(
+    "roomies_cache_hits_total", "Cache hits since process start.", ("cache",),
+    callback=lambda: {(name,): hits for name, (hits, _) in metrics.cache_stats().items()},
+)
+CACHE_MISSES = metrics.counter(
+    "roomies_cache_misses_total", "Cache misses since process start.", ("cache",),
+    callback=lambda: {(name,): misses for name, (_, misses) in metrics.cache_stats().items()},
+)
+
+
+@contextmanager
+def track_external(service: str):
+    """Time an outbound call and count it as an error if it raises."""
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        EXTERNAL_ERRORS.inc(service)
+        raise
+    finally:
+        elapsed = time.perf_counter() - start
+        EXTERNAL_LATENCY.observe(service, value=elapsed)
+        if has_request_context():
+            g._external_seconds = g.get("_external_seconds", 0.0) + elapsed
+
+
+def init_metrics(app) -> None:
+    """Record request metrics and serve them at /metrics."""
+    memo_totals = [0, 0]
+    metrics.register_cache("request_memo", lambda: tuple(memo_totals))
+
+    @app.before_request
+    def _start_request_timer():
+        g._request_started = time.perf_counter()
+        REQUESTS_IN_FLIGHT.inc()
+
+    @app.after_request
+    def _record_request(response):
+        started = g.get("_request_started")
+        if started is not None:
+            endpoint = request.endpoint or "unmatched"
+            REQUEST_LATENCY.observe(endpoint, request.method, value=time.perf_counter() - started)
+            REQUEST_COUNT.inc(endpoint, request.method, str(response.status_code))
+            statements, sql_seconds = request_sql_totals()
+            DB_TIME.observe(endpoint, value=sql_seconds)
+            DB_QUERIES.observe(endpoint, value=statements)
+            if "_external_seconds" in g:
+                EXTERNAL_TIME.observe(endpoint, value=g._external_seconds)
+            memo_totals[0] += g.get("_memo_hits", 0)
+            memo_totals[1] += g.get("_memo_misses", 0)
+        return response
+
+    @app.teardown_request
+    def _end_request(exc):
+        if g.pop("_request_started", None) is not None:
+            REQUESTS_IN_FLIGHT.dec()
+
+    @app.route("/metrics")
+    def metrics_endpoint():
+        """Prometheus scrape endpoint."""
+        if METRICS_TOKEN and request.headers.get("Authorization") != f"Bearer {METRICS_TOKEN}":
+            return Response("Unauthorized\n", status=401, mimetype="text/plain")
+        return Response(metrics.render(), content_type="text/plain; version=0.0.4; charset=utf-8")
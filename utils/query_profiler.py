@@ -0,0 +1,238 @@
+"""
+Per-request SQL Profiler and N+1 Detector for Roomies
+
+Records every SQL statement issued while serving a request (as an observer
+of the shared listeners in utils/sql_stats.py), groups statements by
+shape (literals and bind parameters stripped) and flags shapes that repeat
+within one request - the usual sign of an N+1 loop such as reading
+`booking.student.name` for every booking.
+
+Profiling is active when the app runs in debug mode or `QUERY_PROFILER=1`.
+Recent request profiles are served at `/debug/queries` (404 otherwise).
+
+The profiler also keeps the highest query count seen per endpoint. That
+baseline can be written to JSON and checked later, so a test run can fail
+when an endpoint starts issuing more queries than it used to:
+
+    query_profiler.write_baseline("query_baseline.json")
+    ...
+    regressions = query_profiler.compare_baseline(load_baseline("query_baseline.json"))
+    assert not regressions, regressions
+
+tests/test_query_baseline.py does this for the main endpoints against the
+committed tests/query_baseline.json.
+"""
+
+import json
+import os
+import re
+import sys
+import threading
+from collections import Counter, deque
+from typing import Any, Dict, List, Optional
+
+from flask import g, has_request_context, jsonify, request
+
+from utils import sql_stats
+
+# Record statements outside debug mode too
+PROFILER_ENABLED = os.environ.get("QUERY_PROFILER", "").lower() in {"1", "true", "yes"}
+
+# A statement shape repeated this many times in one request is reported as N+1
+N_PLUS_ONE_THRESHOLD = int(os.environ.get("N_PLUS_ONE_THRESHOLD", "5"))
+
+# Request profiles kept for /debug/queries
+HISTORY_SIZE = int(os.environ.get("QUERY_PROFILER_HISTORY", "50"))
+
+_APP_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Frames skipped when looking for the application call site
+_SKIP_FILES = {os.path.abspath(__file__), os.path.abspath(sql_stats.__file__)}
+
+_PARAM_RE = re.compile(r"%\(\w+\)s|:\w+|\$\d+|\?")
+_STRING_RE = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_RE = re.compile(r"\b\d+(?:\.\d+)?\b")
+_IN_LIST_RE = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_SPACE_RE = re.compile(r"\s+")
+
+
+def statement_shape(statement: str) -> str:
+    """
+    Normalize a SQL statement so repeated lookups compare equal.
+
+    Args:
+        statement: SQL text as sent to the driver
+
+    Returns:
+        Statement with literals/parameters replaced by `?` and IN lists collapsed
+    """
+    shape = _STRING_RE.sub("?", statement)
+    shape = _PARAM_RE.sub("?", shape)
+    shape = _NUMBER_RE.sub("?", shape)
+    shape = _IN_LIST_RE.sub("(?)", shape)
+    return _SPACE_RE.sub(" ", shape).strip()
+
+
+def _call_site() -> Optional[str]:
+    """First stack frame inside the application (not SQLAlchemy, not this module)."""
+    frame = sys._getframe(2)
+    while frame is not None:
+        filename = os.path.abspath(frame.f_code.co_filename)
+        if (filename.startswith(_APP_ROOT) and filename not in _SKIP_FILES
+                and "site-packages" not in filename):
+            return f"{os.path.relpath(filename, _APP_ROOT)}:{frame.f_lineno} in {frame.f_code.co_name}"
+        frame = frame.f_back
+    return None
+
+
+def _profiling() -> bool:
+    return has_request_context() and "_sql_profile" in g
+
+
+def _record_statement(statement: str, elapsed: float) -> None:
+    if _profiling():
+        g._sql_profile.append((statement, elapsed, _call_site()))
+
+
+sql_stats.add_statement_observer(_record_statement)
+
+
+def load_baseline(path: str) -> Dict[str, int]:
+    """Read an endpoint -> query count baseline written by `write_baseline()`."""
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+class QueryProfiler:
+    """Collects per-request statement profiles and per-endpoint query counts."""
+
+    def __init__(self, threshold: int = N_PLUS_ONE_THRESHOLD, history: int = HISTORY_SIZE):
+        self.threshold = threshold
+        self.history = deque(maxlen=history)
+        self.endpoint_counts: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._app = None
+
+    def enabled(self) -> bool:
+        return PROFILER_ENABLED or bool(self._app and self._app.debug)
+
+    def init_app(self, app) -> None:
+        """Register request hooks and the /debug/queries route."""
+        self._app = app
+
+        @app.before_request
+        def _start_profile():
+            if self.enabled():
+                g._sql_profile = []
+
+        @app.after_request
+        def _finish_profile(response):
+            statements = g.pop("_sql_profile", None)
+            if statements is not None:
+                self._record(statements, response.status_code)
+            return response
+
+        @app.route("/debug/queries")
+        def debug_queries():
+            """Recent request profiles, newest first (dev only)."""
+            if not self.enabled():
+                return jsonify({"error": "Not found"}), 404
+            with self._lock:
+                profiles = list(self.history)[::-1]
+                baseline = dict(sorted(self.endpoint_counts.items()))
+            return jsonify({
+                "threshold": self.threshold,
+                "baseline": baseline,
+                "requests": profiles,
+            })
+
+    def _record(self, statements: List[tuple], status_code: int) -> None:
+        statement_shapes = [statement_shape(statement) for statement, _, _ in statements]
+        shapes = Counter(statement_shapes)
+        sites: Dict[str, set] = {}
+        for shape, (_, _, site) in zip(statement_shapes, statements):
+            if shapes[shape] >= self.threshold and site:
+                sites.setdefault(shape, set()).add(site)
+
+        repeated = [
+            {"count": count, "statement": shape, "call_sites": sorted(sites.get(shape, ()))}
+            for shape, count in shapes.most_common()
+            if count >= self.threshold
+        ]
+        endpoint = request.endpoint or request.path
+        profile = {
+            "method": request.method,
+            "path": request.full_path.rstrip("?"),
+            "endpoint": endpoint,
+            "status": status_code,
+            "query_count": len(statements),
+            "sql_ms": round(sum(elapsed for _, elapsed, _ in statements) * 1000, 2),
+            "n_plus_one": repeated,
+            "statements": [
+                {"sql": statement, "ms": round(elapsed * 1000, 3), "call_site": site}
+                for statement, elapsed, site in statements
+            ],
+        }
+
+        with self._lock:
+            self.history.append(profile)
+            if len(statements) > self.endpoint_counts.get(endpoint, -1):
+                self.endpoint_counts[endpoint] = len(statements)
+
+        if repeated and self._app is not None:
+            worst = repeated[0]
+            self._app.logger.warning(
+                f"Possible N+1 in {request.method} {request.path}: statement repeated "
+                f"{worst['count']}x ({', '.join(worst['call_sites']) or 'unknown call site'}): "
+                f"{worst['statement'][:160]}"
+            )
+
+    def last_profile(self) -> Optional[Dict[str, Any]]:
+        """Most recent request profile, or None."""
+        with self._lock:
+            return self.history[-1] if self.history else None
+
+    def reset(self) -> None:
+        """Forget recorded profiles and endpoint counts."""
+        with self._lock:
+            self.history.clear()
+            self.endpoint_counts.clear()
+
+    def write_baseline(self, path: str) -> Dict[str, int]:
+        """
+        Save the highest query count seen per endpoint as JSON.
+
+        Args:
+            path: Output file
+
+        Returns:
+            The baseline that was written
+        """
+        with self._lock:
+            baseline = dict(sorted(self.endpoint_counts.items()))
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(baseline, f, indent=2)
+            f.write("\n")
+        return baseline
+
+    def compare_baseline(self, baseline: Dict[str, int], slack: int = 0) -> Dict[str, Dict[str, int]]:
+        """
+        Endpoints whose recorded query count exceeds the baseline.
+
+        Args:
+            baseline: Endpoint -> allowed query count
+            slack: Extra queries tolerated per endpoint
+
+        Returns:
+            {endpoint: {"baseline": n, "actual": m}} for each regression
+        """
+        with self._lock:
+            counts = dict(self.endpoint_counts)
+        return {
+            endpoint: {"baseline": baseline[endpoint], "actual": actual}
+            for endpoint, actual in sorted(counts.items())
+            if endpoint in baseline and actual > baseline[endpoint] + slack
+        }
+
+
+# Singleton instance
+query_profiler = QueryProfiler()
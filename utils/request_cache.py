@@ -0,0 +1,110 @@
+"""
+Request-scoped Memoization for Roomies
+
+Computed model properties that run a query (e.g. `Owner.active_subscription`)
+are often read several times while serving one request. `request_memo()`
+runs the lookup once per request and returns the stored result afterwards;
+`request_cached_property` does the same for a model property.
+Outside a request (scripts, CLI) the loader simply runs every time.
+
+`init_request_stats(app)` adds per-request visibility: the number of SQL
+statements issued and memo hits/misses are logged for heavy requests and,
+when enabled, returned as `X-Query-Count` / `X-Memo-Hits` headers.
+
+Usage:
+    class Owner(db.Model):
+        @request_cached_property
+        def active_subscription(self):
+            return UserSubscription.query.filter_by(...).first()
+
+    forget_request_memo(("Owner", "active_subscription", owner.id))
+"""
+
+import os
+from functools import wraps
+from typing import Any, Callable, Hashable
+
+from flask import g, has_request_context, request
+
+from utils.sql_stats import request_sql_totals
+
+_MISSING = object()
+
+# Log a warning when a single request issues at least this many statements
+QUERY_COUNT_WARN = int(os.environ.get("QUERY_COUNT_WARN", "30"))
+
+# Return X-Query-Count / X-Memo-Hits headers (always on in debug mode)
+EXPOSE_QUERY_COUNTS = os.environ.get("EXPOSE_QUERY_COUNTS", "").lower() in {"1", "true", "yes"}
+
+
+def request_memo(key: Hashable, loader: Callable[[], Any]) -> Any:
+    """
+    Return `loader()` for `key`, computing it at most once per request.
+
+    Args:
+        key: Hashable cache key
+        loader: Zero-argument function producing the value (may return None)
+
+    Returns:
+        The memoized value
+    """
+    if not has_request_context():
+        return loader()
+
+    memo = g.setdefault("_request_memo", {})
+    value = memo.get(key, _MISSING)
+    if value is _MISSING:
+        g._memo_misses = g.get("_memo_misses", 0) + 1
+        value = loader()
+        memo[key] = value
+    else:
+        g._memo_hits = g.get("_memo_hits", 0) + 1
+    return value
+
+
+def forget_request_memo(key: Hashable) -> None:
+    """Drop a memoized value so the next access reloads it."""
+    if has_request_context():
+        g.get("_request_memo", {}).pop(key, None)
+
+
+def request_cached_property(func: Callable[[Any], Any]) -> property:
+    """
+    Property computed once per request for each model instance.
+
+    The memo key is `(ClassName, property_name, instance.id)`, so two
+    instances of the same row share the cached value.
+    """
+    name = func.__name__
+
+    @wraps(func)
+    def getter(self):
+        return request_memo((type(self).__name__, name, self.id), lambda: func(self))
+
+    return property(getter)
+
+
+def request_query_count() -> int:
+    """SQL statements issued so far in the current request."""
+    return request_sql_totals()[0]
+
+
+def init_request_stats(app) -> None:
+    """Report per-request query counts and memo hit rates."""
+
+    @app.after_request
+    def _report_request_stats(response):
+        queries = request_query_count()
+        hits = g.get("_memo_hits", 0)
+        misses = g.get("_memo_misses", 0)
+
+        if app.debug or EXPOSE_QUERY_COUNTS:
+            response.headers["X-Query-Count"] = str(queries)
+            response.headers["X-Memo-Hits"] = f"{hits}/{hits + misses}"
+
+        if queries >= QUERY_COUNT_WARN:
+            app.logger.warning(
+                f"{request.method} {request.path} issued {queries} queries "
+                f"(memo hits {hits}/{hits + misses})"
+            )
+        return response
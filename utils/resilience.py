@@ -0,0 +1,244 @@
+"""
+Concurrency Limits and Circuit Breakers for Outbound Calls
+
+Slow upstreams (Gemini) used to tie up every worker thread: calls had no
+bound on concurrency and were only abandoned after they failed.
+
+- ConcurrencyLimiter: at most N calls in flight per process; callers wait
+  up to `max_wait` seconds for a slot, then get LimiterFull. Time spent
+  waiting is recorded as a queue-time histogram.
+- CircuitBreaker: after `failure_threshold` consecutive failures the
+  breaker opens and calls fail fast with CircuitOpen for `reset_timeout`
+  seconds; then one trial call is let through (half-open) and its
+  outcome closes or re-opens the breaker.
+
+Usage:
+    with guarded_call(gemini_limiter, gemini_breaker):
+        response = model.generate_content(prompt, request_options={"timeout": 20})
+
+    # From a coroutine (asgi.py); shares the same slots and breaker state
+    async with guarded_call_async(gemini_limiter, gemini_breaker):
+        response = await model.generate_content_async(prompt)
+"""
+
+import asyncio
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from typing import Dict
+
+from utils.metrics import metrics
+
+# How often a coroutine waiting for a slot re-checks the semaphore
+ASYNC_POLL_SECONDS = 0.01
+
+QUEUE_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 5.0)
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+_breakers: Dict[str, "CircuitBreaker"] = {}
+_limiters: Dict[str, "ConcurrencyLimiter"] = {}
+
+LIMITER_QUEUE_TIME = metrics.histogram(
+    "roomies_limiter_queue_seconds", "Time waited for a concurrency slot.", ("name",), QUEUE_BUCKETS
+)
+LIMITER_IN_FLIGHT = metrics.gauge(
+    "roomies_limiter_in_flight", "Calls holding a concurrency slot.", ("name",),
+    callback=lambda: {(name,): limiter.in_flight for name, limiter in _limiters.items()},
+)
+LIMITER_WAITING = metrics.gauge(
+    "roomies_limiter_waiting", "Calls queued for a concurrency slot.", ("name",),
+    callback=lambda: {(name,): limiter.waiting for name, limiter in _limiters.items()},
+)
+CALLS_REJECTED = metrics.counter(
+    "roomies_calls_rejected_total", "Calls refused without reaching the upstream.", ("name", "reason")
+)
+BREAKER_OPEN = metrics.gauge(
+    "roomies_circuit_breaker_open", "1 while a circuit breaker is open or half-open.", ("name",),
+    callback=lambda: {(name,): float(breaker.state != CLOSED) for name, breaker in _breakers.items()},
+)
+
+
+class LimiterFull(Exception):
+    """No concurrency slot became free within the wait limit."""
+
+
+class CircuitOpen(Exception):
+    """The circuit breaker is open; the upstream is not being called."""
+
+
+class ConcurrencyLimiter:
+    """Bounded number of in-flight calls with a bounded wait for a slot."""
+
+    def __init__(self, name: str, max_concurrent: int, max_wait: float):
+        self.name = name
+        self.max_concurrent = max_concurrent
+        self.max_wait = max_wait
+        self._semaphore = threading.BoundedSemaphore(max_concurrent)
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.waiting = 0
+        _limiters[name] = self
+
+    def _queued(self, delta: int) -> None:
+        with self._lock:
+            self.waiting += delta
+
+    def _admitted(self, started: float, acquired: bool) -> None:
+        LIMITER_QUEUE_TIME.observe(self.name, value=time.perf_counter() - started)
+        if not acquired:
+            CALLS_REJECTED.inc(self.name, "queue_timeout")
+            raise LimiterFull(f"{self.name}: no slot free within {self.max_wait}s")
+        with self._lock:
+            self.in_flight += 1
+
+    def _release(self) -> None:
+        with self._lock:
+            self.in_flight -= 1
+        self._semaphore.release()
+
+    @contextmanager
+    def slot(self):
+        """Hold a slot for the duration of the block; raises LimiterFull after max_wait."""
+        started = time.perf_counter()
+        self._queued(1)
+        try:
+            acquired = self._semaphore.acquire(timeout=self.max_wait)
+        finally:
+            self._queued(-1)
+        self._admitted(started, acquired)
+        try:
+            yield
+        finally:
+            self._release()
+
+    @asynccontextmanager
+    async def async_slot(self):
+        """slot() for coroutines: waits without blocking the event loop."""
+        started = time.perf_counter()
+        deadline = started + self.max_wait
+        self._queued(1)
+        try:
+            # Polled so a cancelled waiter can never take a slot after it is gone
+            acquired = self._semaphore.acquire(blocking=False)
+            while not acquired and time.perf_counter() < deadline:
+                await asyncio.sleep(ASYNC_POLL_SECONDS)
+                acquired = self._semaphore.acquire(blocking=False)
+        finally:
+            self._queued(-1)
+        self._admitted(started, acquired)
+        try:
+            yield
+        finally:
+            self._release()
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker with a single half-open trial call."""
+
+    def __init__(self, name: str, failure_threshold: int, reset_timeout: float):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_running = False
+        self.state = CLOSED
+        _breakers[name] = self
+
+    def rejects(self) -> bool:
+        """True (and counted as a rejection) while open and still cooling down."""
+        if self.state == OPEN and time.monotonic() - self._opened_at < self.reset_timeout:
+            CALLS_REJECTED.inc(self.name, "circuit_open")
+            return True
+        return False
+
+    def allow(self) -> bool:
+        """True if a call may go ahead now (closed, or the half-open trial slot)."""
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            if self.state == OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+                self.state = HALF_OPEN
+                self._trial_running = False
+            if self.state == HALF_OPEN and not self._trial_running:
+                self._trial_running = True
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._trial_running = False
+            self.state = CLOSED
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            self._trial_running = False
+            if self.state == HALF_OPEN or self._failures >= self.failure_threshold:
+                if self.state != OPEN:
+                    print(f"⚠️ Circuit breaker '{self.name}' opened after {self._failures} failures")
+                self.state = OPEN
+                self._opened_at = time.monotonic()
+
+    def release_trial(self) -> None:
+        """Give back a half-open trial slot without an outcome (call abandoned)."""
+        with self._lock:
+            self._trial_running = False
+
+
+def _admit(breaker: CircuitBreaker) -> None:
+    if not breaker.allow():
+        CALLS_REJECTED.inc(breaker.name, "circuit_open")
+        raise CircuitOpen(f"{breaker.name}: circuit open")
+
+
+def _settle(breaker: CircuitBreaker, outcome) -> None:
+    if outcome is True:
+        breaker.record_success()
+    elif outcome is False:
+        breaker.record_failure()
+    else:
+        # Rejected by the limiter or abandoned (client went away)
+        breaker.release_trial()
+
+
+@contextmanager
+def guarded_call(limiter: ConcurrencyLimiter, breaker: CircuitBreaker):
+    """
+    Run an upstream call behind a circuit breaker and a concurrency limit.
+
+    Raises CircuitOpen or LimiterFull without calling the upstream; any
+    exception from the block counts as a breaker failure.
+    """
+    _admit(breaker)
+    outcome = None
+    try:
+        with limiter.slot():
+            try:
+                yield
+            except Exception:
+                outcome = False
+                raise
+            outcome = True
+    finally:
+        _settle(breaker, outcome)
+
+
+@asynccontextmanager
+async def guarded_call_async(limiter: ConcurrencyLimiter, breaker: CircuitBreaker):
+    """guarded_call() for coroutines."""
+    _admit(breaker)
+    outcome = None
+    try:
+        async with limiter.async_slot():
+            try:
+                yield
+            except Exception:
+                outcome = False
+                raise
+            outcome = True
+    finally:
+        _settle(breaker, outcome)
@@ -0,0 +1,171 @@
+"""
+Chatbot Response Cache for Roomies
+
+Most chat traffic is the same handful of FAQ-style questions. This cache
+keeps Gemini replies for a TTL (LRU-evicted), keyed on:
+
+- the normalized message (lower-cased word tokens), and
+- a fingerprint of the context the reply depends on (best FAQ, listings),
+  so a reply is not reused once the listings or FAQ it quoted change.
+
+Near-duplicate matching is off by default. With CHAT_CACHE_SIMILARITY > 0,
+a miss on the exact key falls back to the cached message with the highest
+token-set (Jaccard) similarity under the same fingerprint, so "how does
+refund work" can reuse the reply to "How does the refund work?". Token
+sets ignore word order and meaning, so a low threshold can hand one
+question another's answer; messages that differ by a negation ("is wifi
+included" / "is wifi not included") never match.
+
+Usage:
+    cached = response_cache.get(message, fingerprint)
+    if cached is None:
+        reply = generate(...)
+        response_cache.set(message, fingerprint, reply, elapsed)
+"""
+
+import hashlib
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, FrozenSet, Optional, Tuple
+
+# Seconds a cached reply stays valid (0 disables the cache)
+CHAT_CACHE_TTL = float(os.environ.get("CHAT_CACHE_TTL", "3600"))
+
+# Maximum replies kept per process (least recently used are evicted)
+CHAT_CACHE_MAX_ENTRIES = int(os.environ.get("CHAT_CACHE_MAX_ENTRIES", "1000"))
+
+# Minimum Jaccard similarity for a near-duplicate hit (0, the default, disables)
+CHAT_CACHE_SIMILARITY = float(os.environ.get("CHAT_CACHE_SIMILARITY", "0"))
+
+# Tokens that flip a question's meaning; near-duplicates must agree on them
+NEGATIONS = frozenset({"not", "no", "never", "without", "nor", "cannot", "dont", "don", "isn",
+                       "aren", "doesn", "didn", "won", "t"})
+
+_WORD_RE = re.compile(r"\w+")
+
+
+def normalize_message(message: str) -> str:
+    """Lower-cased word tokens joined by single spaces."""
+    return " ".join(_WORD_RE.findall(message.lower()))
+
+
+def context_fingerprint(context: str) -> str:
+    """Short stable hash of prompt context."""
+    return hashlib.sha1(context.encode("utf-8")).hexdigest()[:16]
+
+
+class _Entry:
+    __slots__ = ("expires_at", "response", "tokens", "generation_seconds")
+
+    def __init__(self, expires_at: float, response: str, tokens: FrozenSet[str], generation_seconds: float):
+        self.expires_at = expires_at
+        self.response = response
+        self.tokens = tokens
+        self.generation_seconds = generation_seconds
+
+
+class ResponseCache:
+    """Thread-safe TTL + LRU cache of chatbot replies with near-duplicate lookup."""
+
+    def __init__(self, ttl: float = CHAT_CACHE_TTL, max_entries: int = CHAT_CACHE_MAX_ENTRIES,
+                 similarity: float = CHAT_CACHE_SIMILARITY):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.similarity = similarity
+        self._entries: "OrderedDict[Tuple[str, str], _Entry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.near_hits = 0
+        self.misses = 0
+        self.saved_seconds = 0.0
+
+    def get(self, message: str, fingerprint: str) -> Optional[str]:
+        """
+        Cached reply for a message asked with the given context, or None.
+
+        Args:
+            message: User message as typed
+            fingerprint: context_fingerprint() of what the reply depends on
+
+        Returns:
+            Reply text or None on a miss
+        """
+        if self.ttl <= 0:
+            return None
+        normalized = normalize_message(message)
+        now = time.monotonic()
+        with self._lock:
+            key = (fingerprint, normalized)
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires_at < now:
+                del self._entries[key]
+                entry = None
+            if entry is None and self.similarity > 0:
+                key, entry = self._nearest(fingerprint, frozenset(normalized.split()), now)
+                if entry is not None:
+                    self.near_hits += 1
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            self.saved_seconds += entry.generation_seconds
+            return entry.response
+
+    def _nearest(self, fingerprint: str, tokens: FrozenSet[str], now: float):
+        best_key, best_entry, best_score = None, None, self.similarity
+        if not tokens:
+            return best_key, best_entry
+        for key, entry in self._entries.items():
+            if key[0] != fingerprint or entry.expires_at < now or (tokens ^ entry.tokens) & NEGATIONS:
+                continue
+            score = len(tokens & entry.tokens) / len(tokens | entry.tokens)
+            if score >= best_score:
+                best_key, best_entry, best_score = key, entry, score
+        return best_key, best_entry
+
+    def set(self, message: str, fingerprint: str, response: str, generation_seconds: float = 0.0) -> None:
+        """
+        Store a reply.
+
+        Args:
+            message: User message as typed
+            fingerprint: context_fingerprint() of what the reply depends on
+            response: Reply text
+            generation_seconds: How long generating it took (reported as saved on hits)
+        """
+        if self.ttl <= 0 or not response:
+            return
+        normalized = normalize_message(message)
+        key = (fingerprint, normalized)
+        entry = _Entry(time.monotonic() + self.ttl, response, frozenset(normalized.split()), generation_seconds)
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop every cached reply."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, float]:
+        """Hit/miss counters and latency saved since process start."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "near_hits": self.near_hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "saved_seconds": self.saved_seconds,
+            }
+
+
+# Singleton instance
+response_cache = ResponseCache()
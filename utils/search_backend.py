@@ -0,0 +1,290 @@
+"""
+Room Search Backends for Roomies
+
+`/api/rooms?q=` and `/api/suggestions` go through a search backend instead
+of `ILIKE '%q%'`, which cannot use a B-tree index:
+
+- PostgresSearchBackend: a generated `tsvector` column on rooms (title,
+  location, college) with a GIN index, prefix-matched with `to_tsquery`
+  and ranked with `ts_rank`
+- TrieSearchBackend: the in-memory SearchTrie (SQLite / development),
+  topped up with rooms created since the last sync; a query no word
+  prefix matches (e.g. a substring like "ngineering"), or one matching
+  more than SEARCH_TRIE_MAX_IDS rooms (e.g. "a"), falls back to ILIKE
+  rather than binding a huge IN list
+- IlikeSearchBackend: the original substring match, used on PostgreSQL
+  until the search column exists
+
+Every backend serves suggestions from a single query.
+
+Usage:
+    search_backend = get_search_backend(db, Room, search_trie, sync_search_index)
+    query = search_backend.filter_rooms(Room.query, "andheri pg")
+    suggestions = search_backend.suggest("andh")
+"""
+
+import logging
+import os
+import re
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, List, Optional, Set
+
+from sqlalchemy import DDL, event, func, literal_column, or_, select, text
+
+logger = logging.getLogger(__name__)
+
+# Force a backend: "postgres", "memory" or "ilike" (default: by database)
+SEARCH_BACKEND = os.environ.get("SEARCH_BACKEND", "").lower()
+
+# Minimum seconds between checks for rooms missing from the in-memory index
+TRIE_SYNC_INTERVAL = float(os.environ.get("SEARCH_SYNC_INTERVAL", "2"))
+
+# Most trie matches passed to the database as an IN list (SQLite binds at most 32766)
+TRIE_MAX_IDS = int(os.environ.get("SEARCH_TRIE_MAX_IDS", "500"))
+
+# Suggestions returned per type (College, Location, Room)
+SUGGESTIONS_PER_TYPE = 3
+
+# Rows scanned to build suggestions
+SUGGESTION_CANDIDATES = 200
+
+TSVECTOR_CONFIG = "simple"  # place names: no stemming or stop words
+
+# PostgreSQL 12+ generated column and GIN index (also run by migrations/add_room_search_vector.py)
+SEARCH_VECTOR_DDL = (
+    "ALTER TABLE rooms ADD COLUMN IF NOT EXISTS search_vector tsvector "
+    f"GENERATED ALWAYS AS (to_tsvector('{TSVECTOR_CONFIG}', "
+    "coalesce(title, '') || ' ' || coalesce(location, '') || ' ' || coalesce(college_nearby, ''))) STORED"
+)
+SEARCH_INDEX_DDL = "CREATE INDEX IF NOT EXISTS ix_rooms_search_vector ON rooms USING gin (search_vector)"
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+SUGGESTION_FIELDS = (("College", "college_nearby"), ("Location", "location"), ("Room", "title"))
+
+
+def tokenize(q: str) -> List[str]:
+    """Lower-cased word tokens of a search string (safe to put in a tsquery)."""
+    return _TOKEN_RE.findall(q.lower())
+
+
+def _pick_suggestions(rows, tokens: List[str]) -> List[Dict[str, str]]:
+    """Up to SUGGESTIONS_PER_TYPE distinct values per type with a word starting with every token."""
+    picked = {kind: [] for kind, _ in SUGGESTION_FIELDS}
+    seen = set()
+    for row in rows:
+        for kind, field in SUGGESTION_FIELDS:
+            value = getattr(row, field)
+            if not value or len(picked[kind]) >= SUGGESTIONS_PER_TYPE or (kind, value) in seen:
+                continue
+            words = tokenize(value)
+            if all(any(word.startswith(token) for word in words) for token in tokens):
+                seen.add((kind, value))
+                picked[kind].append(value)
+    return [{"type": kind, "text": value} for kind, _ in SUGGESTION_FIELDS for value in picked[kind]]
+
+
+class SearchBackend(ABC):
+    """Interface: filter a Room query by free text, and suggest completions."""
+
+    name = "base"
+
+    def __init__(self, db, room_model):
+        self.db = db
+        self.Room = room_model
+
+    @abstractmethod
+    def filter_rooms(self, query, q: str):
+        """Restrict `query` to rooms matching `q`."""
+
+    def rank(self, q: str):
+        """ORDER BY clause for relevance, or None if the backend has no ranking."""
+        return None
+
+    @abstractmethod
+    def suggest(self, q: str) -> List[Dict[str, str]]:
+        """Colleges, locations and room titles matching `q`, from one query."""
+
+
+class IlikeSearchBackend(SearchBackend):
+    """Substring match on title, location and college (no index support)."""
+
+    name = "ilike"
+
+    def _condition(self, q: str):
+        like = f"%{q}%"
+        Room = self.Room
+        return or_(Room.title.ilike(like), Room.location.ilike(like), Room.college_nearby.ilike(like))
+
+    def filter_rooms(self, query, q: str):
+        return query.filter(self._condition(q))
+
+    def suggest(self, q: str) -> List[Dict[str, str]]:
+        Room = self.Room
+        rows = self.db.session.execute(
+            select(Room.college_nearby, Room.location, Room.title)
+            .where(self._condition(q))
+            .limit(SUGGESTION_CANDIDATES)
+        )
+        needle = q.lower()
+        picked = {kind: [] for kind, _ in SUGGESTION_FIELDS}
+        for row in rows:
+            for kind, field in SUGGESTION_FIELDS:
+                value = getattr(row, field)
+                if value and needle in value.lower() and value not in picked[kind] \
+                        and len(picked[kind]) < SUGGESTIONS_PER_TYPE:
+                    picked[kind].append(value)
+        return [{"type": kind, "text": value} for kind, _ in SUGGESTION_FIELDS for value in picked[kind]]
+
+
+class PostgresSearchBackend(SearchBackend):
+    """tsvector + GIN full-text search with prefix matching and ts_rank ordering."""
+
+    name = "postgres"
+
+    @staticmethod
+    def tsquery_text(q: str) -> Optional[str]:
+        """'andheri pg' -> 'andheri:* & pg:*' (tokens are \\w+ only, so nothing to escape)."""
+        tokens = tokenize(q)
+        return " & ".join(f"{token}:*" for token in tokens) if tokens else None
+
+    def _match(self, q: str):
+        tsquery = func.to_tsquery(TSVECTOR_CONFIG, self.tsquery_text(q))
+        vector = literal_column("rooms.search_vector")
+        return vector, tsquery, vector.op("@@")(tsquery)
+
+    def filter_rooms(self, query, q: str):
+        if not self.tsquery_text(q):
+            return query
+        _, _, condition = self._match(q)
+        return query.filter(condition)
+
+    def rank(self, q: str):
+        if not self.tsquery_text(q):
+            return None
+        vector, tsquery, _ = self._match(q)
+        return func.ts_rank(vector, tsquery).desc()
+
+    def suggest(self, q: str) -> List[Dict[str, str]]:
+        tokens = tokenize(q)
+        if not tokens:
+            return []
+        Room = self.Room
+        vector, tsquery, condition = self._match(q)
+        rows = self.db.session.execute(
+            select(Room.college_nearby, Room.location, Room.title)
+            .where(condition)
+            .order_by(func.ts_rank(vector, tsquery).desc())
+            .limit(SUGGESTION_CANDIDATES)
+        )
+        return _pick_suggestions(rows, tokens)
+
+
+class TrieSearchBackend(SearchBackend):
+    """Word-prefix search over the in-memory SearchTrie, ILIKE when no word prefix matches."""
+
+    name = "memory"
+
+    def __init__(self, db, room_model, trie, sync: Callable[[], int]):
+        super().__init__(db, room_model)
+        self.trie = trie
+        self.sync = sync
+        self.fallback = IlikeSearchBackend(db, room_model)
+        self._synced_at = 0.0
+        self._lock = threading.Lock()
+
+    def _refresh(self) -> None:
+        # Pick up rooms created by other workers since the last check
+        now = time.monotonic()
+        if now - self._synced_at < TRIE_SYNC_INTERVAL:
+            return
+        with self._lock:
+            if now - self._synced_at >= TRIE_SYNC_INTERVAL:
+                self._synced_at = now
+                self.sync()
+
+    def matching_ids(self, q: str) -> Optional[Set[int]]:
+        """Room ids whose words start with every token, or None for an empty query."""
+        tokens = tokenize(q)
+        if not tokens:
+            return None
+        self._refresh()
+        ids = None
+        for token in tokens:
+            found = self.trie.search(token)
+            ids = set(found) if ids is None else ids & found
+            if not ids:
+                return set()
+        return ids
+
+    def filter_rooms(self, query, q: str):
+        ids = self.matching_ids(q)
+        if ids is None:
+            return query
+        if not ids or len(ids) > TRIE_MAX_IDS:
+            # Not a word prefix (e.g. a substring inside a word): same results as before the trie.
+            # Too broad (e.g. "a"): an IN list of every room would cost more than the scan.
+            return self.fallback.filter_rooms(query, q)
+        return query.filter(self.Room.id.in_(ids))
+
+    def suggest(self, q: str) -> List[Dict[str, str]]:
+        ids = self.matching_ids(q)
+        if ids is None:
+            return []
+        if not ids:
+            return self.fallback.suggest(q)
+        Room = self.Room
+        # Only SUGGESTION_CANDIDATES rows are read, so only that many ids are bound
+        candidates = sorted(ids)[:SUGGESTION_CANDIDATES]
+        rows = self.db.session.execute(
+            select(Room.college_nearby, Room.location, Room.title)
+            .where(Room.id.in_(candidates))
+        )
+        return _pick_suggestions(rows, tokenize(q))
+
+
+def has_search_vector(db) -> bool:
+    """True when rooms.search_vector exists (PostgreSQL only)."""
+    with db.engine.connect() as connection:
+        return bool(connection.execute(text(
+            "SELECT 1 FROM information_schema.columns "
+            "WHERE table_name = 'rooms' AND column_name = 'search_vector'"
+        )).first())
+
+
+def install_search_vector_ddl(room_table) -> None:
+    """Create the search column and index whenever rooms is created on PostgreSQL."""
+    for statement in (SEARCH_VECTOR_DDL, SEARCH_INDEX_DDL):
+        event.listen(room_table, "after_create", DDL(statement).execute_if(dialect="postgresql"))
+
+
+def get_search_backend(db, room_model, trie, sync: Callable[[], int]) -> SearchBackend:
+    """
+    Pick the search backend for the configured database.
+
+    Args:
+        db: Flask-SQLAlchemy instance
+        room_model: Room model
+        trie: SearchTrie used on SQLite
+        sync: Function that indexes rooms missing from the trie
+
+    Returns:
+        SearchBackend instance
+    """
+    choice = SEARCH_BACKEND
+    if not choice:
+        choice = "postgres" if db.engine.dialect.name == "postgresql" else "memory"
+
+    if choice == "postgres":
+        if db.engine.dialect.name == "postgresql" and has_search_vector(db):
+            return PostgresSearchBackend(db, room_model)
+        logger.warning(
+            "rooms.search_vector missing; run migrations/add_room_search_vector.py. "
+            "Falling back to ILIKE search."
+        )
+        return IlikeSearchBackend(db, room_model)
+    if choice == "ilike":
+        return IlikeSearchBackend(db, room_model)
+    return TrieSearchBackend(db, room_model, trie, sync)
@@ -0,0 +1,66 @@
+"""
+Per-request SQL accounting shared by metrics, request stats and the profiler.
+
+A single SQLAlchemy listener pair times every statement issued inside a
+request and keeps the totals on `flask.g`:
+
+- `request_sql_totals()` -> (statements, seconds) for the current request,
+  read by /metrics (utils/metrics.py) and X-Query-Count (utils/request_cache.py)
+- observers added with `add_statement_observer()` get (statement, seconds)
+  for each statement, e.g. the query profiler
+
+Statements that raise are finished in a `handle_error` listener, so the
+per-connection timer stack never keeps a stale entry.
+"""
+
+import time
+from typing import Callable, List, Tuple
+
+from flask import g, has_request_context
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+_observers: List[Callable[[str, float], None]] = []
+
+
+def add_statement_observer(observer: Callable[[str, float], None]) -> None:
+    """Call `observer(statement, seconds)` after each statement issued in a request."""
+    if observer not in _observers:
+        _observers.append(observer)
+
+
+def request_sql_totals() -> Tuple[int, float]:
+    """(statements issued, seconds spent in SQL) so far in the current request."""
+    if not has_request_context():
+        return 0, 0.0
+    return g.get("_sql_statements", 0), g.get("_sql_seconds", 0.0)
+
+
+def _finish(conn, statement: str) -> None:
+    started = conn.info.get("_sql_started")
+    if not started:
+        return
+    elapsed = time.perf_counter() - started.pop()
+    if has_request_context():
+        g._sql_statements = g.get("_sql_statements", 0) + 1
+        g._sql_seconds = g.get("_sql_seconds", 0.0) + elapsed
+        for observer in _observers:
+            observer(statement, elapsed)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_execute(conn, cursor, statement, parameters, context, executemany):
+    if has_request_context():
+        conn.info.setdefault("_sql_started", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_execute(conn, cursor, statement, parameters, context, executemany):
+    _finish(conn, statement)
+
+
+@event.listens_for(Engine, "handle_error")
+def _on_error(exception_context):
+    # after_cursor_execute does not run for a failed statement
+    if exception_context.connection is not None:
+        _finish(exception_context.connection, exception_context.statement or "")
@@ -0,0 +1,211 @@
+"""
+In-Memory Suggestion Index for Roomies
+
+The search box calls /api/suggestions on every keystroke. Instead of
+querying rooms each time, the distinct colleges, locations and room titles
+are kept in memory with a popularity weight (number of listings using
+them) and answered from there:
+
+- prefix matches ("vive" -> "Vivekanand ...") rank first
+- then matches at the start of a later word ("pat" -> "Sardar Patel ...")
+- then any other substring match (the old ILIKE '%q%' behaviour)
+
+Within each group heavier (more listed) entries come first.
+
+Listing writes in this process update the index directly (`add_room`,
+`remove_room`). Writes made by other workers are picked up by a full
+reload in a background thread once the index is older than
+SUGGESTION_REFRESH_SECONDS, so lookups never wait on the database.
+
+Usage:
+    suggestion_index.set_loader(load_rows)   # rows of (id, college, location, title)
+    suggestion_index.rebuild()
+    suggestion_index.lookup("andh")
+"""
+
+import bisect
+import logging
+import os
+import threading
+import time
+from collections import Counter
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Seconds before a background reload picks up other workers' listing writes
+SUGGESTION_REFRESH_SECONDS = float(os.environ.get("SUGGESTION_REFRESH_SECONDS", "60"))
+
+# (response type, position in a loader row)
+KINDS = (("College", 1), ("Location", 2), ("Room", 3))
+
+RoomRow = Tuple[int, Optional[str], Optional[str], Optional[str]]
+
+
+class _Entries:
+    """Distinct values of one kind with weights and lower-cased lookup keys."""
+
+    def __init__(self):
+        self.weights = Counter()
+        self._sorted = None  # [(lower, text)], rebuilt lazily after writes
+
+    def add(self, text: Optional[str]) -> None:
+        if text:
+            self.weights[text] += 1
+            self._sorted = None
+
+    def remove(self, text: Optional[str]) -> None:
+        if text and self.weights[text] > 0:
+            self.weights[text] -= 1
+            if not self.weights[text]:
+                del self.weights[text]
+            self._sorted = None
+
+    def sorted_keys(self) -> List[Tuple[str, str]]:
+        entries = self._sorted
+        if entries is None:
+            entries = self._sorted = sorted((text.lower(), text) for text in self.weights)
+        return entries
+
+    def search(self, needle: str, limit: int) -> List[str]:
+        """Best `limit` values matching `needle` (lower-cased)."""
+        entries = self.sorted_keys()
+        weights = self.weights
+
+        # Prefix matches are a contiguous run of the sorted keys
+        start = bisect.bisect_left(entries, (needle,))
+        prefix = []
+        for lower, text in entries[start:]:
+            if not lower.startswith(needle):
+                break
+            prefix.append(text)
+
+        word_start, infix = [], []
+        for lower, text in entries:
+            position = lower.find(needle)
+            if position <= 0:
+                continue  # no match, or already counted as a prefix match
+            (word_start if not lower[position - 1].isalnum() else infix).append(text)
+
+        ranked = []
+        for group in (prefix, word_start, infix):
+            group.sort(key=lambda text: (-weights[text], text))
+            ranked.extend(group)
+            if len(ranked) >= limit:
+                break
+        return ranked[:limit]
+
+
+class SuggestionIndex:
+    """Weighted prefix/infix lookup over colleges, locations and room titles."""
+
+    def __init__(self, refresh_seconds: float = SUGGESTION_REFRESH_SECONDS):
+        self.refresh_seconds = refresh_seconds
+        self._loader: Optional[Callable[[], Iterable[RoomRow]]] = None
+        self._entries: Dict[str, _Entries] = {kind: _Entries() for kind, _ in KINDS}
+        self._rooms: Dict[int, RoomRow] = {}
+        self._lock = threading.Lock()
+        self._refreshing = threading.Lock()
+        self.built_at: Optional[float] = None
+
+    def set_loader(self, loader: Callable[[], Iterable[RoomRow]]) -> None:
+        """Set the function returning (id, college, location, title) rows for every room."""
+        self._loader = loader
+
+    @property
+    def ready(self) -> bool:
+        return self.built_at is not None
+
+    def rebuild(self) -> int:
+        """
+        Reload every room from the loader and swap the index in.
+
+        Returns:
+            Number of rooms indexed
+        """
+        entries = {kind: _Entries() for kind, _ in KINDS}
+        rooms = {}
+        for row in self._loader():
+            row = tuple(row)
+            rooms[row[0]] = row
+            for kind, position in KINDS:
+                entries[kind].add(row[position])
+        for kind_entries in entries.values():
+            kind_entries.sorted_keys()  # sort once here, not on the first keystroke
+        with self._lock:
+            self._entries, self._rooms = entries, rooms
+            self.built_at = time.monotonic()
+        return len(rooms)
+
+    def add_room(self, room_id: int, college: Optional[str], location: Optional[str], title: Optional[str]) -> None:
+        """Index a new or edited listing."""
+        with self._lock:
+            self._remove_locked(room_id)
+            row = (room_id, college, location, title)
+            self._rooms[room_id] = row
+            for kind, position in KINDS:
+                self._entries[kind].add(row[position])
+
+    def remove_room(self, room_id: int) -> None:
+        """Drop a deleted listing."""
+        with self._lock:
+            self._remove_locked(room_id)
+
+    def _remove_locked(self, room_id: int) -> None:
+        row = self._rooms.pop(room_id, None)
+        if row:
+            for kind, position in KINDS:
+                self._entries[kind].remove(row[position])
+
+    def lookup(self, q: str, per_type: int = 3) -> List[Dict[str, str]]:
+        """
+        Suggestions for a search box prefix.
+
+        Args:
+            q: Text typed so far
+            per_type: Maximum suggestions per type
+
+        Returns:
+            [{"type": "College" | "Location" | "Room", "text": ...}]
+        """
+        self._maybe_refresh()
+        needle = q.strip().lower()
+        if not needle:
+            return []
+        with self._lock:
+            entries = self._entries
+            return [
+                {"type": kind, "text": text}
+                for kind, _ in KINDS
+                for text in entries[kind].search(needle, per_type)
+            ]
+
+    def _maybe_refresh(self) -> None:
+        if self.built_at is None or self._loader is None:
+            return
+        if time.monotonic() - self.built_at < self.refresh_seconds:
+            return
+        if not self._refreshing.acquire(blocking=False):
+            return  # another thread is already reloading
+        threading.Thread(target=self._refresh, name="suggestion-index-refresh", daemon=True).start()
+
+    def _refresh(self) -> None:
+        try:
+            self.rebuild()
+        except Exception as e:
+            # Keep serving the old index; try again after the next interval
+            self.built_at = time.monotonic()
+            logger.error(f"Suggestion index refresh failed: {e}")
+        finally:
+            self._refreshing.release()
+
+    def stats(self) -> Dict[str, int]:
+        """Distinct values per type and rooms indexed."""
+        with self._lock:
+            counts = {kind: len(self._entries[kind].weights) for kind, _ in KINDS}
+            counts["rooms"] = len(self._rooms)
+        return counts
+
+
+# Global suggestion index
+suggestion_index = SuggestionIndex()
@@ -17,17 +17,27 @@ from typing import Optional, Dict, Any, Tuple
 from urllib.parse import urlencode
 from dotenv import load_dotenv
 
+from utils.http_client import http_client
+from utils.token_verifier import InvalidToken, TokenVerifier
+
 load_dotenv()
 
 # Supabase Configuration
 SUPABASE_URL = os.environ.get("SUPABASE_URL", "https://nlhhssjsbacghfrmacru.supabase.co")
 SUPABASE_ANON_KEY = os.environ.get("SUPABASE_ANON_KEY", "")
 SUPABASE_SERVICE_KEY = os.environ.get("SUPABASE_SERVICE_KEY", "")
+# Legacy HS256 signing secret (Project Settings > API > JWT Secret); enables local token checks
+SUPABASE_JWT_SECRET = os.environ.get("SUPABASE_JWT_SECRET", "")
 
 # OAuth Redirect URL (configure this in Supabase Dashboard)
 OAUTH_REDIRECT_URL = os.environ.get("OAUTH_REDIRECT_URL", "http://localhost:5000/auth/callback")
 
 
+def _http(method: str, url: str, **kwargs) -> requests.Response:
+    """Outbound Supabase API call on the pooled session (timeouts, retries, /metrics)."""
+    return http_client.request("supabase", method, url, **kwargs)
+
+
 class SupabaseAuthService:
     """
     Service class for Supabase OAuth authentication.
@@ -45,6 +55,9 @@ class SupabaseAuthService:
         self.anon_key = SUPABASE_ANON_KEY
         self.service_key = SUPABASE_SERVICE_KEY
         self.redirect_url = OAUTH_REDIRECT_URL
+        self.token_verifier = TokenVerifier(
+            f"{self.supabase_url}/auth/v1/.well-known/jwks.json", SUPABASE_JWT_SECRET
+        )
         
         if self.anon_key:
             print("✅ Supabase OAuth configured (HTTP mode)")
@@ -122,8 +135,8 @@ class SupabaseAuthService:
         
         try:
             if access_token:
-                # Get user info using access token
-                return self._get_user_from_token(access_token)
+                # Get user info using access token (remote: the sign-in needs the verified status)
+                return self._get_user_from_token(access_token, local=False)
             
             if code:
                 # Exchange code for session/token
@@ -139,7 +152,8 @@ class SupabaseAuthService:
         try:
             url = f"{self.supabase_url}/auth/v1/token?grant_type=authorization_code"
             
-            response = requests.post(
+            response = _http(
+                "POST",
                 url,
                 headers=self._get_headers(),
                 json={"auth_code": code}
@@ -150,7 +164,7 @@ class SupabaseAuthService:
                 access_token = data.get("access_token")
                 
                 if access_token:
-                    return self._get_user_from_token(access_token)
+                    return self._get_user_from_token(access_token, local=False)
                 
                 # Try to extract user from response directly
                 user = data.get("user")
@@ -162,8 +176,27 @@ class SupabaseAuthService:
         except Exception as e:
             return False, {"error": f"Code exchange error: {str(e)}"}
     
-    def _get_user_from_token(self, access_token: str) -> Tuple[bool, Dict[str, Any]]:
-        """Get user information from access token."""
+    def _get_user_from_token(self, access_token: str, local: bool = True) -> Tuple[bool, Dict[str, Any]]:
+        """
+        Get user information from access token.
+
+        Args:
+            access_token: Supabase access token
+            local: Verify the token locally when possible. The claims do not
+                carry a trustworthy email verification status (email_verified
+                is None), so sign-in paths pass False to ask /auth/v1/user.
+
+        Returns:
+            Tuple of (success, user_data_or_error)
+        """
+        if local:
+            try:
+                claims = self.token_verifier.verify(access_token)
+            except InvalidToken as e:
+                return False, {"error": f"Invalid token: {e}"}
+            if claims is not None:
+                return True, self._extract_user_data(self._user_from_claims(claims))
+
         try:
             url = f"{self.supabase_url}/auth/v1/user"
             
@@ -173,7 +206,7 @@ class SupabaseAuthService:
                 "Content-Type": "application/json"
             }
             
-            response = requests.get(url, headers=headers)
+            response = _http("GET", url, headers=headers)
             
             if response.status_code == 200:
                 user = response.json()
@@ -184,6 +217,21 @@ class SupabaseAuthService:
         except Exception as e:
             return False, {"error": f"Get user error: {str(e)}"}
     
+    @staticmethod
+    def _user_from_claims(claims: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Supabase user object as far as the access token's claims describe it.
+
+        No email_confirmed_at: user_metadata is editable by the user, so the
+        verification status is left unknown.
+        """
+        return {
+            "id": claims.get("sub"),
+            "email": claims.get("email"),
+            "user_metadata": claims.get("user_metadata") or {},
+            "app_metadata": claims.get("app_metadata") or {},
+        }
+
     def _extract_user_data(self, user: Dict) -> Dict[str, Any]:
         """Extract relevant user data from Supabase user object."""
         user_metadata = user.get("user_metadata", {})
@@ -203,12 +251,20 @@ class SupabaseAuthService:
             "name": name,
             "avatar_url": user_metadata.get("avatar_url") or user_metadata.get("picture"),
             "provider": app_metadata.get("provider", "email"),
-            "email_verified": user.get("email_confirmed_at") is not None,
+            # None when unknown (user built from token claims)
+            "email_verified": user.get("email_confirmed_at") is not None if "email_confirmed_at" in user else None,
             "raw_metadata": user_metadata
         }
     
     def verify_token(self, access_token: str) -> Tuple[bool, Optional[Dict[str, Any]]]:
-        """Verify an access token and get user info."""
+        """
+        Verify an access token and get user info (locally when possible).
+
+        Not called by the app today: browser sessions are Flask-Login
+        cookies set at sign-in, and sign-in itself needs the remote
+        email verification status. This is the entry point for a bearer
+        token check on API requests; email_verified is None here.
+        """
         return self._get_user_from_token(access_token)
     
     def signup_with_email(self, email: str, password: str, user_metadata: Dict[str, Any] = None) -> Tuple[bool, Dict[str, Any]]:
@@ -238,7 +294,8 @@ class SupabaseAuthService:
             if user_metadata:
                 payload["data"] = user_metadata  # User metadata goes in 'data' field
             
-            response = requests.post(
+            response = _http(
+                "POST",
                 url,
                 headers=self._get_headers(),
                 json=payload
@@ -293,7 +350,8 @@ class SupabaseAuthService:
                 "password": password
             }
             
-            response = requests.post(
+            response = _http(
+                "POST",
                 url,
                 headers=self._get_headers(),
                 json=payload
@@ -346,7 +404,8 @@ class SupabaseAuthService:
                 "email": email
             }
             
-            response = requests.post(
+            response = _http(
+                "POST",
                 url,
                 headers=self._get_headers(),
                 json=payload
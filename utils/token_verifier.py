@@ -0,0 +1,171 @@
+"""
+Local verification of Supabase access tokens (JWTs).
+
+Checking a session token used to mean a GET to Supabase /auth/v1/user on
+every call. Access tokens are signed JWTs, so they can be checked locally:
+
+- HS256 tokens against the project's JWT secret (SUPABASE_JWT_SECRET)
+- RS256/ES256 tokens against the project's JWKS, fetched from
+  /auth/v1/.well-known/jwks.json and cached for SUPABASE_JWKS_TTL seconds
+  (re-fetched early, at most once per JWKS_MIN_REFRESH seconds, when a
+  token carries an unknown key id after a key rotation)
+
+Signature, expiry and audience are checked. Decoded claims are then cached
+by SHA-256 of the token until it expires, so a token seen before is
+verified with a dict lookup.
+
+A token revoked on the Supabase side (sign-out) stays valid locally until
+it expires; Supabase access tokens are short-lived (1h by default).
+
+verify() returns None when the token cannot be checked locally (PyJWT
+missing, no secret configured, JWKS unreachable); callers then fall back
+to the remote /auth/v1/user check.
+
+Only SupabaseAuthService.verify_token() uses it, and nothing in the app
+calls that yet (sessions are cookies; sign-in asks /auth/v1/user for the
+email verification status), so local verification is currently dormant.
+"""
+
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+from utils.http_client import http_client
+from utils.metrics import metrics
+
+try:
+    import jwt
+except ImportError:
+    jwt = None
+
+# Seconds the JWKS is trusted before it is fetched again
+SUPABASE_JWKS_TTL = float(os.environ.get("SUPABASE_JWKS_TTL", "600"))
+
+# Minimum seconds between JWKS fetches triggered by an unknown key id
+JWKS_MIN_REFRESH = 30.0
+
+# Decoded tokens kept per process (least recently used are evicted)
+TOKEN_CACHE_MAX_ENTRIES = int(os.environ.get("TOKEN_CACHE_MAX_ENTRIES", "2000"))
+
+# Clock skew tolerated on exp/iat, in seconds
+TOKEN_LEEWAY = 30
+
+ASYMMETRIC_ALGORITHMS = ("RS256", "ES256")
+
+
+class InvalidToken(Exception):
+    """The token is malformed, expired or its signature does not verify."""
+
+
+class TokenVerifier:
+    """Verifies JWTs locally and caches the decoded claims until expiry."""
+
+    def __init__(self, jwks_url: str, secret: str = "", audience: str = "authenticated",
+                 max_entries: int = TOKEN_CACHE_MAX_ENTRIES, name: str = "supabase_token"):
+        self.jwks_url = jwks_url
+        self.secret = secret
+        self.audience = audience
+        self.max_entries = max_entries
+        self._claims: "OrderedDict[str, tuple]" = OrderedDict()  # token hash -> (exp, claims)
+        self._keys: Dict[str, Any] = {}
+        self._keys_fetched_at = 0.0
+        self._lock = threading.Lock()
+        self._jwks_lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        metrics.register_cache(name, lambda: (self.hits, self.misses))
+
+    @property
+    def available(self) -> bool:
+        return jwt is not None
+
+    def verify(self, token: str) -> Optional[Dict[str, Any]]:
+        """
+        Claims of a valid token.
+
+        Args:
+            token: Encoded JWT (the bearer access token)
+
+        Returns:
+            Claims dict, or None if the token cannot be verified locally
+
+        Raises:
+            InvalidToken: Bad signature, expired, wrong audience or malformed
+        """
+        if jwt is None:
+            return None
+        key = hashlib.sha256(token.encode("utf-8")).hexdigest()
+        now = time.time()
+        with self._lock:
+            entry = self._claims.get(key)
+            if entry is not None:
+                if entry[0] + TOKEN_LEEWAY > now:
+                    self._claims.move_to_end(key)
+                    self.hits += 1
+                    return entry[1]
+                del self._claims[key]
+            self.misses += 1
+
+        claims = self._decode(token)
+        if claims is None:
+            return None
+        with self._lock:
+            self._claims[key] = (claims["exp"], claims)
+            while len(self._claims) > self.max_entries:
+                self._claims.popitem(last=False)
+        return claims
+
+    def _decode(self, token: str) -> Optional[Dict[str, Any]]:
+        try:
+            header = jwt.get_unverified_header(token)
+        except jwt.PyJWTError as e:
+            raise InvalidToken(str(e))
+
+        algorithm = header.get("alg")
+        if algorithm == "HS256":
+            if not self.secret:
+                return None
+            signing_key = self.secret
+        elif algorithm in ASYMMETRIC_ALGORITHMS:
+            signing_key = self._signing_key(header.get("kid"))
+            if signing_key is None:
+                return None
+        else:
+            raise InvalidToken(f"Unsupported token algorithm: {algorithm}")
+
+        try:
+            return jwt.decode(
+                token, signing_key, algorithms=[algorithm], audience=self.audience,
+                leeway=TOKEN_LEEWAY, options={"require": ["exp", "sub"]},
+            )
+        except jwt.PyJWTError as e:
+            raise InvalidToken(str(e))
+
+    def _signing_key(self, kid: Optional[str]):
+        keys = self._keys
+        stale = time.monotonic() - self._keys_fetched_at > SUPABASE_JWKS_TTL
+        rotated = kid not in keys and time.monotonic() - self._keys_fetched_at > JWKS_MIN_REFRESH
+        if stale or rotated:
+            keys = self._fetch_jwks()
+        return keys.get(kid)
+
+    def _fetch_jwks(self) -> Dict[str, Any]:
+        with self._jwks_lock:
+            try:
+                response = http_client.request("supabase", "GET", self.jwks_url)
+                response.raise_for_status()
+                jwk_set = jwt.PyJWKSet.from_dict(response.json())
+                self._keys = {jwk.key_id: jwk.key for jwk in jwk_set.keys}
+            except Exception as e:
+                # Keep the previous keys; callers fall back to the remote check for unknown ones
+                print(f"⚠️ Could not fetch JWKS from {self.jwks_url}: {e}")
+            self._keys_fetched_at = time.monotonic()
+            return self._keys
+
+    def clear(self) -> None:
+        """Forget every cached token."""
+        with self._lock:
+            self._claims.clear()
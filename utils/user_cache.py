@@ -0,0 +1,140 @@
+"""
+Per-process User Cache for Flask-Login
+
+`load_user()` runs on every authenticated request. This cache keeps a
+snapshot of each user's column values for a short TTL and rebuilds the
+model instance from it, attaching it to the current session with
+`merge(load=False)` so no SELECT is issued.
+
+Entries are dropped automatically once a transaction that updated or
+deleted a watched model row through the ORM commits (profile edits,
+verification, KYC, bans), and can be dropped explicitly with
+`invalidate()`. Dropping at commit rather than at flush matters: a
+concurrent `load_user` between the two would re-cache the old row, which
+is still the committed one, for a full USER_CACHE_TTL.
+
+The cache is per process. Other gunicorn workers keep their copy until
+it expires, so a change (a ban, a deleted account) can take up to
+USER_CACHE_TTL seconds to reach every worker.
+
+Usage:
+    user_cache.watch(Student)
+    user = user_cache.load(db.session, Student, 42)
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session, make_transient_to_detached
+
+# Seconds a cached user stays valid
+DEFAULT_TTL = float(os.environ.get("USER_CACHE_TTL", "30"))
+
+# Maximum users kept per process (least recently used are evicted)
+DEFAULT_MAX_ENTRIES = int(os.environ.get("USER_CACHE_MAX_ENTRIES", "10000"))
+
+
+class UserCache:
+    """Thread-safe TTL + LRU cache of user column snapshots."""
+
+    def __init__(self, ttl: float = DEFAULT_TTL, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[str, Any], Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self._watched = set()
+
+    @staticmethod
+    def _key(model, pk) -> Tuple[str, Any]:
+        return (model.__tablename__, pk)
+
+    def _get(self, key) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, values = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return values
+
+    def _set(self, key, values: Dict[str, Any]) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, values)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def load(self, session, model, pk):
+        """
+        Return the user with primary key `pk`, attached to `session`.
+
+        Args:
+            session: SQLAlchemy session for the current request
+            model: Student, Owner or Admin
+            pk: Primary key
+
+        Returns:
+            Model instance or None if the row does not exist
+        """
+        if self.ttl <= 0:
+            return session.get(model, pk)
+
+        key = self._key(model, pk)
+        values = self._get(key)
+        if values is None:
+            self.misses += 1
+            user = session.get(model, pk)
+            if user is not None:
+                self._set(key, {
+                    attr.key: getattr(user, attr.key)
+                    for attr in inspect(model).column_attrs
+                })
+            return user
+
+        self.hits += 1
+        user = model(**values)
+        make_transient_to_detached(user)
+        return session.merge(user, load=False)
+
+    def invalidate(self, model, pk) -> None:
+        """Drop one user from the cache."""
+        with self._lock:
+            self._entries.pop(self._key(model, pk), None)
+
+    def clear(self) -> None:
+        """Drop every cached user."""
+        with self._lock:
+            self._entries.clear()
+
+    def watch(self, model) -> None:
+        """Invalidate a model's entries when a transaction updating or deleting its rows commits."""
+        if not self._watched:
+            event.listen(Session, "after_flush", self._collect_changed)
+            event.listen(Session, "after_commit", self._invalidate_changed)
+        self._watched.add(model)
+
+    def _collect_changed(self, session, flush_context) -> None:
+        # Keys of flushed rows, held until the transaction commits (after a
+        # rollback they just cause one extra invalidation at the next commit)
+        changed = session.info.setdefault("_user_cache_changed", set())
+        for target in list(session.dirty) + list(session.deleted):
+            model = type(target)
+            if model in self._watched:
+                changed.add((model, inspect(target).mapper.primary_key_from_instance(target)[0]))
+
+    def _invalidate_changed(self, session) -> None:
+        for model, pk in session.info.pop("_user_cache_changed", ()):
+            self.invalidate(model, pk)
+
+
+# Singleton instance
+user_cache = UserCache()
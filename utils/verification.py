@@ -5,6 +5,8 @@ import os
 import json
 import re
 
+from utils.metrics import track_external
+
 # Optional imports for Verification
 try:
     import cv2
@@ -184,7 +186,8 @@ def verify_location_on_map(address):
         return None
         
     try:
-        location = geolocator.geocode(address)
+        with track_external("nominatim"):
+            location = geolocator.geocode(address)
         if location:
             return {
                 "lat": location.latitude,
@@ -0,0 +1,166 @@
+"""
+Vocabulary Cache for Roomies
+
+Distinct colleges and locations change only when listings are written, yet
+/api/colleges ran `SELECT DISTINCT college_nearby` per call and the chatbot
+ran `SELECT DISTINCT location` per message, then tested every location
+against the message in Python.
+
+VocabularyCache keeps both lists in memory together with an Aho-Corasick
+automaton over the lower-cased locations, which finds every known location
+in a message in one pass over its characters, however many locations
+exist. Listing writes call `invalidate()`; the next reader reloads. Other
+workers' writes are picked up after VOCABULARY_TTL_SECONDS.
+
+Usage:
+    vocabulary_cache.set_loader(load_vocabulary)   # -> (colleges, locations)
+    vocabulary_cache.colleges()
+    vocabulary_cache.find_locations("any pg near andheri west under 8000?")
+"""
+
+import os
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+# Seconds before the vocabulary is reloaded to pick up other workers' writes
+VOCABULARY_TTL_SECONDS = float(os.environ.get("VOCABULARY_TTL_SECONDS", "300"))
+
+
+class AhoCorasick:
+    """Multi-pattern substring matcher (case-insensitive, whole words only)."""
+
+    def __init__(self, patterns: Iterable[str]):
+        # Node i: goto[i] = {char: node}, fail[i] = node,
+        # output[i] = [(length of the lower-cased pattern, pattern), ...]
+        self.goto: List[Dict[str, int]] = [{}]
+        self.fail: List[int] = [0]
+        self.output: List[List[Tuple[int, str]]] = [[]]
+
+        for pattern in patterns:
+            key = pattern.lower()
+            if not key:
+                continue
+            node = 0
+            for char in key:
+                child = self.goto[node].get(char)
+                if child is None:
+                    child = len(self.goto)
+                    self.goto[node][char] = child
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.output.append([])
+                node = child
+            # Lower-casing can change the length ("İ" -> "i̇"), so keep the matched length
+            self.output[node].append((len(key), pattern))
+        self._link()
+
+    def _link(self) -> None:
+        # Breadth-first: a node's failure link is the longest proper suffix in the trie
+        queue = list(self.goto[0].values())
+        for node in queue:
+            for char, child in self.goto[node].items():
+                queue.append(child)
+                fallback = self.fail[node]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                target = self.goto[fallback].get(char, 0)
+                self.fail[child] = target if target != child else 0
+                self.output[child] = self.output[child] + self.output[self.fail[child]]
+
+    def find_all(self, text: str) -> List[Tuple[int, int, str]]:
+        """
+        Every pattern occurring in `text` on word boundaries.
+
+        Args:
+            text: Text to scan
+
+        Returns:
+            (start, end, pattern) tuples in order of their end position;
+            start/end are offsets into `text` itself
+        """
+        # Lower-case per character, remembering which character of `text` each came from
+        lowered, origin = [], []
+        for position, char in enumerate(text):
+            for lowered_char in char.lower():
+                lowered.append(lowered_char)
+                origin.append(position)
+
+        matches = []
+        node = 0
+        for index, char in enumerate(lowered):
+            while node and char not in self.goto[node]:
+                node = self.fail[node]
+            node = self.goto[node].get(char, 0)
+            for length, pattern in self.output[node]:
+                start = index + 1 - length
+                end = index + 1
+                before_ok = start == 0 or not lowered[start - 1].isalnum()
+                after_ok = end == len(lowered) or not lowered[end].isalnum()
+                if before_ok and after_ok:
+                    matches.append((origin[start], origin[index] + 1, pattern))
+        return matches
+
+
+class _Snapshot:
+    """One immutable load of the vocabulary."""
+
+    def __init__(self, colleges: Iterable[Optional[str]], locations: Iterable[Optional[str]]):
+        self.colleges = sorted({c for c in colleges if c})
+        self.locations = sorted({l for l in locations if l})
+        self.location_matcher = AhoCorasick(self.locations)
+        self.loaded_at = time.monotonic()
+
+
+class VocabularyCache:
+    """Distinct colleges and locations, reloaded after listing writes."""
+
+    def __init__(self, ttl: float = VOCABULARY_TTL_SECONDS):
+        self.ttl = ttl
+        self._loader: Optional[Callable[[], Tuple[Iterable[str], Iterable[str]]]] = None
+        self._snapshot: Optional[_Snapshot] = None
+        self._lock = threading.Lock()
+
+    def set_loader(self, loader: Callable[[], Tuple[Iterable[str], Iterable[str]]]) -> None:
+        """Set the function returning (colleges, locations) from the database."""
+        self._loader = loader
+
+    def invalidate(self) -> None:
+        """Drop the cached vocabulary; call after a listing is created, edited or deleted."""
+        self._snapshot = None
+
+    def _current(self) -> _Snapshot:
+        snapshot = self._snapshot
+        if snapshot is not None and time.monotonic() - snapshot.loaded_at < self.ttl:
+            return snapshot
+        with self._lock:
+            snapshot = self._snapshot
+            if snapshot is None or time.monotonic() - snapshot.loaded_at >= self.ttl:
+                colleges, locations = self._loader()
+                snapshot = self._snapshot = _Snapshot(colleges, locations)
+        return snapshot
+
+    def colleges(self) -> List[str]:
+        """Distinct colleges, sorted."""
+        return self._current().colleges
+
+    def locations(self) -> List[str]:
+        """Distinct locations, sorted."""
+        return self._current().locations
+
+    def find_locations(self, text: str) -> List[str]:
+        """
+        Known locations mentioned in `text`, longest (most specific) first.
+
+        Args:
+            text: Free text such as a chat message
+
+        Returns:
+            Distinct location names as stored on listings
+        """
+        matches = self._current().location_matcher.find_all(text)
+        return sorted({pattern for _, _, pattern in matches}, key=lambda loc: (-len(loc), loc))
+
+
+# Global vocabulary cache
+vocabulary_cache = VocabularyCache()